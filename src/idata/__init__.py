@@ -2,17 +2,56 @@
 # Idata package - Data structures for Information Field
 #------------------------------------------------------------------------------
 
+import logging
+
 from   siqolib.logger         import SiqoLogger
 
 #==============================================================================
 # Package's constants
 #------------------------------------------------------------------------------
-_VER            = '1.1.0'
+_VER            = '1.2.0'
+
+#==============================================================================
+# Package's classes
+#------------------------------------------------------------------------------
+class LogLevels:
+    """Cached flags of the enabled levels of the logger for hot paths. Message is formatted
+       only when the flag is set, e.g. `if logOn.debug: logger.debug(f"...")`.
+       Flags are refreshed by setLevel() of the wrapped logger.
+    """
+
+    #--------------------------------------------------------------------------
+    def __init__(self, logger):
+        "Wraps setLevel() of the logger and computes flags for its actual level"
+
+        self.logger    = logger
+        self._setLevel = logger.setLevel
+        logger.setLevel = self.setLevel
+
+        self.refresh()
+
+    #--------------------------------------------------------------------------
+    def refresh(self):
+        "Computes flags of the enabled levels from the actual level of the logger"
+
+        level = self.logger.getEffectiveLevel()
+
+        self.debug   = level <= logging.DEBUG
+        self.info    = level <= logging.INFO
+        self.warning = level <= logging.WARNING
+
+    #--------------------------------------------------------------------------
+    def setLevel(self, level):
+        "Sets level of the logger and refreshes flags"
+
+        self._setLevel(level)
+        self.refresh()
 
 #==============================================================================
 # Package's variables
 #------------------------------------------------------------------------------
 logger = SiqoLogger(name='IDataPackage')   # Logger for IDataPackage
+logOn  = LogLevels(logger)                 # Cached level flags of the logger for hot paths
 
 #==============================================================================
 # Inicializacia modulu
@@ -1,15 +1,17 @@
 #==============================================================================
 # Siqo class ISeries
 #------------------------------------------------------------------------------
-import cmath
+from   concurrent.futures     import ProcessPoolExecutor
+import numpy                  as np
 
 from   .                      import logger
-from   .idata                 import InfoData
+from   .idata                 import InfoData, dataMethod
+from   .ispectral             import rftMagnitudes, autoCorrCircular
 
 #==============================================================================
 # Module's constants
 #------------------------------------------------------------------------------
-_VER   = '1.1.0'
+_VER   = '1.5.2'
 
 _CNT   = 1200                          # Default number of points
 _AXES  = {'i': 'Time tick'}            # Default axes
@@ -18,6 +20,42 @@ _VALS  = {'s': 'State', 'd': 'Delta'}  # Default values
 #==============================================================================
 # Module's variables
 #------------------------------------------------------------------------------
+_apcVals = None                        # Values of APC in the pool worker process, set by _apcInit()
+
+#==============================================================================
+# Module's functions
+#------------------------------------------------------------------------------
+def _apcRow(vals:np.ndarray, tau:int) -> np.ndarray:
+    """Returns auto-phase-correlation for one tau and all possible phases phs = 0..max(1, tau-1)-1
+       as mean of products vals[(phs + i*tau) % n] * vals[(phs + (i+1)*tau) % n] for i = 0..n-1.
+       Module level function to be usable in the process pool.
+    """
+
+    n    = len(vals)
+    base = (np.arange(n, dtype=np.int64) * tau) % n
+    row  = []
+
+    for phs in range(max(1, tau-1)):
+
+        iPos = (base + phs) % n
+        jPos = (iPos + tau) % n
+
+        row.append(np.dot(vals[iPos], vals[jPos]) / n)
+
+    return np.asarray(row)
+
+#------------------------------------------------------------------------------
+def _apcInit(vals:np.ndarray):
+    """Initializer of the pool worker, stores values of APC once per process."""
+
+    global _apcVals
+    _apcVals = vals
+
+#------------------------------------------------------------------------------
+def _apcPoolRow(tau:int) -> np.ndarray:
+    """Returns _apcRow() for values stored by _apcInit() in the pool worker."""
+
+    return _apcRow(_apcVals, tau)
 
 #==============================================================================
 # ISeries
@@ -27,6 +65,8 @@ class ISeries(InfoData):
     #==========================================================================
     # Static variables & methods
     #--------------------------------------------------------------------------
+    _persistArgs  = ()            # Constructor has no store argument, see InfoData.load()
+    _persistAttrs = ('dTime',)    # Time step is restored after construction
 
     #==========================================================================
     # Constructor & utilities
@@ -65,52 +105,10 @@ class ISeries(InfoData):
         #----------------------------------------------------------------------
         logger.info(f"{self.name}.constructor: done")
 
-    #--------------------------------------------------------------------------
-    # Dynamics methods for ISeries
-    #--------------------------------------------------------------------------
-    def mapSetMethods(self) -> dict:
-        "Returns map of methods setting keyed value to function value for respective parameters"
-
-        #----------------------------------------------------------------------
-        # Get methods from super class
-        #----------------------------------------------------------------------
-        methods = super().mapSetMethods()
-
-        #---------------------------------------------------------------------
-        # Add ISeries specific methods
-        #----------------------------------------------------------------------
-        methods['ISeries deltas'      ] = {'dataMethod' :self.deltas
-                                          ,'visible'    :True
-                                          ,'pointMethod':None
-                                          ,'params'     :{}
-                                          ,'paramAsk'   :True
-                                          ,'outData'    :None
-                                          ,'outKey'     :'d'
-                                          }
-        methods['ISeries autocorr'    ] = {'dataMethod' :self.autoCorr
-                                          ,'visible'    :True
-                                          ,'pointMethod':None
-                                          ,'params'     :{'maxTau': 32}
-                                          ,'paramAsk'   :True
-                                          ,'outData'    :'IFtion'
-                                          ,'outKey'     :'ac'
-                                          }
-
-        methods['AutoPhaseCorrelation'] = {'dataMethod' :self.APC
-                                          ,'visible'    :True
-                                          ,'pointMethod':None
-                                          ,'params'     :{'maxTau': 32}
-                                          ,'paramAsk'   :True
-                                          ,'outData'    :'IFtion'
-                                          ,'outKey'     :'apc'
-                                          }
-
-        #---------------------------------------------------------------------
-        return methods
-
     #==========================================================================
     # Line methods to apply in Dynamics methods
     #--------------------------------------------------------------------------
+    @dataMethod('ISeries deltas', outKey='d')
     def deltas(self, inKey:str, outKey:str, params:dict, outData:'InfoData') -> int|None:
         """Compute deltas of states between consecutive points.
         - inKey  : Key of the value to be read by the method
@@ -160,6 +158,7 @@ class ISeries(InfoData):
         logger.info(f"{self.name}.deltas: {pts} InfoPoints was updated for key '{outKey}' in deltas")
 
     #--------------------------------------------------------------------------
+    @dataMethod('ISeries autocorr', params={'maxTau': 32}, outData='IFtion', outKey='ac')
     def autoCorr(self, inKey:str, outKey:str, params:dict, outData:'InfoData') -> int|None:
         """Compute auto-correlation of states.
         - inKey  : Key of the value to be read by the method
@@ -178,7 +177,11 @@ class ISeries(InfoData):
 
         outData.setSchemaAxe( key='x' , name='Tau time')
         outData.setSchemaVal( key='ac', name=f'AC({self.valNameByKey(inKey)})' )
-        outData.init( cnts=(maxTau+1,) )
+
+        #----------------------------------------------------------------------
+        # Pozicie x = tau * dTime vytvori init z rozsahu osi
+        #----------------------------------------------------------------------
+        outData.init( cnts=(maxTau+1,), origs=(0,), rects=(maxTau * self.dTime,) )
 
         #----------------------------------------------------------------------
         # Ziskam pracovny zoznam InfoPoints na aplikovanie metody (subData)
@@ -186,53 +189,36 @@ class ISeries(InfoData):
         inPoints = self.actList
         n = len(inPoints)
 
+        if n == 0:
+            logger.error(f"{self.name}.autoCorr: No points in active subdata")
+            return None
+
         #----------------------------------------------------------------------
-        # Prejdem tau od 0 po N-1, kde N je pocet bodov v subdata
+        # Auto-korelacia pre tau od 0 po maxTau s modularnou algebrou
         #----------------------------------------------------------------------
-        for tau in range(maxTau+1):
-
-            suma = 0
-            prod = 0
-
-            #------------------------------------------------------------------
-            # Prejdem dvojice bodov (i, i+tau) a pre kazdu dvojicu bodov vypocitam produkt ich hodnot a pripoctem k sume
-            #------------------------------------------------------------------
-            for i in range(n):
-
-                #--------------------------------------------------------------
-                # Pouzijem modularnu algebru
-                #--------------------------------------------------------------
-                iPos =  i        % n
-                jPos = (i + tau) % n
-
-                iVal = inPoints[iPos].val(valKey=inKey)
-                jVal = inPoints[jPos].val(valKey=inKey)
-
-                #--------------------------------------------------------------
-                # Akumulujem produkt hodnot bodov do sumy
-                #--------------------------------------------------------------
-                suma += (iVal * jVal)
-
-            #------------------------------------------------------------------
-            # Normujem sumu podla poctu bodov a nastavim hodnotu auto-korelacie pre tau
-            #------------------------------------------------------------------
-            outData.pointByPos(tau).set(pos={'x': tau * self.dTime}, vals={'ac': (suma/n) })
-            inPoints[tau].set(vals={outKey: (suma/n) })
+        ac = autoCorrCircular(self.valArray(inKey, points=inPoints), maxTau)
 
         #----------------------------------------------------------------------
-        # Posledny bod nastavim na 0
+        # Nastavim hodnoty auto-korelacie naraz do outData a do prvych bodov subdata
         #----------------------------------------------------------------------
+        pts = outData.setValArray('ac', ac)
+        self.setValArray(outKey, ac[:n], points=inPoints[:len(ac)])
 
         #----------------------------------------------------------------------
         logger.info(f"{self.name}.autoCorr: Done")
+        return pts
 
     #--------------------------------------------------------------------------
+    @dataMethod('AutoPhaseCorrelation', params={'maxTau': 32, 'workers': 0}, outData='IFtion', outKey='apc')
     def APC(self, inKey:str, outKey:str, params:dict, outData:'InfoData') -> int|None:
         """Compute auto-phase-correlation of states for each phase.
         - inKey  : Key of the value to be read by the method
         - outKey : Key of the value to be set by the method
         - params : Parameters for the method as dict
+        -- 'maxTau'  : maximal tau time (default 32)
+        -- 'workers' : count of processes computing tau rows in parallel (default 0 for serial computation)
         - outData: InfoData to store output data
+        Cells (tau, phs) without phase phs for respective tau are set to 0.
         Returns count of updated InfoPoints or None if initialization failed due to incompatible parameters or undefined ipType.
         """
 
@@ -241,8 +227,13 @@ class ISeries(InfoData):
         #----------------------------------------------------------------------
         # Pripravim vystupny objekt outData
         #----------------------------------------------------------------------
-        maxTau = params.get('maxTau', 32)
-        maxPhs = maxTau - 1
+        maxTau  = params.get('maxTau' , 32)
+        workers = params.get('workers', 0 )
+        maxPhs  = maxTau - 1
+
+        if maxTau < 1:
+            logger.error(f"{self.name}.autoPhaseCorr: Invalid maxTau {maxTau}, must be >= 1")
+            return None
 
         outData.setSchemaAxe( key='x'  , name='Tau time'  )
         outData.setSchemaAxe( key='y'  , name='Phase time')
@@ -251,69 +242,35 @@ class ISeries(InfoData):
         outData.init( cnts=(maxTau+1, maxPhs+1) )
 
         #----------------------------------------------------------------------
-        # Ziskam pracovny zoznam InfoPoints na aplikovanie metody (subData)
+        # Ziskam hodnoty pracovneho zoznamu InfoPoints (subData) naraz do pola
         #----------------------------------------------------------------------
-        inPoints = self.actList
-        n = len(inPoints)
+        vals = self.valArray(inKey, points=self.actList)
+        apc  = np.zeros((maxTau+1, maxPhs+1), dtype=np.complex128 if vals.dtype.kind == 'c' else np.float64)
 
         #----------------------------------------------------------------------
-        # Prejdem tau od 0 po maxTau
+        # Riadky tau pocitam seriovo alebo paralelne v poole procesov
         #----------------------------------------------------------------------
-        for tau in range(maxTau+1):
-
-            #------------------------------------------------------------------
-            # Mozne fazy su od 0 po tau-1, avsak minimalne existuje jedna faza = 0
-            #------------------------------------------------------------------
-            phases = max(1, tau-1)
-
-            #------------------------------------------------------------------
-            # Prejdem vsetky mozne fazy
-            #------------------------------------------------------------------
-            for phs in range(phases):
-
-                suma = 0
-                cnt  = 0
-
-                #--------------------------------------------------------------
-                # Pre kazdu dvojicu bodov vypocitam produkt ich hodnot a pripoctem k sume
-                #--------------------------------------------------------------
-                for i in range(n):
-
-                    #----------------------------------------------------------
-                    # Urcim pozicie dvojice bodov (i, i+tau) s fazou phs
-                    #----------------------------------------------------------
-                    iPos = phs + (i * tau)
-                    jPos = iPos + tau
+        if workers > 1:
+            # Hodnoty posielam kazdemu procesu raz cez initializer, do poolu idu len tau po davkach
+            chunk = -(-(maxTau+1) // workers)
 
-                    #----------------------------------------------------------
-                    # Pouzijem modularnu algebru
-                    #----------------------------------------------------------
-                    iPos = iPos % n
-                    jPos = jPos % n
+            with ProcessPoolExecutor(max_workers=workers, initializer=_apcInit, initargs=(vals,)) as pool:
+                rows = list(pool.map(_apcPoolRow, range(maxTau+1), chunksize=chunk))
 
-                    #----------------------------------------------------------
-                    # Ziskam hodnoty bodov
-                    #----------------------------------------------------------
-                    iVal = inPoints[iPos].val(valKey=inKey)
-                    jVal = inPoints[jPos].val(valKey=inKey)
-
-                    #----------------------------------------------------------
-                    # Akumulujem produkt hodnot bodov do sumy
-                    #----------------------------------------------------------
-                    suma += (iVal * jVal)
-                    cnt  += 1
+        else:
+            rows = [_apcRow(vals, tau) for tau in range(maxTau+1)]
 
-                #--------------------------------------------------------------
-                # Normujem sumu podla poctu produktov
-                #--------------------------------------------------------------
-                outData.pointByIdxs((tau, phs)).set(vals={outKey: (suma/cnt) })
+        for tau, row in enumerate(rows):
+            apc[tau, :len(row)] = row
 
         #----------------------------------------------------------------------
-        # Posledny bod nastavim na 0
+        # Zapisem celu 2D mapu naraz, os x (tau) je najrychlejsia os pozicie
         #----------------------------------------------------------------------
+        pts = outData.setValArray(outKey, apc.ravel(order='F'))
 
         #----------------------------------------------------------------------
         logger.info(f"{self.name}.autoPhaseCorr: Done")
+        return pts
 
     #--------------------------------------------------------------------------
     def RFT(self, inKey:str, outKey:str, params:dict, outData:'InfoData') -> int|None:
@@ -323,6 +280,8 @@ class ISeries(InfoData):
         - params : Parameters for the method as dict
         -- 'rad' : radix level for FFT e.g. size = 2^rad (default 0 for dynamic rad)
         - outData: InfoData to store output data
+        Magnitudes of Fourier coefficients summed over windows of size are set for the first size points,
+        the rest of points is set to 0. Returns count of updated InfoPoints or None if there are not enough points.
         """
 
         logger.info(f"{self.name}.RFT: {outData.name}[{outKey}] = <RFT>({inKey}) with params {params}")
@@ -331,85 +290,23 @@ class ISeries(InfoData):
         # Ziskam pracovny zoznam InfoPoints na aplikovanie metody (subData)
         #----------------------------------------------------------------------
         points = self.actList
-        n = len(points)
-
-        vec = [0.0] * n
-        for i in range(n):
-            vec[i] = points[i].val(valKey='s')
-
-        #----------------------------------------------------------------------
-        # Ak je rad == 0, tak nastavim rad na najvacsiu mocninu dvojky mensiu ako n
-        #----------------------------------------------------------------------
-        rad  = params.get('rad', 0 )
-        if rad == 0:  rad = int(cmath.log(n, 2).real)
+        mags   = rftMagnitudes(self.valArray(inKey, points=points), rad=params.get('rad', 0))
 
-        #----------------------------------------------------------------------
-        # Inicializujem okno a skontrolujem vykonatelnost
-        #----------------------------------------------------------------------
-        size  = 1 << rad
-        resid = n - size
-        start = 0
-        fft   = [0+0j] * size  # Initialize FFT output vector with complex zeros
-
-        if resid < 0:
-            logger.error(f"{self.name}.RFT: Not enough points for FFT (n={n}, rad={rad}, size={size})")
-            return
-
-        logger.info(f"{self.name}.RFT: rad set to {rad}, size = {size}")
-
-        #----------------------------------------------------------------------
-        # Posuvam okno vec[] s dlzkou size o krok step az kym reziduum nebude mensie ako 16
-        #----------------------------------------------------------------------
-        while resid >= 16:
-
-            #------------------------------------------------------------------
-            # Ak je reziduum > 0, tak mozem vykonat FFT pre okno vec[start:start+size]
-            #------------------------------------------------------------------
-            if resid > 0:
-                logger.info(f"{self.name}.RFT: FFT window start={start}, stop={size}, resid={resid}")
-
-                #--------------------------------------------------------------
-                # Vytvorim vektor fft pre FFT vysledky a zavolam FFT
-                #--------------------------------------------------------------
-                fftLocal = [0+0j] * size
-                self._FFT( vec[start:start+size], fftLocal, rad )
-
-                #--------------------------------------------------------------
-                # Pripocitam fftLocal do fft pre indexy, ktore boli aktualizovane.
-                #--------------------------------------------------------------
-                for i in range(size):
-                    fft[i] += fftLocal[i]
-
-                #--------------------------------------------------------------
-                # Posuniem okno o krok size a aktualizujem reziduum
-                #--------------------------------------------------------------
-                start += size
-                resid -= size
-
-            else:
-                #--------------------------------------------------------------
-                # Ak je reziduum < 0, znizim rad o 1 a skusim znova
-                #--------------------------------------------------------------
-                #rad  -= 1
-                #size  = 1 << rad
-                resid = n - size
-
-        #----------------------------------------------------------------------
-        # Ak je reziduum > 0, vykonam FFT pre celu zvysnu cast
-        #----------------------------------------------------------------------
-        if resid > 0:
-            fftLocal = [0+0j] * size
-            self._FFT( vec[start:start+size] + [0]*(size-resid), fftLocal, rad )
-            for i in range(size):
-                fft[i] += fftLocal[i]
+        if mags is None:
+            logger.error(f"{self.name}.RFT: Not enough points for FFT with params {params}")
+            return None
 
         #----------------------------------------------------------------------
         # Nastavim vysledky do subdata listu
         #----------------------------------------------------------------------
-        for i in range(n):
-            points[i].set(vals={outKey: abs(fft[i])})
+        vals = np.zeros(len(points), dtype=np.float64)
+        cnt  = min(len(points), len(mags))
+        vals[:cnt] = mags[:cnt]
+
+        pts = self.setValArray(outKey, vals, points=points)
 
         logger.info(f"{self.name}.RFT: {outData.name}[{outKey}] = <RFT>({inKey}) Done")
+        return pts
 
     #--------------------------------------------------------------------------
     def rndBool(self, inKey:str, outKey:str, params:dict, outData:'InfoData') -> int|None:
@@ -429,116 +326,6 @@ class ISeries(InfoData):
     #==========================================================================
     # Internal tools
     #--------------------------------------------------------------------------
-    def _FFT( self, vec:list, fft:list[complex], rad:int, base:list[complex]|None=None, depth:int=0 ):
-        """Compute Fast Fourier transform for list of real values in vector `vec`
-        Cooley-Tukey FFT algorithm (odd-even decomposition).
-
-        Parameters:
-        - vec: input real values
-        - fft: output complex Fourier coefficients (modified in-place)
-        - rad: current radix level; size = 2^rad
-        - base: base vector of twiddle factors z = e^(-i*2*pi*k/size) (created at depth=0)
-        - depth: recursion depth (0 == top level where initialization happens)
-
-        Returns:
-        - fft: modified in-place with computed Fourier coefficients
-        - index k of fft corresponds to frequency bin:
-        -- for k = 0 → DC zložka (signal average, frequency = 0)
-        -- for k = 1..size/2-1 → positive frequencies
-        -- for k = size/2 → Nyquist frequency (if size is even)
-        -- f(k) = k * (sampling_frequency / size) for k in [0, size/2]
-        """
-
-        if depth == 0: logger.info (f"{self.name}._FFT: Computing FFT with rad={rad}")
-        else         : logger.debug(f"{self.name}._FFT: Recursion depth={depth}, rad={rad}")
-
-        size  = 1 << rad       # 2^rad - FFT resolution at top level
-        nasob = 1 << depth     # 2^depth - data stride (sample step) at current recursion level
-
-        #----------------------------------------------------------------------
-        # Initialize at top level (depth == 0)
-        #----------------------------------------------------------------------
-        if depth == 0:
-            # Mutate fft in-place: clear and initialize with zeros
-            fft.clear()
-            fft.extend([0+0j] * size)
-
-            # Create and initialize base vector with twiddle factors
-            # base[k] = e^(-i*2*pi*k/size) for k=0..size/2-1
-            # base[k+size/2] = -base[k] (symmetry: reduces computation)
-            base = [0+0j] * size
-            logger.debug(f"{self.name}._FFT: initialize twiddle factors (size={size})")
-
-            theta = 2 * cmath.pi / size
-            half = size // 2
-
-            # First half: e^(-i*theta*k)
-            for i in range(half):
-                base[i] = cmath.exp(complex(0, -i * theta))
-
-            # Second half: -base[k] for k in [0, half-1]
-            # This exploits: e^(-i*theta*(half+k)) = -e^(-i*theta*k)
-            for i in range(half, size):
-                base[i] = -base[i - half]
-
-        #----------------------------------------------------------------------
-        # Base case: rad <= 1 (single 2-point FFT)
-        # Computes: fft[k] = sum_{n=0,2,4,...} vec[n*nasob] * base[k*n % size]
-        #----------------------------------------------------------------------
-        if rad <= 1:
-            logger.debug(f"{self.name}._FFT: base case FFT (rad={rad}, depth={depth}, size=2)")
-
-            # Two-point FFT:
-            # fft[0] = vec[0]*base[0] + vec[nasob]*base[0] = (vec[0] + vec[nasob]) * 1
-            # fft[1] = vec[0]*base[0] + vec[nasob]*base[nasob] = vec[0] - vec[nasob] (since base[nasob]==-base[0])
-            fft[0] = vec[0] * base[0] + vec[nasob] * base[0]
-            fft[1] = vec[0] * base[0] + vec[nasob] * base[nasob]
-
-            # Replicate results to fill the FFT array
-            # At maximum frequency resolution, pattern repeats
-            for i in range(2, len(fft), 2):
-                fft[i] = fft[0]
-                if i + 1 < len(fft):
-                    fft[i + 1] = fft[1]
-
-        else:
-            # Recursive case: combine even (from lower recursion) and odd indices
-            self._FFT(vec, fft, rad - 1, base, depth + 1)
-            logger.debug(f"{self.name}._FFT: merging level {rad} (depth={depth})")
-
-            # Butterfly operation: combine even-indexed terms (already in fft)
-            # with odd-indexed terms (computed below)
-            border = size
-            if depth == 0:
-                border //= 2  # FFT symmetry at top level
-
-            # For each output frequency bin i in [0, border):
-            # fft[i + k*size] += sum of odd-indexed input terms
-            # This implements: X[k] = sum_{n even} + W^k * sum_{n odd}
-            for i in range(border):
-                z = 0 + 0j
-                i_nas = i * nasob
-
-                # Sum contributions from odd input indices (1, 3, 5, ...)
-                # at stride nasob: vec[nasob], vec[3*nasob], vec[5*nasob], ...
-                for j in range(1, size, 2):
-                    idx = j * nasob
-                    # Twiddle factor: base[(i_nas * j) % size]
-                    # = e^(-i*2*pi*i*j/size) at this recursion level
-                    base_idx = (i_nas * j) % len(base)
-                    z += vec[idx] * base[base_idx]
-
-                # Distribute combined result across all k such that k ≡ i (mod border)
-                p = i
-                while p < len(fft):
-                    fft[p] += z
-                    p += size
-
-        #----------------------------------------------------------------------
-        if depth == 0:
-            logger.info(f"{self.name}._FFT: FFT computation complete (size={size})")
-
-    #--------------------------------------------------------------------------
 
     #==========================================================================
     # Persistency methods
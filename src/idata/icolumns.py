@@ -0,0 +1,583 @@
+#==============================================================================
+# Siqo class InfoColumns
+#------------------------------------------------------------------------------
+from   collections.abc        import MutableMapping
+import numpy                  as np
+
+from   .                      import logger
+from   .ipoint                import InfoPoint
+
+#==============================================================================
+# Module's constants
+#------------------------------------------------------------------------------
+_VER    = '1.4.0'
+
+_DTYPES = (np.bool_, np.int64, np.float64, np.complex128, object)   # Column dtypes ordered by rank of upcasting
+_KINDS  = {'b':0, 'i':1, 'u':1, 'f':2, 'c':3}                       # numpy dtype.kind -> rank in _DTYPES
+
+#==============================================================================
+# Module's variables
+#------------------------------------------------------------------------------
+
+#==============================================================================
+# Column's dtype tools
+#------------------------------------------------------------------------------
+def _rankOfValue(val) -> int:
+    "Returns rank of the column dtype in _DTYPES able to store respective value"
+
+    if   isinstance(val, (bool, np.bool_))                    : return 0
+    elif isinstance(val, (int, np.integer))                   : return 1
+    elif isinstance(val, (float, np.floating))                : return 2
+    elif isinstance(val, (complex, np.complexfloating))       : return 3
+    else                                                      : return 4
+
+#------------------------------------------------------------------------------
+def _rankOfArray(arr:np.ndarray) -> int:
+    "Returns rank of the column dtype in _DTYPES able to store respective array"
+
+    return _KINDS.get(arr.dtype.kind, 4)
+
+#==============================================================================
+# Write-through dict view of one row
+#------------------------------------------------------------------------------
+class _RowMap(MutableMapping):
+    """Dict-like view of positions or values of one row in InfoColumns.
+       Reading and writing goes directly into the columns, so legacy code
+       working with point._pos / point._vals keeps working on columnar data.
+    """
+
+    def __init__(self, store:'InfoColumns', row:int, part:str):
+
+        self._store = store
+        self._row   = row
+        self._part  = part      # 'pos' or 'vals'
+
+    def __getitem__(self, key):
+
+        if self._part == 'pos':
+            if key not in self._store._axes: raise KeyError(key)
+            return self._store.getPos(self._row, key)
+
+        if key not in self._store._vals: raise KeyError(key)
+        return self._store.getVal(self._row, key)
+
+    def __setitem__(self, key, val):
+
+        if self._part == 'pos': self._store.setPos(self._row, key, val)
+        else                  : self._store.setVal(self._row, key, val)
+
+    def __delitem__(self, key):
+
+        raise TypeError(f"InfoColumns: one cell of the column '{key}' can not be deleted")
+
+    def __iter__(self):
+
+        if self._part == 'pos': return iter(list(self._store._axes))
+        else                  : return iter(list(self._store._vals.keys()))
+
+    def __len__(self):
+
+        if self._part == 'pos': return len(self._store._axes)
+        else                  : return len(self._store._vals)
+
+    def copy(self) -> dict:
+
+        return dict(self.items())
+
+    def __repr__(self):
+
+        return repr(self.copy())
+
+#==============================================================================
+# InfoPointView
+#------------------------------------------------------------------------------
+class InfoPointView(InfoPoint):
+    """Lightweight InfoPoint as a row index into InfoColumns.
+       View does not hold any data, all reading and writing goes into the columns.
+       Public API of the InfoPoint (set, get, pos, val, clear, info) is preserved.
+    """
+
+    #--------------------------------------------------------------------------
+    def __init__(self, store:'InfoColumns', row:int):
+        "Calls constructor of InfoPointView for respective row in the store"
+
+        self._ipType = store.ipType
+        self._store  = store
+        self._row    = row
+
+    #--------------------------------------------------------------------------
+    @property
+    def _pos(self) -> _RowMap:
+        "Write-through dict view of the positions of this row"
+
+        return _RowMap(self._store, self._row, 'pos')
+
+    #--------------------------------------------------------------------------
+    @property
+    def _vals(self) -> _RowMap:
+        "Write-through dict view of the values of this row"
+
+        return _RowMap(self._store, self._row, 'vals')
+
+    #--------------------------------------------------------------------------
+    def clear(self, *, vals:dict={}) -> 'InfoPointView':
+        "Sets all values of this row to provided values or to 0"
+
+        for keyVal in InfoPoint._lookup(self._ipType)['valKeys']:
+            self._store.setVal(self._row, keyVal, vals.get(keyVal, 0))
+
+        return self
+
+    #--------------------------------------------------------------------------
+    def set(self, *, pos:'dict|list|tuple|None'=None, vals:'dict|list|tuple|None'=None):
+        "Set position and values of this row, see InfoPoint.set()"
+
+        if pos is not None:
+
+            if type(pos) == dict: items = pos.items()
+            else                : items = zip(InfoPoint._lookup(self._ipType)['axeKeys'], pos)
+
+            for key, p in items: self._store.setPos(self._row, key, p)
+
+        if vals is not None:
+
+            if type(vals) == dict: items = vals.items()
+            else                 : items = zip(InfoPoint._lookup(self._ipType)['valKeys'], vals)
+
+            for key, v in items: self._store.setVal(self._row, key, v)
+
+    #--------------------------------------------------------------------------
+    def get(self, *, pos:bool=True, vals:bool=True):
+        "Returns position and values of this row as dict {'pos':{}, 'vals':{}}"
+
+        toRet = {}
+        if pos : toRet['pos' ] = self._pos.copy()
+        if vals: toRet['vals'] = self._vals.copy()
+
+        return toRet
+
+    #--------------------------------------------------------------------------
+    def pos(self, axeKey=None):
+        "Returns position on respective axe or whole position dict of this row"
+
+        if axeKey is None                 : return self._pos.copy()
+        if axeKey not in self._store._axes: return None
+        return self._store.getPos(self._row, axeKey)
+
+    #--------------------------------------------------------------------------
+    def val(self, valKey=None):
+        "Returns value for respective key or whole values dict of this row"
+
+        if valKey is None: return self._vals.copy()
+        return self._store.getVal(self._row, valKey)
+
+#==============================================================================
+# InfoColumnsView
+#------------------------------------------------------------------------------
+class InfoColumnsView:
+    """Ordered subset of rows of InfoColumns behaving like a list of InfoPoints.
+       Vectorised code reads self.rows and the columns of self.store directly.
+    """
+
+    def __init__(self, store:'InfoColumns', rows:np.ndarray):
+
+        self.store = store
+        self.rows  = rows
+
+    def __len__(self):
+
+        return len(self.rows)
+
+    def __getitem__(self, i):
+
+        if isinstance(i, slice): return InfoColumnsView(self.store, self.rows[i])
+        return InfoPointView(self.store, int(self.rows[i]))
+
+    def __iter__(self):
+
+        store = self.store
+        for row in self.rows.tolist(): yield InfoPointView(store, row)
+
+#==============================================================================
+# InfoColumns
+#------------------------------------------------------------------------------
+class InfoColumns:
+    """Columnar storage engine of InfoData. Positions are kept as float64 array
+       [rows x axes] and each schema value key as one contiguous numpy column.
+       Dtype of the column is chosen by the first written value and upcasted
+       bool -> int64 -> float64 -> complex128 -> object when needed.
+       Column of the value key is allocated with the first write, unwritten keys read as None.
+       InfoColumns behaves like a list of InfoPoints (len, indexing, iteration)
+       and returns InfoPointView for respective row.
+       Positions of the regular grid are not stored, they are computed on demand
+       from the grid definition and materialized only when some position is written.
+       Axe of the grid can be a ring with offset, rows keep positions for offset 0
+       and reading of the positions shifts them to the actual index in the ring.
+    """
+
+    #==========================================================================
+    # Constructor & utilities
+    #--------------------------------------------------------------------------
+    def __init__(self, ipType:str|None=None):
+        "Calls constructor of empty InfoColumns"
+
+        self.ipType = ipType                    # Type of the InfoPoint in this store
+        self._axes  = []                        # List of axe keys in the order of position columns
+        self._pos   = np.zeros((0, 0))          # Positions as float64 array [rows x axes] or None for lazy grid positions
+        self._grid  = None                      # Definition of the grid as (cnts, origs, diffs, subProducts) for lazy positions
+        self._vals  = {}                        # Value columns as {valKey: np.ndarray}
+        self._cnt   = 0                         # Count of rows
+        self._rings = {}                        # Ring axes as {axeKey: (offset, cnt, subProduct, diff)}
+
+    #--------------------------------------------------------------------------
+    def __len__(self):
+
+        return self._cnt
+
+    #--------------------------------------------------------------------------
+    def __getitem__(self, row):
+
+        if isinstance(row, slice): return InfoColumnsView(self, np.arange(self._cnt)[row])
+        if row < 0: row += self._cnt
+        if (row < 0) or (row >= self._cnt): raise IndexError(f"InfoColumns: row {row} is out of range <0,{self._cnt-1}>")
+        return InfoPointView(self, row)
+
+    #--------------------------------------------------------------------------
+    def __iter__(self):
+
+        for row in range(self._cnt): yield InfoPointView(self, row)
+
+    #--------------------------------------------------------------------------
+    def nbytes(self) -> int:
+        "Returns count of bytes allocated by the columns"
+
+        posBytes = 0 if self._pos is None else self._pos.nbytes
+        return posBytes + sum(col.nbytes for col in self._vals.values())
+
+    #==========================================================================
+    # Structure modification
+    #--------------------------------------------------------------------------
+    def alloc(self, ipType:str, coords:np.ndarray):
+        """Allocates rows for respective positions as float64 array [rows x axes].
+           All value columns are dropped and will be allocated with the first write.
+        """
+
+        self.ipType = ipType
+        self._axes  = list(InfoPoint.getSchemaAxes(ipType).keys())
+        self._pos   = np.asarray(coords, dtype=np.float64).reshape(-1, len(self._axes))
+        self._grid  = None
+        self._vals  = {}
+        self._cnt   = self._pos.shape[0]
+        self._rings = {}
+
+        logger.debug(f"InfoColumns.alloc: {self._cnt} rows for axes {self._axes}")
+
+    #--------------------------------------------------------------------------
+    def allocGrid(self, ipType:str, cnts:list, origs:list, diffs:list):
+        """Allocates rows of the regular grid with respective counts, origins and distances of the points
+           in the axes ordered as in the schema. Row = SUM(idx[i] * subProduct[i]), the first axe is the fastest.
+           Positions are not stored, they are computed on demand as orig + idx * diff.
+           All value columns are dropped and will be allocated with the first write.
+        """
+
+        subs = [1]
+        for cnt in cnts[:-1]: subs.append(subs[-1] * cnt)
+
+        self.ipType = ipType
+        self._axes  = list(InfoPoint.getSchemaAxes(ipType).keys())
+        self._pos   = None
+        self._grid  = (list(cnts), list(origs), list(diffs), subs)
+        self._vals  = {}
+        self._cnt   = int(np.prod(cnts)) if len(cnts) > 0 else 0
+        self._rings = {}
+
+        logger.debug(f"InfoColumns.allocGrid: {self._cnt} rows for axes {self._axes}")
+
+    #--------------------------------------------------------------------------
+    def _gridPos(self, axeKey:str, rows) -> 'np.ndarray|float':
+        "Returns positions of the grid on respective axe computed for the rows"
+
+        i = self._axes.index(axeKey)
+        cnts, origs, diffs, subs = self._grid
+
+        return np.float64(origs[i]) + ((rows // subs[i]) % cnts[i]) * diffs[i]
+
+    #--------------------------------------------------------------------------
+    def _materialize(self):
+        "Computes and stores positions of all rows of the grid, grid definition is dropped"
+
+        if self._pos is not None: return
+
+        rows      = np.arange(self._cnt, dtype=np.int64)
+        self._pos = np.empty((self._cnt, len(self._axes)), dtype=np.float64)
+
+        for i, axeKey in enumerate(self._axes): self._pos[:, i] = self._gridPos(axeKey, rows)
+
+        self._grid = None
+        logger.debug(f"InfoColumns._materialize: positions of {self._cnt} rows were stored")
+
+    #--------------------------------------------------------------------------
+    def clear(self):
+        "Drops all rows and columns"
+
+        self._pos   = np.zeros((0, len(self._axes)))
+        self._grid  = None
+        self._vals  = {}
+        self._cnt   = 0
+        self._rings = {}
+
+    #--------------------------------------------------------------------------
+    def insert(self, row:int, point:InfoPoint):
+        "Inserts new row before respective row with position and values of respective InfoPoint"
+
+        if self.ipType is None: self.ipType = point._ipType
+        if not self._axes     : self._axes  = list(InfoPoint.getSchemaAxes(self.ipType).keys())
+
+        self._materialize()
+
+        coos = [point.pos(axe) or 0 for axe in self._axes]
+        self._pos = np.insert(self._pos.reshape(-1, len(self._axes)), row, coos, axis=0)
+
+        for key, col in self._vals.items():
+            self._vals[key] = np.insert(col, row, np.zeros(1, dtype=col.dtype))
+
+        self._cnt += 1
+        for key, val in point.val().items(): self.setVal(row, key, val)
+
+    #--------------------------------------------------------------------------
+    def copy(self) -> 'InfoColumns':
+        "Returns deep copy of this InfoColumns"
+
+        toRet = InfoColumns(self.ipType)
+        toRet._axes  = list(self._axes)
+        toRet._pos   = None if self._pos is None else self._pos.copy()
+        toRet._grid  = self._grid
+        toRet._vals  = {key: col.copy() for key, col in self._vals.items()}
+        toRet._cnt   = self._cnt
+        toRet._rings = dict(self._rings)
+
+        return toRet
+
+    #--------------------------------------------------------------------------
+    def take(self, rows):
+        "Reorders rows in place, new row i is old row rows[i]"
+
+        rows = np.asarray(rows, dtype=np.int64)
+
+        self._materialize()
+        self._pos  = self._pos[rows]
+        self._vals = {key: col[rows] for key, col in self._vals.items()}
+
+    #--------------------------------------------------------------------------
+    def setRing(self, axeKey:str, off:int, cnt:int, sub:int, diff:float):
+        """Sets offset of the ring axe, positions of the rows on this axe are read as positions
+           of index (idx + off) % cnt where idx = (row // sub) % cnt is index of the row for offset 0.
+        """
+
+        self._rings[axeKey] = (off, cnt, sub, diff)
+
+    #--------------------------------------------------------------------------
+    def delRing(self, axeKey:str):
+        "Writes actual positions of the ring axe into the rows and removes the ring"
+
+        if axeKey not in self._rings: return
+
+        self._materialize()
+        self._pos[:, self._axes.index(axeKey)] = self.posArray(axeKey)
+        del self._rings[axeKey]
+
+    #--------------------------------------------------------------------------
+    def _ringShift(self, axeKey:str, rows) -> 'np.ndarray|float':
+        "Returns shift of the positions of respective rows on the ring axe"
+
+        off, cnt, sub, diff = self._rings[axeKey]
+
+        idx = (rows // sub) % cnt
+        return (((idx + off) % cnt) - idx) * diff
+
+    #--------------------------------------------------------------------------
+    def subset(self, rows) -> InfoColumnsView:
+        "Returns ordered subset of respective rows as InfoColumnsView"
+
+        return InfoColumnsView(self, np.asarray(rows, dtype=np.int64))
+
+    #==========================================================================
+    # One row access
+    #--------------------------------------------------------------------------
+    def getPos(self, row:int, axeKey:str) -> float:
+        "Returns position of the row on respective axe"
+
+        if self._pos is None: toRet = float(self._gridPos(axeKey, row))
+        else                : toRet = float(self._pos[row, self._axes.index(axeKey)])
+
+        if axeKey in self._rings: toRet += self._ringShift(axeKey, row)
+        return toRet
+
+    #--------------------------------------------------------------------------
+    def setPos(self, row:int, axeKey:str, val):
+        "Sets position of the row on respective axe"
+
+        if axeKey in self._rings: val -= self._ringShift(axeKey, row)
+
+        self._materialize()
+        self._pos[row, self._axes.index(axeKey)] = val
+
+    #--------------------------------------------------------------------------
+    def getVal(self, row:int, valKey:str):
+        "Returns value of the row for respective key as python scalar or None if column does not exist"
+
+        col = self._vals.get(valKey)
+        if col is None: return None
+
+        val = col[row]
+        return val.item() if isinstance(val, np.generic) else val
+
+    #--------------------------------------------------------------------------
+    def setVal(self, row:int, valKey:str, val):
+        "Sets value of the row for respective key, allocates or upcasts the column when needed"
+
+        col = self._column(valKey, _rankOfValue(val))
+        col[row] = val
+
+    #==========================================================================
+    # Bulk access
+    #--------------------------------------------------------------------------
+    def column(self, valKey:str) -> np.ndarray|None:
+        "Returns column for respective value key or None if column was not written yet"
+
+        return self._vals.get(valKey)
+
+    #--------------------------------------------------------------------------
+    def setColumn(self, valKey:str, col:np.ndarray):
+        "Sets column for respective value key, column must have one value for each row"
+
+        if len(col) != self._cnt:
+            logger.error(f"InfoColumns.setColumn: Column '{valKey}' has {len(col)} values, expected {self._cnt}")
+            return
+
+        self._vals[valKey] = col
+
+    #--------------------------------------------------------------------------
+    def posArray(self, axeKey:str, rows=None) -> np.ndarray:
+        "Returns positions on respective axe for rows or for all rows if rows is None"
+
+        if self._pos is None:
+            idxs = np.arange(self._cnt, dtype=np.int64)
+            col  = self._gridPos(axeKey, idxs if rows is None else idxs[rows])
+
+        else:
+            col = self._pos[:, self._axes.index(axeKey)]
+            if rows is not None: col = col[rows]
+
+        if axeKey in self._rings:
+            rows = np.arange(self._cnt) if rows is None else np.asarray(rows)
+            col  = col + self._ringShift(axeKey, rows)
+
+        return col
+
+    #--------------------------------------------------------------------------
+    def positions(self) -> np.ndarray|None:
+        "Returns stored positions as float64 array [rows x axes] without ring shifts or None for lazy grid positions"
+
+        return self._pos
+
+    #--------------------------------------------------------------------------
+    def setPositions(self, pos:np.ndarray):
+        "Sets stored positions as float64 array [rows x axes] without ring shifts, grid definition is dropped"
+
+        if pos.shape != (self._cnt, len(self._axes)):
+            logger.error(f"InfoColumns.setPositions: Positions have shape {pos.shape}, expected {(self._cnt, len(self._axes))}")
+            return
+
+        self._pos  = pos
+        self._grid = None
+
+    #--------------------------------------------------------------------------
+    def valArray(self, valKey:str, rows=None) -> np.ndarray:
+        "Returns values for respective key for rows or for all rows, not written column reads as zeros"
+
+        col = self._vals.get(valKey)
+        if col is None: col = np.zeros(self._cnt)
+
+        return col if rows is None else col[rows]
+
+    #--------------------------------------------------------------------------
+    def setValArray(self, valKey:str, vals, rows=None):
+        "Sets values for respective key for rows or for all rows if rows is None"
+
+        vals = np.asarray(vals)
+        col  = self._column(valKey, _rankOfArray(vals))
+
+        if rows is None: col[:]    = vals
+        else           : col[rows] = vals
+
+    #--------------------------------------------------------------------------
+    def clearRows(self, rows, vals:dict={}):
+        "Sets all values of the rows to provided values or to 0 keeping dtype of existing columns"
+
+        for key in InfoPoint._lookup(self.ipType)['valKeys']:
+
+            if   key in vals      : self.setValArray(key, vals[key], rows)
+            elif key in self._vals: self._vals[key][rows] = 0
+            else                  : self.setValArray(key, 0, rows)
+
+    #--------------------------------------------------------------------------
+    def _column(self, valKey:str, rank:int) -> np.ndarray:
+        "Returns column for respective key able to store values of respective rank"
+
+        col = self._vals.get(valKey)
+
+        if col is None:
+            col = np.zeros(self._cnt, dtype=_DTYPES[rank])
+            self._vals[valKey] = col
+
+        elif rank > _rankOfArray(col):
+            col = col.astype(_DTYPES[rank])
+            self._vals[valKey] = col
+
+        return col
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def arrayOf(vals:list) -> np.ndarray:
+        "Returns numpy array of python values with the smallest column dtype able to store them, None reads as 0"
+
+        vals = [0 if val is None else val for val in vals]
+        rank = max((_rankOfValue(val) for val in vals), default=2)
+
+        toRet = np.empty(len(vals), dtype=_DTYPES[rank])
+        toRet[:] = vals
+        return toRet
+
+    #==========================================================================
+    # Show methods on arrays
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def showArray(showFtion, arr:np.ndarray) -> np.ndarray:
+        """Returns array of respective InfoPoint show method applied to the values.
+           Known show methods are evaluated vectorised, others element by element.
+        """
+
+        if   showFtion is InfoPoint.abs    : return np.abs(arr).astype(np.float64)
+        elif showFtion is InfoPoint.real   : return np.real(arr).astype(np.float64)
+        elif showFtion is InfoPoint.imag   : return np.imag(arr).astype(np.float64)
+        elif showFtion is InfoPoint.phase  : return np.angle(arr) if np.iscomplexobj(arr) else np.zeros(len(arr))
+        elif showFtion is InfoPoint.complex: return arr.astype(np.complex128)
+
+        elif showFtion is InfoPoint.fValue and arr.dtype.kind in 'biuf':
+            return arr.astype(np.float64)
+
+        return np.array([showFtion(val) for val in arr.tolist()])
+
+#==============================================================================
+# Inicializacia modulu
+#------------------------------------------------------------------------------
+print(f"InfoColumns ver {_VER}")
+
+if __name__ == '__main__':
+
+    logger.info("Testing InfoColumns class")
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
@@ -4,12 +4,12 @@
 import cmath
 
 from   .                      import logger
-from   .idata                 import InfoData
+from   .idata                 import InfoData, dataMethod
 
 #==============================================================================
 # Module's constants
 #------------------------------------------------------------------------------
-_VER    = '1.1.0'
+_VER    = '1.2.1'
 
 _CNT   = 1200                             # Default number of points
 _AXES  = {'x': 'Os X', 'y': 'Os Y'}       # Default axes
@@ -27,6 +27,7 @@ class ICurve(InfoData):
     #==========================================================================
     # Static variables & methods
     #--------------------------------------------------------------------------
+    _persistArgs = ()   # Constructor has no store argument, see InfoData.load()
 
     #==========================================================================
     # Constructor & utilities
@@ -54,28 +55,10 @@ class ICurve(InfoData):
         #----------------------------------------------------------------------
         logger.info(f"{self.name}.constructor: done")
 
-    #--------------------------------------------------------------------------
-    # Dynamics methods for ICurve
-    #--------------------------------------------------------------------------
-    def mapSetMethods(self) -> dict:
-        "Returns map of methods setting keyed value to function value for respective parameters"
-
-        methods = super().mapSetMethods()
-
-        methods['ISeries deltas'      ] = {'dataMethod' : self.deltas
-                                          ,'pointMethod':None
-                                          ,'params'     :{}
-                                          ,'visible'    :True
-                                          ,'paramAsk'   :True
-                                          ,'outData'    :None
-                                          ,'outKey'     :'d'
-                                          }
-
-        return methods
-
     #==========================================================================
     # Curve methods to apply in Dynamics methods
     #--------------------------------------------------------------------------
+    @dataMethod('ISeries deltas', outKey='d')
     def deltas(self, inKey:str, outKey:str, params:dict, outData:'InfoData'):
         """Compute auto-correlation of states for each phase.
         - inKey  : Key of the value to be read by the method
@@ -1,24 +1,35 @@
 #==============================================================================
 # Siqo class InfoData
 #------------------------------------------------------------------------------
+import bisect
 import functools
+import importlib
+import json
 import math
+import os
 import cmath
 import numpy                  as np
 import random                 as rnd
 
-from   .                      import logger
-from   .ipoint                import InfoPoint
+from   .                      import logger, logOn
+from   .ipoint                import InfoPoint, InfoPointCompact
+from   .icolumns              import InfoColumns
 
 #==============================================================================
 # Module's constants
 #------------------------------------------------------------------------------
-_VER    = '3.4.2'
+_VER    = '3.12.0'
 _IND    = '|  '       # Info indentation
 _UPP    = 10          # distance units per period
 
+_STORES = ('points', 'compact', 'columns')   # Storage engines: list of InfoPoints, list of InfoPointCompacts or numpy columns
+_ACT_CACHE = 32                   # Max count of cached active subdata views
+
 _F_POS  =  8          # Format for position
 
+_FILE_FMT  = 'InfoData 1'         # Format of the saved InfoData
+_FILE_HEAD = 'header.json'        # Header of the saved InfoData in the directory with .npy arrays
+
 #==============================================================================
 # Module's variables
 #------------------------------------------------------------------------------
@@ -41,7 +52,7 @@ def noEmptyData(function):
         # Before decorated function
         #----------------------------------------------------------------------
         self = args[0]
-        logger.debug(f"{self.name}.noEmptyData: {function.__name__}")
+        if logOn.debug: logger.debug(f"{self.name}.noEmptyData: {function.__name__}")
         resp = None
 
         #----------------------------------------------------------------------
@@ -60,6 +71,31 @@ def noEmptyData(function):
     #--------------------------------------------------------------------------
     return wrapper
 
+#==============================================================================
+# Json conversion of numpy scalars
+#------------------------------------------------------------------------------
+def _jsonDefault(val):
+    "Converts numpy scalars and arrays for json.dump, other objects are not serializable"
+
+    if isinstance(val, (np.generic, np.ndarray)): return val.tolist()
+    raise TypeError(f"Object of type {type(val).__name__} is not JSON serializable")
+
+#==============================================================================
+# Registration of the data methods
+#------------------------------------------------------------------------------
+def dataMethod(key:str, params:dict={}, visible:bool=True, paramAsk=True, outData:str=None, outKey:str=None):
+    """This decorator registers method of InfoData (or subclass) as data method with key in mapSetMethods().
+       Registry of the class is built once from InfoPoint methods and registered methods of the class
+       and its base classes in this order, subclass may register the key of the base class again.
+    """
+
+    def register(method):
+
+        method._dataMethod = (key, {'params': dict(params), 'visible': visible, 'paramAsk': paramAsk, 'outData': outData, 'outKey': outKey})
+        return method
+
+    return register
+
 #==============================================================================
 # InfoData
 #------------------------------------------------------------------------------
@@ -71,6 +107,9 @@ class InfoData:
        retrieval of points by coordinates and definition of active subdata.
        InfoData can be copied and its ipType can be changed with reset of all data.
        InfoData can be converted to 2D numpy array for visualization in IFieldMatrixGui.
+       InfoData stores points as list of InfoPoints (store='points'), list of compact
+       InfoPoints (store='compact') or as numpy columns with InfoPoints as lightweight
+       row views (store='columns').
     """
 
     #==========================================================================
@@ -78,6 +117,11 @@ class InfoData:
     #--------------------------------------------------------------------------
     datas = {}  # Static dict of all InfoData instances as {name: InfoData}
 
+    _visiblePrefix = None   # If not None, only set methods with key starting with this prefix are visible
+
+    _persistArgs   = ('store',)   # Attributes passed by name to the constructor when loading saved data
+    _persistAttrs  = ()           # Attributes restored after construction when loading saved data
+
     #--------------------------------------------------------------------------
     @staticmethod
     def getData(name) -> 'InfoData|None':
@@ -147,24 +191,83 @@ class InfoData:
         #----------------------------------------------------------------------
         return toRet
 
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def load(path:str, name:str=None, mmap:bool=True) -> 'InfoData|None':
+        """Loads InfoData saved by save() from the directory path.
+           1. Instance of the saved class is created by its constructor with saved arguments _persistArgs
+           2. name is the name of the loaded InfoData, None means the saved name
+           3. If mmap, arrays are memory mapped copy-on-write (np.load with mmap_mode='c'), they are paged in
+              lazily with the first access and changes of the values are not written back into the files
+           Returns loaded InfoData or None if the files can not be read.
+        """
+
+        logger.info(f"InfoData.load: From '{path}' as '{name}', mmap={mmap}")
+
+        #----------------------------------------------------------------------
+        # Nacitanie hlavicky a kontrola formatu
+        #----------------------------------------------------------------------
+        try:
+            with open(os.path.join(path, _FILE_HEAD), 'r', encoding='utf8') as f:
+                header = json.load(f)
+
+        except (OSError, ValueError) as err:
+            logger.error(f"InfoData.load: Header of '{path}' can not be read: {err}")
+            return None
+
+        if header.get('format') != _FILE_FMT:
+            logger.error(f"InfoData.load: '{path}' has format '{header.get('format')}', expected '{_FILE_FMT}'")
+            return None
+
+        #----------------------------------------------------------------------
+        # Trieda ulozenych dat a polia
+        #----------------------------------------------------------------------
+        try:
+            cls    = getattr(importlib.import_module(header['module']), header['class'])
+            arrays = {key: np.load(os.path.join(path, f"{key}.npy"), mmap_mode='c' if mmap else None)
+                      for key in header['arrays']}
+
+        except (ImportError, AttributeError, OSError, ValueError) as err:
+            logger.error(f"InfoData.load: Data of '{path}' can not be read: {err}")
+            return None
+
+        #----------------------------------------------------------------------
+        # Vytvorenie instancie a obnovenie dat
+        #----------------------------------------------------------------------
+        toRet = cls(name if name is not None else header['name'], **header['args'])
+        toRet._restore(header, arrays)
+
+        #----------------------------------------------------------------------
+        logger.info(f"InfoData.load: {header['class']} '{toRet.name}' with {len(toRet.points)} points loaded from '{path}'")
+        return toRet
+
     #==========================================================================
     # Constructor & utilities
     #--------------------------------------------------------------------------
-    def __init__(self, name):
+    def __init__(self, name, store:str='points'):
         """Calls constructor of InfoData of respective name.
            Constructor initializes all public and private data structures of InfoData.
            Constructor does not initialize points in InfoData nor set ipType,
            it is expected that they will be added later.
+           store defines storage engine of the points:
+           - 'points'  : list of InfoPoint objects
+           - 'compact' : list of InfoPointCompact objects with positions and values in one list per point
+           - 'columns' : InfoColumns with positions and values as numpy columns
         """
 
-        logger.debug(f"InfoData.constructor: {name}")
+        logger.debug(f"InfoData.constructor: {name}, store={store}")
+
+        if store not in _STORES:
+            logger.error(f"InfoData.constructor: Unknown store '{store}', expected one of {_STORES}")
+            raise ValueError(f"Unknown store '{store}' for InfoData")
 
         #----------------------------------------------------------------------
         # Public datove polozky triedy
         #----------------------------------------------------------------------
         self.name         = name        # Name of the InfoData
         self.ipType       = None        # Type of the InfoPoint in this InfoData
-        self.points       = [InfoPoint] # List of InfoPoints
+        self.store        = store       # Storage engine of the points
+        self.points       = InfoColumns() if store == 'columns' else [] # List of InfoPoints or InfoColumns
         self.gui          = None        # InfoDataGui instance for this InfoData
         self.staticEdge   = False       # Static edge means value of the edge points is fixed in some methods
 
@@ -183,6 +286,12 @@ class InfoData:
 
         self._subProducts = []          # List of subproducts of _cnts [1, A, AB, ABC, ...]
         self._lastPos     = None        # Last position used in pointByPos for faster access
+        self._actCache    = {}          # Cache of active subdata views as {(actSubKey, ringKey): actList}
+        self._actRing     = ()          # Offsets of the ring axes for which self.actList was computed
+        self._ringOffs    = {}          # Ring axes as {axeKey: offset}, physical idx = (logical idx - offset) % cnt
+        self._axeIndex    = None        # Index of points of 1-axe data as {axeVal: InfoPoint}, built by initAdd
+        self._axeSorted   = []          # Sorted axe values of 1-axe data aligned with self.points
+        self._methods     = None        # Set methods with data methods bound to this instance, built by mapSetMethods
 
         #----------------------------------------------------------------------
         # Zapis do zoznamu instancii InfoData Inicializacia
@@ -200,27 +309,87 @@ class InfoData:
         return self.info()['msg']
 
     #--------------------------------------------------------------------------
-    def __array__(self) -> np.array:
-        """Returns active subdata of the InfoData as 2D numpy array.
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """Returns active subdata of the InfoData as numpy array shaped by counts of not freezed axes.
            Value of the array is defined by self.actVal as key of the InfoPoint's dat value.
            This method is used for visualization of InfoData in IFieldMatrixGui.
+        """
 
-           This method is not good defined, FIX IN THE FUTURE
+        arr = self.asArray()
+        if arr is None: return np.array([], dtype=dtype)
+
+        if dtype is not None: arr = arr.astype(dtype, copy=False)
+        return arr.copy() if copy else arr
+
+    #--------------------------------------------------------------------------
+    def asArray(self, valKey:str=None, actSubIdxs:dict=None) -> np.ndarray|None:
+        """Returns values for respective key as numpy array shaped by counts of not freezed axes,
+           array axis i is the i-th not freezed axe of the schema.
+           1. valKey is None means self.actVal
+           2. actSubIdxs is dict of freezed axesKeys with indices, None means self.actSubIdxs,
+              active subdata definition of the InfoData is not changed
+           For store='columns' returns view into the column without copying (writes go to the data),
+           only ring axes with nonzero offset are rolled into a copy. Otherwise values are gathered
+           at once. Returns None if value key or subdata definition is not valid.
         """
 
-        mtrx = self.actSubData(keyVal=self.actVal)
+        if valKey     is None: valKey     = self.actVal
+        if actSubIdxs is None: actSubIdxs = self.actSubIdxs
 
         #----------------------------------------------------------------------
-        # Kontrola existencie vybranej 2D matice
+        # Kontrola kluca hodnoty a definicie subdata
         #----------------------------------------------------------------------
-        if mtrx is None:
-            logger.error(f"{self.name}.__array__: actData is None")
+        if valKey is None:
+            logger.error(f"{self.name}.asArray: valKey is None")
             return None
 
+        freezed = {axe: axeIdx for axe, axeIdx in actSubIdxs.items() if axeIdx is not None}
+
+        for axe, axeIdx in freezed.items():
+            if axe not in self._cnts.keys() or not (0 <= axeIdx < self._cnts[axe]):
+                logger.error(f"{self.name}.asArray: Index {axeIdx} of axe '{axe}' is not in InfoData axes {self._cnts}")
+                return None
+
+        keys  = list(self._cnts.keys())
+        shape = [self._cnts[key] for key in keys if key not in freezed]
+        col   = self.points.column(valKey) if self.store == 'columns' else None
+
+        #----------------------------------------------------------------------
+        # Pohlad do stlpca: reshape na vsetky osi, os s nizsim idx je najrychlejsia
+        #----------------------------------------------------------------------
+        if col is not None:
+
+            full = col.reshape([self._cnts[key] for key in keys][::-1]).T
+            sel  = tuple((freezed[key] - self._ringOffs.get(key, 0)) % self._cnts[key] if key in freezed else slice(None) for key in keys)
+            arr  = np.asarray(full[sel])
+
+            #------------------------------------------------------------------
+            # Ring osi s nenulovym offsetom posuniem do logickeho poradia
+            #------------------------------------------------------------------
+            for ax, key in enumerate([key for key in keys if key not in freezed]):
+                if self._ringOffs.get(key): arr = np.roll(arr, self._ringOffs[key], axis=ax)
+
+            return arr if len(shape) > 0 else arr.reshape(1)
+
         #----------------------------------------------------------------------
-        # Vratim skonvertovane do np.array
+        # Hodnoty pozicii mriezky naraz, tvar podla poctu bodov v nezmrazenych osiach
         #----------------------------------------------------------------------
-        return np.array(mtrx)
+        poss = self._latticePoss(freezed)
+
+        if self.store == 'columns': arr = self.points.valArray(valKey, poss)
+        else                      : arr = self.valArray(valKey, points=[self.points[pos] for pos in poss.tolist()])
+
+        if len(shape) > 0 and np.prod(shape) == arr.size:
+            arr = arr.reshape(shape[::-1]).T
+
+        return arr
+
+    #--------------------------------------------------------------------------
+    def _newPoint(self, *, pos=None, vals=None) -> InfoPoint:
+        "Creates new InfoPoint of this InfoData, InfoPointCompact for store='compact'"
+
+        if self.store == 'compact': return InfoPointCompact(self.ipType, pos=pos, vals=vals)
+        else                      : return InfoPoint       (self.ipType, pos=pos, vals=vals)
 
     #--------------------------------------------------------------------------
     def getDatas(self, noSelf=False) -> dict:
@@ -267,6 +436,11 @@ class InfoData:
         self._origs     = {}       # Origin's coordinates of the InfoData for respective axes in lambda units
         self._rects     = {}       # Lenghts of the InfoData for respective axes in lambda units
         self._diffs     = {}       # Distance between two points in respective axes in lambda units
+        self._actCache  = {}       # Cache of active subdata views
+        self._actRing   = ()       # Offsets of the ring axes for actList
+        self._ringOffs  = {}       # Ring axes with offsets
+        self._axeIndex  = None     # Index of points of 1-axe data
+        self._axeSorted = []       # Sorted axe values of 1-axe data
 
         #----------------------------------------------------------------------
         # Reset GUI display options to default values based on new ipType
@@ -361,7 +535,7 @@ class InfoData:
             self.init()
 
         #----------------------------------------------------------------------
-        logger.debug(f"{self.name}.count: Count of points is {toRet} with check={check}")
+        if logOn.debug: logger.debug(f"{self.name}.count: Count of points is {toRet} with check={check}")
         return toRet
 
     #--------------------------------------------------------------------------
@@ -374,9 +548,8 @@ class InfoData:
         #----------------------------------------------------------------------
         # Create new InfoData with the same dimensions
         #----------------------------------------------------------------------
-        toRet = InfoData(name, self.ipType)
+        toRet = InfoData(name, store=self.store)
 
-        toRet.points     = []                  # List of InfoPoints
         toRet.ipType     = self.ipType         # Type of the InfoPoint in this InfoData
         toRet.staticEdge = self.staticEdge     # Static edge means value of the edge nodes is fixed
 
@@ -389,12 +562,19 @@ class InfoData:
         toRet._origs     = self._origs.copy()  # Origin's coordinates of the InfoData
         toRet._rects     = self._rects.copy()  # Lengths of the InfoData's axes
         toRet._diffs     = self._diffs.copy()  # Distance between two points in respective axes in lambda units
+        toRet._subProducts = self._subProducts.copy()
+        toRet._ringOffs    = self._ringOffs.copy()
 
         #----------------------------------------------------------------------
         # Copy all points from this InfoData to the new one
         #----------------------------------------------------------------------
-        for point in self.points:
-            toRet.points.append(point.copy())
+        if self.store == 'columns':
+            toRet.points = self.points.copy()
+
+        else:
+            toRet.points = [self._newPoint(pos=point.pos(), vals=point.val()) for point in self.points]
+
+        toRet.actSubData(actSubIdxs=toRet.actSubIdxs, force=True)
 
         #----------------------------------------------------------------------
         return toRet
@@ -478,6 +658,8 @@ class InfoData:
         # Priprava na init()
         #----------------------------------------------------------------------
         self.points.clear()    # Clear all points in the InfoData
+        self._actCache = {}    # Cached active subdata views are not valid anymore
+        self._axeIndex = None  # Index of points will be rebuilt by initAdd
 
         #----------------------------------------------------------------------
         # Set new data structure parameters
@@ -512,25 +694,32 @@ class InfoData:
             else      : self._diffs[key] = 0                         # If only one point, distance is zero
 
         #----------------------------------------------------------------------
-        # Generate InfoPoints at respective positions
+        # Columns store dostane iba definiciu mriezky, pozicie sa pocitaju az na poziadanie
         #----------------------------------------------------------------------
-        point = None
-        for pos in range(self.count(check=False)):
+        keys = list(self._cnts.keys())
 
-            #------------------------------------------------------------------
-            # Compute coordinates of the InfoPoint for respective position and indices
-            #------------------------------------------------------------------
-            idxs = self._idxsByPos(pos)          # Get indices of the InfoPoint for respective position
-            coos = {}                            # Coordinates of the InfoPoint in lambda units
+        if self.store == 'columns':
 
-            for i, key in enumerate(self._cnts.keys()):
-                coos[key] = self._origs[key] + (idxs[i] * self._diffs[key])
+            self.points.allocGrid(self.ipType, [self._cnts[key] for key in keys]
+                                             , [self._origs[key] for key in keys]
+                                             , [self._diffs[key] for key in keys])
 
             #------------------------------------------------------------------
-            # Create new InfoPoint at respective coordinates
+            # Ring osi ostavaju ringami s nulovym offsetom
             #------------------------------------------------------------------
-            point = InfoPoint(self.ipType, pos=coos)
-            self.points.append(point)
+            self._ringOffs = {key: 0 for key in self._ringOffs.keys() if key in self._cnts}
+            for key in self._ringOffs.keys(): self._ringSet(key, 0)
+
+        #----------------------------------------------------------------------
+        # Generate InfoPoints at respective positions, coordinates of all points are computed at once
+        #----------------------------------------------------------------------
+        else:
+            poss = np.arange(self.count(check=False), dtype=np.int64)
+            coos = [(self._origs[key] + ((poss // self._subProducts[i]) % self._cnts[key]) * self._diffs[key]).tolist()
+                    for i, key in enumerate(keys)]
+
+            for cooVals in zip(*coos):
+                self.points.append(self._newPoint(pos=dict(zip(keys, cooVals))))
 
         #----------------------------------------------------------------------
         # Active subset je full data
@@ -546,12 +735,12 @@ class InfoData:
     def initAdd(self, axeVal) -> InfoPoint|None:
         """
         Add one new InfoPoint into existing InfoData strictly for axes with one axe only.
-        If axes has more than one axe, this method is not applicable and returns False.
+        If axes has more than one axe, this method is not applicable and returns None.
 
-        1. If axeVal is already present in the existing InfoData, this method does not add new point and returns False.
+        1. If axeVal is already present in the existing InfoData, this method does not add new point and returns None.
         2. Creates new InfoPoint with the same ipType as this InfoData and with axe value axeVal and default vals.
-        3. Created InfoPoint is added at the end of the existing self.points.
-        4. After addition, list self.points is sorted by axe value.
+        3. Created InfoPoint is inserted into self.points at the position keeping points sorted by axe value (bisect).
+        4. Index of points by axe value self._axeIndex is updated, it is built from self.points with the first call.
         5. Structure parameters self._cnts, self._origs and self._rects are updated accordingly.
         6. self._subProducts and self._diffs are recalculated.
         7. Active subset is reset to full data.
@@ -575,29 +764,34 @@ class InfoData:
             return None
 
         #----------------------------------------------------------------------
-        # Get the axe key
+        # Get the axe key and index of existing points
         #----------------------------------------------------------------------
-        axeKey = list(self._cnts.keys())[0]
+        axeKey = next(iter(self._cnts))
+        index  = self._axeIndexGet()
 
         #----------------------------------------------------------------------
         # Check if axeVal already exists in the existing data
         #----------------------------------------------------------------------
-        for point in self.points:
-            if point.pos(axeKey) == axeVal:
-                logger.error(f"{self.name}.initAdd: axeVal={axeVal} already exists in {axeKey} axe, cannot add duplicate")
-                return None
+        if axeVal in index:
+            logger.error(f"{self.name}.initAdd: axeVal={axeVal} already exists in {axeKey} axe, cannot add duplicate")
+            return None
 
         #----------------------------------------------------------------------
         # Create new InfoPoint with the given axe value
         #----------------------------------------------------------------------
-        newPoint = InfoPoint(self.ipType, pos={axeKey: axeVal})
+        newPoint = self._newPoint(pos={axeKey: axeVal})
         newPoint.clear()                 # Clear all values to default
 
         #----------------------------------------------------------------------
-        # Append new Point to list of points and sort points by axe value
+        # Insert new Point into sorted list of points
         #----------------------------------------------------------------------
-        self.points.append(newPoint)
-        self.points.sort(key=lambda p: p.pos(axeKey))
+        row = bisect.bisect_left(self._axeSorted, axeVal)
+
+        self._axeSorted.insert(row, axeVal)
+        self.points.insert(row, newPoint)
+
+        if self.store == 'columns': newPoint = self.points[row]
+        index[axeVal] = newPoint
 
         #----------------------------------------------------------------------
         # Update _cnts in axeKey (increment count)
@@ -605,11 +799,10 @@ class InfoData:
         self._cnts[axeKey] += 1
 
         #----------------------------------------------------------------------
-        # Update _origs and _rects in axeKey - find min and max positions
+        # Update _origs and _rects in axeKey from min and max positions
         #----------------------------------------------------------------------
-        positions = [p.pos(axeKey) for p in self.points]
-        self._origs[axeKey] = min(positions)
-        self._rects[axeKey] = max(positions) - min(positions)
+        self._origs[axeKey] = self._axeSorted[0]
+        self._rects[axeKey] = self._axeSorted[-1] - self._axeSorted[0]
 
         #----------------------------------------------------------------------
         # Recalculate _diffs for axeKey
@@ -620,14 +813,10 @@ class InfoData:
         else      : self._diffs[axeKey] = 0                             # If only one point, distance is zero
 
         #----------------------------------------------------------------------
-        # Recalculate _subProducts
+        # Recalculate _subProducts, for one axe it is [1]
         #----------------------------------------------------------------------
         self._subProducts = [1]
-
-        for cnt in self._cnts.values():
-            self._subProducts.append(cnt * self._subProducts[-1])
-
-        self._subProducts.pop()   # Remove last element which is the product of all dimensions
+        self._actCache    = {}    # Cached active subdata views are not valid anymore
 
         #----------------------------------------------------------------------
         # Reset active subset to full data
@@ -635,10 +824,41 @@ class InfoData:
         self.actSubData(actSubIdxs={}, force=True)
 
         #----------------------------------------------------------------------
-        pts = len(self.points)
-        logger.debug(f"{self.name}.initAdd: '{newPoint._ipType}' with axeVal={axeVal}, total {pts} points in '{axeKey}' axe")
+        logger.debug(f"{self.name}.initAdd: '{newPoint._ipType}' with axeVal={axeVal}, total {len(self.points)} points in '{axeKey}' axe")
         return newPoint
 
+    #--------------------------------------------------------------------------
+    def _axeIndexGet(self) -> dict:
+        """Returns index of points of 1-axe data as dict {axeVal: InfoPoint}.
+           Index and sorted list of axe values are built from self.points if they do not exist yet.
+        """
+
+        if self._axeIndex is None:
+
+            axeKey          = next(iter(self._cnts))
+            self._axeIndex  = {point.pos(axeKey): point for point in self.points}
+            self._axeSorted = sorted(self._axeIndex.keys())
+
+        return self._axeIndex
+
+    #--------------------------------------------------------------------------
+    def pointByAxeVal(self, axeVal) -> InfoPoint|None:
+        """Returns InfoPoint of 1-axe data with exact position axeVal using index of points.
+           If such point does not exist or data has not exactly 1 axe, returns None.
+        """
+
+        if len(self._cnts) != 1: return None
+
+        point = self._axeIndexGet().get(axeVal)
+
+        #----------------------------------------------------------------------
+        # Pohlady na riadky stlpcoveho ulozenia sa po vlozeni posuvaju, riadok urcim z poradia
+        #----------------------------------------------------------------------
+        if point is not None and self.store == 'columns':
+            point = self.points[bisect.bisect_left(self._axeSorted, axeVal)]
+
+        return point
+
     #==========================================================================
     # All values modification
     #--------------------------------------------------------------------------
@@ -839,9 +1059,46 @@ class InfoData:
 
         return InfoPoint.mapShowMethods()
 
+    #--------------------------------------------------------------------------
+    @classmethod
+    def _methodRegistry(cls) -> dict:
+        """Returns registry of set methods of the class as {methodKey: methodDef}, where dataMethod
+           is name of the method. Registry is built once per class from InfoPoint.mapSetMethods()
+           and methods registered by @dataMethod in the class and its base classes.
+        """
+
+        if '_methodDefs' in cls.__dict__: return cls._methodDefs
+
+        methods = InfoPoint.mapSetMethods()
+
+        #----------------------------------------------------------------------
+        # Registrovane metody od najvzdialenejsieho predka
+        #----------------------------------------------------------------------
+        for klass in reversed(cls.__mro__):
+            for name, attr in klass.__dict__.items():
+
+                if not hasattr(attr, '_dataMethod'): continue
+
+                key, methodDef = attr._dataMethod
+                methods[key] = {'dataMethod': name, 'pointMethod': None, **methodDef}
+
+        #----------------------------------------------------------------------
+        # Viditelnost metod podla prefixu triedy
+        #----------------------------------------------------------------------
+        if cls._visiblePrefix is not None:
+            for key, methodDef in methods.items():
+                if not key.startswith(cls._visiblePrefix): methodDef['visible'] = False
+
+        cls._methodDefs = methods
+        cls._methodKeys = [key for key, methodDef in methods.items() if methodDef.get('visible', True)]
+
+        logger.debug(f"{cls.__name__}._methodRegistry: {len(methods)} set methods registered")
+        return methods
+
     #--------------------------------------------------------------------------
     def mapSetMethods(self) -> dict:
-        """Returns map of methods for one InfoPoint setting.
+        """Returns map of methods for one InfoPoint setting. Map is built once for this instance
+           from the registry of the class, returned map should not be modified.
 
         Structure:
             {pointMethodName: {
@@ -857,6 +1114,7 @@ class InfoData:
         where 'params' is dict of parameters for the method with default values.
 
         Note:
+        - Data methods are registered by @dataMethod decorator, point methods by InfoPoint.mapSetMethods()
         - If paramAsk is True,  parameters should be asked to user in GUI
         - If paramAsk is False, default values are used without asking
         - If visible is False, method should not be shown in GUI
@@ -866,35 +1124,30 @@ class InfoData:
              output from method assigns it to outKey
         """
 
-        methods = InfoPoint.mapSetMethods()
+        if self._methods is None:
 
-        methods['<Data Methods>'] = {'dataMethod' : self.nullMethod
-                                    ,'visible'    :True
-                                    ,'pointMethod':None
-                                    ,'params'     :{}
-                                    ,'paramAsk'   :True
-                                    ,'outData'    :None
-                                    ,'outKey'     :None
-                                    }
-        methods['Move data'     ] = {'dataMethod': self.moveData
-                                    ,'visible'    :True
-                                    ,'pointMethod':None
-                                    ,'params'     :{'startIdx':0, 'deltaIdx':1}
-                                    ,'paramAsk'   :True
-                                    ,'outData'    :None
-                                    ,'outKey'     :None
-                                    }
+            self._methods = {}
 
-        return methods
+            for key, methodDef in self._methodRegistry().items():
+
+                if methodDef.get('dataMethod') is None: self._methods[key] = methodDef
+                else                                  : self._methods[key] = {**methodDef, 'dataMethod': getattr(self, methodDef['dataMethod'])}
+
+        return self._methods
+
+    #--------------------------------------------------------------------------
+    def methodDef(self, methodKey:str) -> dict|None:
+        "Returns definition of the set method for respective key or None if method is not defined"
+
+        return self.mapSetMethods().get(methodKey)
 
     #--------------------------------------------------------------------------
     def visibleMethodKeys(self) -> list:
         """Returns list of keys of mapped methods with 'visible'==True
         """
 
-        methods = self.mapSetMethods()
-
-        return [key for key, val in methods.items() if val.get('visible', True)]
+        self._methodRegistry()
+        return list(self._methodKeys)
 
     #==========================================================================
     # Dynamic Methods application
@@ -904,6 +1157,7 @@ class InfoData:
 
              1. methodKey: Name of the method to apply.
                            If methodKey is not in defined methods, logs error and returns None.
+                           If 'batchMethod'  is defined in the method, it will set values of all points in the active subdata at once.
                            If 'pointMethod'  is defined in the method, it will be applied to all points in the active subdata.
                            If 'dataMethod' is defined in the method, it will be applied directly to the data.
 
@@ -915,28 +1169,35 @@ class InfoData:
            Returns count of updated InfoPoints or None if initialization failed due to incompatible parameters or undefined ipType.
         """
 
-        logger.warning(f"{self.name}.applyDataMethod: methodKey='{methodKey}', inKey='{inKey}', outKey='{outKey}', params={params}, outData='{outData.name}'")
+        if logOn.debug: logger.debug(f"{self.name}.applyDataMethod: methodKey='{methodKey}', inKey='{inKey}', outKey='{outKey}', params={params}, outData='{outData.name}'")
         pts = 0
 
         #----------------------------------------------------------------------
         # Ziskanie vykonavanej funkcie a jej parametrov
         #----------------------------------------------------------------------
-        methods = self.mapSetMethods()
+        method = self.methodDef(methodKey)
 
-        if methodKey not in methods.keys():
+        if method is None:
             logger.error(f"{self.name}.applyDataMethod: '{methodKey}' is not in defined functions, command denied")
             return None
 
-        else:
-            method = methods[methodKey]
+        #----------------------------------------------------------------------
+        # Ak je definovana batchMethod, aplikujem ju pomocou _applyBatchMethod()
+        #----------------------------------------------------------------------
+        if method.get('batchMethod') is not None:
+
+            batchMethod = method['batchMethod']
+            if logOn.debug: logger.debug(f"{self.name}.applyDataMethod: {batchMethod.__name__}({params}) for value key='{outKey}' in outData='{outData.name}'")
+
+            pts = self._applyBatchMethod(batchMethod=batchMethod, inKey=inKey, outKey=outKey, params=params)
 
         #----------------------------------------------------------------------
         # Ak je definovana pointMethod, aplikujem ju pomocou _applyPointMethod()
         #----------------------------------------------------------------------
-        if 'pointMethod' in method.keys() and method['pointMethod'] is not None:
+        elif 'pointMethod' in method.keys() and method['pointMethod'] is not None:
 
             pointMethod = method['pointMethod']
-            logger.debug(f"{self.name}.applyDataMethod: {pointMethod.__name__}({params}) for value key='{outKey}' in outData='{outData.name}'")
+            if logOn.debug: logger.debug(f"{self.name}.applyDataMethod: {pointMethod.__name__}({params}) for value key='{outKey}' in outData='{outData.name}'")
 
             pts = self._applyPointMethod(pointMethod=pointMethod, inKey=inKey, outKey=outKey, params=params)
 
@@ -946,7 +1207,7 @@ class InfoData:
         elif 'dataMethod' in method.keys() and method['dataMethod'] is not None:
 
             dataMethod = method['dataMethod']
-            logger.debug(f"{self.name}.applyDataMethod: {dataMethod.__name__}({params}) for value key='{outKey}' in outData='{outData.name}'")
+            if logOn.debug: logger.debug(f"{self.name}.applyDataMethod: {dataMethod.__name__}({params}) for value key='{outKey}' in outData='{outData.name}'")
 
             pts = self._applyDataMethod(dataMethod=dataMethod, inKey=inKey, outKey=outKey, params=params, outData=outData)   # self uz bolo predane pri priradeni do premennej dataMethod
 
@@ -997,6 +1258,38 @@ class InfoData:
         logger.info(f"{self.name}._applyPointMethod: {pts} InfoPoints was updated for '{outKey}'<-{pointMethod.__name__}({inKey}, {params})")
         return pts
 
+    #--------------------------------------------------------------------------
+    def _applyBatchMethod(self, batchMethod, inKey:str, outKey:str, params:dict) -> int|None:
+        """Dynamic data method for applying batch version of the Point method to list of Points.
+
+               1. batchMethod : Batch method returning numpy array of values for all target points
+               2. inKey       : Key of the value to be read by the method
+               3. outKey      : Key of the value to be set by the method
+               4. params      : Parameters for the method as dict
+                                If 'all' in params and params['all'] == True, method will be applied to all points,
+                                otherwise only to active subset of points.
+
+            Returns count of updated InfoPoints or None if initialization failed due to incompatible parameters or undefined ipType.
+        """
+
+        logger.info(f"{self.name}._applyBatchMethod: {batchMethod.__name__}({inKey}, {params}) for value key='{outKey}'")
+
+        #----------------------------------------------------------------------
+        # Ziskanie listu bodov na aplikovanie funkcie
+        #----------------------------------------------------------------------
+        if 'all' in params.keys() and params['all'] == True: tgtList = self.points
+        else                                               : tgtList = self.actList
+
+        #----------------------------------------------------------------------
+        # Vypocet hodnot pre vsetky body naraz a ich zapis
+        #----------------------------------------------------------------------
+        vals = batchMethod(tgtList, inKey=inKey, outKey=outKey, params=params)
+        pts  = self.setValArray(outKey, vals, points=tgtList)
+
+        #----------------------------------------------------------------------
+        logger.info(f"{self.name}._applyBatchMethod: {pts} InfoPoints was updated for '{outKey}'<-{batchMethod.__name__}({inKey}, {params})")
+        return pts
+
     #--------------------------------------------------------------------------
     def _applyDataMethod(self, dataMethod, inKey:str, outKey:str, params:dict, outData:'InfoData') -> int|None:
         """Dynamic data method for applying to list of Points.
@@ -1025,77 +1318,50 @@ class InfoData:
     #==========================================================================
     # Internal tools for position and indices
     #--------------------------------------------------------------------------
-    def _subPeriods(self, axeKey:str) -> tuple:
-        """Returns period,serie & groups for respective axe"""
+    def _latticePoss(self, subIdxs:dict) -> np.ndarray:
+        """Returns ordered positions of Points as numpy array for the lattice given by
+           dict of freezed axesKeys with indices {axeKey: axeIdx}. Not freezed axes
+           (missing or with None index) run through all their indices.
+           Positions are computed arithmetically as sum(idx[i] * subProducts[i]),
+           indices of the ring axes are shifted by their offsets.
+        """
 
-        logger.debug(f"{self.name}._subPeriods: axeKey={axeKey}")
-
-        subs   = self._subProducts
-        axePos = self.axeIdxByKey(axeKey)
-        count  = self.count()
+        if logOn.debug: logger.debug(f"{self.name}._latticePoss: subIdxs={subIdxs}")
 
         #----------------------------------------------------------------------
-        # Pocet Points v jednej grupe
+        # Skladam mriezku od najpomalsej osi, vysledok je usporiadany podla indexov
         #----------------------------------------------------------------------
-        serie  = subs[axePos  ]                            # Pocet Points v jednej grupe
-        logger.debug(f"{self.name}._subPeriods: serie={serie} for axeKey={axeKey}")
+        toRet = np.zeros(1, dtype=np.int64)
 
-        #----------------------------------------------------------------------
-        # Perioda v akej sa opakuju grupy
-        #----------------------------------------------------------------------
-        if axePos+1>=len(subs): period = count
-        else                  : period = subs[axePos+1]    # Perioda v akej sa opakuju grupy
-        logger.debug(f"{self.name}._subPeriods: period={period} for axeKey={axeKey}")
-
-        #----------------------------------------------------------------------
-        # Pocet grup s indexom axeIdx v osi axeKey
-        #----------------------------------------------------------------------
-        groups = self.count() // period                    # Pocet grup s indexom axeIdx v osi axeKey
-        logger.debug(f"{self.name}._subPeriods: groups={groups} for axeKey={axeKey}")
+        for i, (axe, cnt) in reversed(list(enumerate(self._cnts.items()))):
 
-        return period, serie, groups
+            axeIdx = subIdxs.get(axe)
 
-    #--------------------------------------------------------------------------
-    def _possByAxeIdx(self, axeKey:str, axeIdx:int) -> set:
-        """Returns set of positions of Points belonging to the axe with respective index axeIdx
-           in the axe with respective key axeKey.
-        """
+            if axeIdx is None: idxs = np.arange(cnt, dtype=np.int64)
+            else             : idxs = np.array([axeIdx], dtype=np.int64)
 
-        logger.debug(f"{self.name}._possByAxeIdx: axeKey={axeKey}, axeIdx={axeIdx}")
+            if self._ringOffs.get(axe): idxs = (idxs - self._ringOffs[axe]) % cnt
 
-        #----------------------------------------------------------------------
-        # Zistim hodnoty serie, period a groups pre danu os axeKey
-        #----------------------------------------------------------------------
-        period, serie, groups = self._subPeriods(axeKey)
-        toRet = set()
+            toRet = (toRet[:, None] + idxs[None, :] * self._subProducts[i]).ravel()
 
         #----------------------------------------------------------------------
-        # Prejdem vsetky grupy
-        #-----------------------------------------------------------------------
-        for grp in range(groups):
-
-            #------------------------------------------------------------------
-            # Vypocitam zaciatok a koniec grupy
-            #------------------------------------------------------------------
-            start = (grp * period) + (axeIdx * serie)
-            stop  = start + serie
+        if logOn.debug: logger.debug(f"{self.name}._latticePoss: Found {len(toRet)} positions for subIdxs={subIdxs}")
+        return toRet
 
-            #------------------------------------------------------------------
-            # Vlozim Points s indexom axeIdx do zoznamu toRet
-            #------------------------------------------------------------------
-            for pos in range(start, stop):
-                toRet.add(pos)
+    #--------------------------------------------------------------------------
+    def _possByAxeIdx(self, axeKey:str, axeIdx:int) -> np.ndarray:
+        """Returns ordered positions of Points belonging to the axe with respective index axeIdx
+           in the axe with respective key axeKey.
+        """
 
-        #-----------------------------------------------------------------------
-        logger.debug(f"{self.name}._possByAxeIdx: Found {len(toRet)} positions for axeKey={axeKey}, axeIdx={axeIdx}")
-        return toRet
+        return self._latticePoss({axeKey: axeIdx})
 
     #--------------------------------------------------------------------------
     def _axeValByIdx(self, axeKey:str, axeIdx:int) -> float:
         """Returns value of the axe with respective index axeIdx in lambda units
         """
 
-        logger.debug(f"{self.name}._axeValByIdx: axeKey={axeKey}, axeIdx={axeIdx}")
+        if logOn.debug: logger.debug(f"{self.name}._axeValByIdx: axeKey={axeKey}, axeIdx={axeIdx}")
 
         #----------------------------------------------------------------------
         # Kontrola existencie osi
@@ -1109,7 +1375,7 @@ class InfoData:
         #----------------------------------------------------------------------
         toRet = self._origs[axeKey] + (axeIdx * self._diffs[axeKey])
 
-        logger.debug(f"{self.name}._axeValByIdx: axeVal={toRet} for axeKey={axeKey} and axeIdx={axeIdx}")
+        if logOn.debug: logger.debug(f"{self.name}._axeValByIdx: axeVal={toRet} for axeKey={axeKey} and axeIdx={axeIdx}")
         return toRet
 
     #--------------------------------------------------------------------------
@@ -1139,7 +1405,7 @@ class InfoData:
             toRet = int(round(idx))
 
         #----------------------------------------------------------------------
-        logger.debug(f"{self.name}._idxByAxeVal: axeKey={axeKey}, axeVal={axeVal} -> idx={toRet}")
+        if logOn.debug: logger.debug(f"{self.name}._idxByAxeVal: axeKey={axeKey}, axeVal={axeVal} -> idx={toRet}")
         return toRet
 
     #--------------------------------------------------------------------------
@@ -1147,6 +1413,8 @@ class InfoData:
     #--------------------------------------------------------------------------
     def _posByIdxs(self, idxs:tuple) -> int|None:
         """Returns position of the InfoPoint in the list of points for respective indices.
+           Indices can be numpy arrays, then array of positions is returned.
+           Indices of the ring axes are shifted by their offsets.
            If idxs has more or less indices than number of axes, logs error and returns None. FIX IN THE FUTURE
         """
 
@@ -1156,7 +1424,15 @@ class InfoData:
         for i, idx in enumerate(idxs):
             pos += idx * subProd[i]
 
-        logger.debug(f"{self.name}._posByIdxs: {idxs} -> pos={pos}")
+        #----------------------------------------------------------------------
+        # Posun indexov ring osi
+        #----------------------------------------------------------------------
+        for i, axe in enumerate(self._cnts.keys()):
+
+            off = self._ringOffs.get(axe)
+            if off: pos += (((idxs[i] - off) % self._cnts[axe]) - idxs[i]) * subProd[i]
+
+        if logOn.debug: logger.debug(f"{self.name}._posByIdxs: {idxs} -> pos={pos}")
         return pos
 
     #--------------------------------------------------------------------------
@@ -1187,6 +1463,14 @@ class InfoData:
             #------------------------------------------------------------------
             toRet.insert(0, idx)
 
+        #----------------------------------------------------------------------
+        # Posun indexov ring osi
+        #----------------------------------------------------------------------
+        for i, axe in enumerate(self._cnts.keys()):
+
+            off = self._ringOffs.get(axe)
+            if off: toRet[i] = (toRet[i] + off) % self._cnts[axe]
+
         #----------------------------------------------------------------------
         return toRet
 
@@ -1239,7 +1523,7 @@ class InfoData:
            If coord is not compatible with the schema of this InfoData, logs error and returns None. FIX IN THE FUTURE
         """
 
-        logger.debug(f"{self.name}.pointByCoord: coord={coord} and actSubIdxs={self.actSubIdxs}")
+        if logOn.debug: logger.debug(f"{self.name}.pointByCoord: coord={coord} and actSubIdxs={self.actSubIdxs}")
 
         vals = []  # List of axe values for debugging
         idxs = []  # List of indices for respective axes
@@ -1249,8 +1533,6 @@ class InfoData:
         #----------------------------------------------------------------------
         for axe in self._cnts.keys():
 
-            print(f"{self.name}.pointByCoord: axe={axe}, coord={coord}")
-
             #------------------------------------------------------------------
             # Ziskanie value pre danu os
             #------------------------------------------------------------------
@@ -1259,7 +1541,7 @@ class InfoData:
                 # Ak je dodana value pre danu os, pouzijem ju
                 #--------------------------------------------------------------
                 axeVal = coord[axe]
-                logger.debug(f"{self.name}.pointByCoord: Axe '{axe}' found in coord, using value {axeVal}")
+                if logOn.debug: logger.debug(f"{self.name}.pointByCoord: Axe '{axe}' found in coord, using value {axeVal}")
 
             elif axe in self.actSubIdxs.keys() and self.actSubIdxs[axe]:
                 #--------------------------------------------------------------
@@ -1288,9 +1570,60 @@ class InfoData:
         pos = self._posByIdxs(idxs)
 
         #----------------------------------------------------------------------
-        logger.debug(f"{self.name}.pointByCoord: coord={coord} -> vals={vals} -> idxs={idxs} -> pos={pos}")
+        if logOn.debug: logger.debug(f"{self.name}.pointByCoord: coord={coord} -> vals={vals} -> idxs={idxs} -> pos={pos}")
         return self.pointByPos(pos)
 
+    #==========================================================================
+    # Bulk values access
+    #--------------------------------------------------------------------------
+    def _rowsOf(self, points):
+        "Returns rows of the points in the InfoColumns store, None means all rows"
+
+        if points is None or points is self.points: return None
+        if hasattr(points, 'rows')                : return points.rows
+
+        return [point._row for point in points]
+
+    #--------------------------------------------------------------------------
+    def posArray(self, axeKey:str, points=None) -> np.ndarray:
+        """Returns positions on respective axe as numpy array for list of points
+           or for all points if points is None.
+        """
+
+        if self.store == 'columns': return self.points.posArray(axeKey, self._rowsOf(points))
+
+        if points is None: points = self.points
+        return np.array([point.pos(axeKey) for point in points], dtype=np.float64)
+
+    #--------------------------------------------------------------------------
+    def valArray(self, valKey:str, points=None) -> np.ndarray:
+        """Returns values for respective key as numpy array for list of points
+           or for all points if points is None. Not set values read as 0.
+        """
+
+        if self.store == 'columns': return self.points.valArray(valKey, self._rowsOf(points))
+
+        if points is None: points = self.points
+        return InfoColumns.arrayOf([point.val(valKey) for point in points])
+
+    #--------------------------------------------------------------------------
+    def setValArray(self, valKey:str, vals, points=None) -> int:
+        """Sets values for respective key from numpy array or list for list of points
+           or for all points if points is None.
+           Returns count of updated InfoPoints.
+        """
+
+        if points is None: points = self.points
+
+        if self.store == 'columns':
+            self.points.setValArray(valKey, vals, self._rowsOf(points))
+
+        else:
+            if isinstance(vals, np.ndarray): vals = vals.tolist()
+            for point, val in zip(points, vals): point._vals[valKey] = val
+
+        return len(points)
+
     #==========================================================================
     # Active subdata tools
     #--------------------------------------------------------------------------
@@ -1302,7 +1635,7 @@ class InfoData:
         """
 
         oldActSubIdxs = self.actSubIdxs.copy()
-        logger.debug(f"{self.name}._actSubSet: {oldActSubIdxs}->{actSubIdxs}")
+        if logOn.debug: logger.debug(f"{self.name}._actSubSet: {oldActSubIdxs}->{actSubIdxs}")
 
         #----------------------------------------------------------------------
         # Kontrola zmeny definicie (self.actChanged moze mat hodnotu True z inych dovodov)
@@ -1314,7 +1647,7 @@ class InfoData:
         # Ak nie je subdata zmenena, vratim sa
         #----------------------------------------------------------------------
         if not self.actChanged:
-            logger.debug(f"{self.name}._actSubSet: actSubIdxs definition was not changed, no need to update")
+            if logOn.debug: logger.debug(f"{self.name}._actSubSet: actSubIdxs definition was not changed, no need to update")
             return
 
         #----------------------------------------------------------------------
@@ -1333,7 +1666,7 @@ class InfoData:
         self.actList = []
 
         #----------------------------------------------------------------------
-        logger.warning(f"{self.name}._actSubSet: definition was changed {oldActSubIdxs} -> {self.actSubIdxs}")
+        if logOn.debug: logger.debug(f"{self.name}._actSubSet: definition was changed {oldActSubIdxs} -> {self.actSubIdxs}")
 
     #--------------------------------------------------------------------------
     # Active subdata retrieval
@@ -1344,7 +1677,7 @@ class InfoData:
            If actSubIdxs is NOT provided, whole data became active subdata.
         """
 
-        logger.debug(f"{self.name}.actSubData: actSubIdxs={actSubIdxs}, force={force}")
+        if logOn.debug: logger.debug(f"{self.name}.actSubData: actSubIdxs={actSubIdxs}, force={force}")
 
         #----------------------------------------------------------------------
         # Nastavenie aktivnej subdata ak bola dodana definicia
@@ -1355,50 +1688,46 @@ class InfoData:
         #----------------------------------------------------------------------
         # Kontrola potreby obnovenia aktivnej subdata pri zmene definicie subdata
         #----------------------------------------------------------------------
-        if (not self.actChanged) and (not force):
-            logger.debug(f"{self.name}.actSubData: subData definition was not changed, no need to refresh")
+        ringKey = tuple(self._ringOffs.items())
+
+        if (not self.actChanged) and (not force) and (ringKey == self._actRing):
+            if logOn.debug: logger.debug(f"{self.name}.actSubData: subData definition was not changed, no need to refresh")
             return self.actList
 
         #----------------------------------------------------------------------
-        logger.debug(f"{self.name}.actSubData: Refresh for actSubIdxs={self.actSubIdxs}, force={force}")
+        if logOn.debug: logger.debug(f"{self.name}.actSubData: Refresh for actSubIdxs={self.actSubIdxs}, force={force}")
 
         #----------------------------------------------------------------------
-        # Inicializujem mnozinu pozicii subdata vsetkymi bodmi
+        # Ak je subdata pre tuto definiciu v cache, pouzijem ju
         #----------------------------------------------------------------------
-        poss = set(range(self.count())) # Set of positions of InfoPoints in the active subdata
+        actKey = tuple((axe, axeIdx) for axe, axeIdx in self.actSubIdxs.items() if axeIdx is not None)
+        self._actRing = ringKey
 
-        #----------------------------------------------------------------------
-        # Prejdem vsetky osi so zmrazenou hodnotou idx
-        #----------------------------------------------------------------------
-        for axe, axeIdx in self.actSubIdxs.items():
+        if (not force) and ((actKey, ringKey) in self._actCache):
 
-            #------------------------------------------------------------------
-            # Kontrola, ci je daná os freezed
-            #------------------------------------------------------------------
-            if axeIdx is None:
-                logger.debug(f"{self.name}.actSubData: Axe '{axe}' is not freezed, skipping")
-                continue
+            self.actList = self._actCache[(actKey, ringKey)]
+            if logOn.debug: logger.debug(f"{self.name}.actSubData: {len(self.actList)} positions for actSubIdxs={self.actSubIdxs} from cache")
+            return self.actList
 
-            #------------------------------------------------------------------
-            # Ziskam mnozinu pozicii bodov patriacich danej osi
-            #------------------------------------------------------------------
-            actPoss = self._possByAxeIdx(axeKey=axe, axeIdx=axeIdx)
+        #----------------------------------------------------------------------
+        # Pozicie subdata vypocitam ako mriezku z _subProducts
+        #----------------------------------------------------------------------
+        poss = self._latticePoss(dict(actKey))
 
-            #------------------------------------------------------------------
-            # Vytvorim prienik poss s touto mnozinou pozicii = odstranim body, ktore nepatria do danej osi
-            #------------------------------------------------------------------
-            poss = poss.intersection(actPoss)
-            logger.debug(f"{self.name}.actSubData: After axe '{axe}' with idx {axeIdx}, {len(poss)} positions remain in active subdata")
+        #----------------------------------------------------------------------
+        # Create vector of InfoPoints for respective positions in ascending order
+        #----------------------------------------------------------------------
+        if self.store == 'columns': self.actList = self.points.subset(poss)
+        else                      : self.actList = [self.points[pos] for pos in poss.tolist()]
 
         #----------------------------------------------------------------------
-        # Create vector of InfoPoints for respective positions
+        # Ulozim do cache, najstarsiu polozku pri preplneni vyhodim
         #----------------------------------------------------------------------
-        self.actList.clear()  # Clear active list of points
-        for pos in poss:
-            self.actList.append(self.pointByPos(pos))
+        if len(self._actCache) >= _ACT_CACHE: self._actCache.pop(next(iter(self._actCache)))
+        self._actCache[(actKey, ringKey)] = self.actList
 
         #----------------------------------------------------------------------
-        logger.debug(f"{self.name}.actSubData: Found {len(self.actList)} positions in active subdata for actSubIdxs={self.actSubIdxs}")
+        if logOn.debug: logger.debug(f"{self.name}.actSubData: Found {len(self.actList)} positions in active subdata for actSubIdxs={self.actSubIdxs}")
         return self.actList
 
     #==========================================================================
@@ -1459,11 +1788,89 @@ class InfoData:
         logger.info(f"{self.name}.copyFrom: Copied {pts} points")
         return self
 
+    #--------------------------------------------------------------------------
+    def setRingAxe(self, axeKey:str, ring:bool=True) -> bool:
+        """Sets or removes ring mode of the axe. Moving of the whole ring axe in moveByAxe() only
+           changes offset of the axe and clears newly exposed indices, no data are copied.
+           All translations between indices and positions honour the offset.
+           Removing of the ring mode reorders the data physically to offset 0.
+           Ring mode is supported only for the 'columns' store.
+           Returns True if mode was set, otherwise False.
+        """
+
+        logger.debug(f"{self.name}.setRingAxe: axe key={axeKey}, ring={ring}")
+
+        #----------------------------------------------------------------------
+        # Kontrola osi a store
+        #----------------------------------------------------------------------
+        if axeKey not in self._cnts.keys():
+            logger.error(f"{self.name}.setRingAxe: Axe '{axeKey}' is not in InfoData axes {list(self._cnts.keys())}, change denied")
+            return False
+
+        if self.store != 'columns':
+            logger.error(f"{self.name}.setRingAxe: Ring axes are supported only for 'columns' store, change denied")
+            return False
+
+        #----------------------------------------------------------------------
+        # Zapnutie ring modu
+        #----------------------------------------------------------------------
+        if ring:
+            if axeKey not in self._ringOffs: self._ringSet(axeKey, 0)
+
+        #----------------------------------------------------------------------
+        # Vypnutie ring modu, riadky preusporiadam tak, aby offset bol 0
+        #----------------------------------------------------------------------
+        elif axeKey in self._ringOffs:
+
+            i    = self.axeIdxByKey(axeKey)
+            cnt  = self._cnts[axeKey]
+            sub  = self._subProducts[i]
+            off  = self._ringOffs.pop(axeKey)
+
+            poss = np.arange(len(self.points), dtype=np.int64)
+            idxs = (poss // sub) % cnt
+
+            self.points.delRing(axeKey)
+            self.points.take(poss + (((idxs - off) % cnt) - idxs) * sub)
+
+        logger.info(f"{self.name}.setRingAxe: Ring axes are {self._ringOffs}")
+        return True
+
+    #--------------------------------------------------------------------------
+    def _ringSet(self, axeKey:str, off:int):
+        "Sets offset of the ring axe in this InfoData and in the store"
+
+        i = self.axeIdxByKey(axeKey)
+
+        self._ringOffs[axeKey] = off
+        self.points.setRing(axeKey, off, self._cnts[axeKey], self._subProducts[i], self._diffs[axeKey])
+
+    #--------------------------------------------------------------------------
+    def _ringMove(self, axeKey:str, deltaIdx:int, defVals:dict) -> int:
+        "Moves whole ring axe by deltaIdx by change of the offset and clears newly exposed indices"
+
+        cnt = self._cnts[axeKey]
+        self._ringSet(axeKey, (self._ringOffs[axeKey] + deltaIdx) % cnt)
+
+        #----------------------------------------------------------------------
+        # Nove indexy na zaciatku (deltaIdx > 0) alebo na konci (deltaIdx < 0) osi
+        #----------------------------------------------------------------------
+        if deltaIdx > 0: newIdxs = range(0, min(deltaIdx, cnt))
+        else           : newIdxs = range(max(cnt + deltaIdx, 0), cnt)
+
+        for axeIdx in newIdxs:
+            self.points.clearRows(self._possByAxeIdx(axeKey, axeIdx), vals=defVals)
+
+        pts = len(self.points)
+        logger.info(f"{self.name}.moveByAxe: Ring axe key={axeKey} moved by {deltaIdx} to offset {self._ringOffs[axeKey]}, {len(newIdxs)} indices cleared")
+        return pts
+
     #--------------------------------------------------------------------------
     def moveByAxe(self, axeKey, startIdx, deltaIdx, defVals={}) -> int:
         """Move whole data by deltaIdx from start index in respective axe.
            Positive deltaIdx moves data to higher indices, negative to lower indices.
            Data moved out of data bounds are lost, new data positions are cleared to default values.
+           If axe is the ring axe and startIdx is 0, only offset of the axe is changed, see setRingAxe().
            Returns count of moved points.
         """
         logger.debug(f"{self.name}.moveByAxe: From {startIdx} by {deltaIdx} for axe key={axeKey}")
@@ -1476,6 +1883,12 @@ class InfoData:
             logger.error(f"{self.name}.moveByAxe: Axe '{axeKey}' is not in InfoData axes {list(self._cnts.keys())}, change denied")
             return pts
 
+        #----------------------------------------------------------------------
+        # Pohyb celej ring osi je len zmena offsetu
+        #----------------------------------------------------------------------
+        if axeKey in self._ringOffs and startIdx == 0 and deltaIdx != 0:
+            return self._ringMove(axeKey, deltaIdx, defVals)
+
         #----------------------------------------------------------------------
         # Ziskam poziciu axeKey v liste indexov osi
         #----------------------------------------------------------------------
@@ -1510,7 +1923,7 @@ class InfoData:
             #------------------------------------------------------------------
             # Prejdem cielove bodoy a skopirujem data zo zdrojovych bodov alebo clear
             #------------------------------------------------------------------
-            for pos in poss:
+            for pos in poss.tolist():
 
                 point = self.pointByPos(pos)  # Ziskam bod na danej pozicii
                 idxs  = self._idxsByPos(pos)  # Ziskam indexy pre danu poziciu
@@ -1536,7 +1949,7 @@ class InfoData:
 
             #------------------------------------------------------------------
             pts += len(poss)
-            logger.debug(f"{self.name}.moveByAxe: {len(poss)}:{axeIdx}<-{srcIdx}")
+            if logOn.debug: logger.debug(f"{self.name}.moveByAxe: {len(poss)}:{axeIdx}<-{srcIdx}")
 
         #----------------------------------------------------------------------
         logger.info(f"{self.name}.moveByAxe: From {startIdx} by {deltaIdx} for axe key={axeKey} moved {pts} InfoPoints")
@@ -1545,6 +1958,7 @@ class InfoData:
     #==========================================================================
     # Data methods to apply in Dynamics methods
     #--------------------------------------------------------------------------
+    @dataMethod('<Data Methods>')
     def nullMethod(self, inKey:str, outKey:str, params:dict, outData:'InfoData|None'=None) -> int|None:
         """Default null method for InfoPoint for keyed value (do nothing)
         - inKey  : Key of the value to be read by the method
@@ -1558,6 +1972,7 @@ class InfoData:
         return 1
 
     #--------------------------------------------------------------------------
+    @dataMethod('Move data', params={'startIdx':0, 'deltaIdx':1})
     def moveData(self, inKey:str, outKey:str, params:dict, outData:'InfoData|None'=None) -> int|None:
         """Move data by deltaIdx from startIdx in axeKey
         - inKey  : Key of the value to be read by the method
@@ -1605,16 +2020,161 @@ class InfoData:
     #==========================================================================
     # Persistency methods
     #--------------------------------------------------------------------------
-    def toJson(self):
-        "Converts node into json structure"
+    def toJson(self) -> dict:
+        """Converts InfoData into json structure with schema, structure and state of the InfoData
+           without points, it is the header of the data saved by save().
+        """
 
         logger.debug(f'{self.name}.toJson:')
 
-        toRet = {}
+        toRet = {'format'    : _FILE_FMT
+                ,'ver'       : _VER
+                ,'module'    : type(self).__module__
+                ,'class'     : type(self).__name__
+                ,'name'      : self.name
+                ,'args'      : {arg : getattr(self, arg ) for arg  in self._persistArgs }
+                ,'attrs'     : {attr: getattr(self, attr) for attr in self._persistAttrs}
+                ,'ipType'    : self.ipType
+                ,'schema'    : self.getSchema()
+                ,'cnts'      : self._cnts
+                ,'origs'     : self._origs
+                ,'rects'     : self._rects
+                ,'ringOffs'  : self._ringOffs
+                ,'staticEdge': self.staticEdge
+                ,'actVal'    : self.actVal
+                ,'actSubIdxs': self.actSubIdxs
+                }
 
         logger.debug(f'{self.name}.toJson: Converted')
         return toRet
 
+    #--------------------------------------------------------------------------
+    def save(self, path:str) -> bool:
+        """Saves this InfoData into the directory path as header toJson() in header.json
+           and arrays of _persistArrays() as .npy files, one file per array.
+           Files are written as new files and renamed, so InfoData memory mapped from path may be saved back.
+           Saved data are loaded by InfoData.load().
+           Returns True if data were saved, otherwise False.
+        """
+
+        logger.info(f"{self.name}.save: Into '{path}'")
+
+        header = self.toJson()
+        arrays = self._persistArrays()
+        header['arrays'] = list(arrays.keys())
+
+        #----------------------------------------------------------------------
+        # Polia zapisem do novych suborov a premenujem, hlavicku zapisem ako poslednu
+        #----------------------------------------------------------------------
+        try:
+            os.makedirs(path, exist_ok=True)
+
+            for key, arr in arrays.items():
+
+                fName = os.path.join(path, f"{key}.npy")
+
+                with open(fName + '.tmp', 'wb') as f:
+                    np.save(f, arr, allow_pickle=False)
+
+                os.replace(fName + '.tmp', fName)
+
+            with open(os.path.join(path, _FILE_HEAD), 'w', encoding='utf8') as f:
+                json.dump(header, f, indent=2, default=_jsonDefault)
+
+        except (OSError, TypeError, ValueError) as err:
+            logger.error(f"{self.name}.save: Data can not be saved into '{path}': {err}")
+            return False
+
+        #----------------------------------------------------------------------
+        logger.info(f"{self.name}.save: {len(self.points)} points and {len(arrays)} arrays saved into '{path}'")
+        return True
+
+    #--------------------------------------------------------------------------
+    def _persistArrays(self) -> dict:
+        """Returns arrays of this InfoData to save as {key: np.ndarray}:
+           - 'pos' : positions [rows x axes] in the schema order, not saved for lazy grid of the columns store,
+                     positions of the ring axes are saved for offset 0
+           - 'v<i>': values of the i-th value key of the schema, keys never set and not numeric values are not saved
+        """
+
+        toRet = {}
+
+        #----------------------------------------------------------------------
+        # Pozicie bodov
+        #----------------------------------------------------------------------
+        if self.store == 'columns':
+            pos = self.points.positions()
+            if pos is not None: toRet['pos'] = pos
+
+        elif len(self.points) > 0:
+            toRet['pos'] = np.stack([self.posArray(axeKey) for axeKey in self.getSchemaAxes().keys()], axis=1)
+
+        #----------------------------------------------------------------------
+        # Stlpce hodnot
+        #----------------------------------------------------------------------
+        for i, valKey in enumerate(self.getSchemaVals().keys()):
+
+            if   self.store == 'columns'                                  : col = self.points.column(valKey)
+            elif any(point.val(valKey) is not None for point in self.points): col = self.valArray(valKey)
+            else                                                          : col = None
+
+            if col is None: continue
+
+            if col.dtype == object:
+                logger.warning(f"{self.name}._persistArrays: Values '{valKey}' are not numeric and will not be saved")
+                continue
+
+            toRet[f"v{i}"] = col
+
+        return toRet
+
+    #--------------------------------------------------------------------------
+    def _restore(self, header:dict, arrays:dict):
+        "Restores schema, structure, points and state of this InfoData from the loaded header and arrays"
+
+        logger.debug(f"{self.name}._restore: {header['class']} with arrays {list(arrays.keys())}")
+
+        #----------------------------------------------------------------------
+        # Schema a struktura
+        #----------------------------------------------------------------------
+        self.setIpType(header['ipType'], force=True)
+        self.setSchema(header['schema'])
+
+        for attr, val in header['attrs'].items(): setattr(self, attr, val)
+
+        if header['cnts']: self.init(cnts=header['cnts'], origs=header['origs'], rects=header['rects'])
+
+        #----------------------------------------------------------------------
+        # Pozicie bodov a kruhove osi
+        #----------------------------------------------------------------------
+        pos = arrays.get('pos')
+
+        if self.store == 'columns':
+            if pos is not None: self.points.setPositions(pos)
+            for axeKey, off in header['ringOffs'].items(): self._ringSet(axeKey, off)
+
+        elif pos is not None:
+            for point, coos in zip(self.points, pos.tolist()): point.set(pos=coos)
+
+        #----------------------------------------------------------------------
+        # Stlpce hodnot
+        #----------------------------------------------------------------------
+        for i, valKey in enumerate(header['schema']['vals'].keys()):
+
+            col = arrays.get(f"v{i}")
+            if col is None: continue
+
+            if self.store == 'columns': self.points.setColumn(valKey, col)
+            else                      : self.setValArray(valKey, col)
+
+        #----------------------------------------------------------------------
+        # Stav InfoData
+        #----------------------------------------------------------------------
+        self.staticEdge = header['staticEdge']
+        self.actVal     = header['actVal']
+
+        if header['cnts']: self.actSubData(actSubIdxs=header['actSubIdxs'], force=True)
+
 #==============================================================================
 # Inicializacia modulu
 #------------------------------------------------------------------------------
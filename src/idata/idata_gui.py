@@ -1,10 +1,11 @@
 #==============================================================================
 # Info tkChart library
 #------------------------------------------------------------------------------
+import os
 import numpy                             as np
 
 import tkinter                           as tk
-from   tkinter                           import ttk
+from   tkinter                           import ttk, filedialog
 from   tkinter.messagebox                import showinfo
 
 import matplotlib.pyplot                 as plt
@@ -14,6 +15,7 @@ from   siqolib.message                   import SiqoMessage, askInt, askReal, as
 
 from   .                                 import logger
 from   idata.idata                       import InfoData
+from   idata.icolumns                    import InfoColumns
 from   idata.ipoint_gui                  import InfoPointGui, InfoPointValsGui
 from   idata.idata_data_gui              import InfoDataDataGui
 from   idata.idata_display_gui           import InfoDataDisplayGui
@@ -21,7 +23,7 @@ from   idata.idata_display_gui           import InfoDataDisplayGui
 #==============================================================================
 # Module's constants
 #------------------------------------------------------------------------------
-_VER            = '2.2.0'
+_VER            = '2.3.0'
 _WIN            = '1300x740'
 _DPI            = 100
 
@@ -626,6 +628,11 @@ class InfoDataGui(ttk.Frame):
                              npC (color by valueToShow)
                              npU (re-axis for quiver), npV (im-axis for quiver)
         """
+        #----------------------------------------------------------------------
+        # Pre columns store citam stlpce priamo bez iterovania bodov
+        #----------------------------------------------------------------------
+        if self.data.store == 'columns': return self.prepareChartColumns()
+
         #----------------------------------------------------------------------
         # Prepare the data for the chart
         #----------------------------------------------------------------------
@@ -679,6 +686,40 @@ class InfoDataGui(ttk.Frame):
         logger.info(f'{self.name}.prepareChartData: {len(self.data.actList)} iPoints produced: axes [{npX.size}, {npY.size}] colors [{npC.size}], quivers([{npU.size}, {npV.size}])')
         return npX, npY, npC, npU, npV
 
+    #--------------------------------------------------------------------------
+    def prepareChartColumns(self):
+        """Prepare data for the chart directly from the numpy columns of InfoData with store='columns'.
+           Returns the same npArrays as prepareChartData.
+        """
+
+        showFtion = self.data.mapShowMethods()[self.display['showMethod']]
+        actList   = self.data.actList
+
+        #----------------------------------------------------------------------
+        # Hodnoty a koordinaty aktivnych bodov ako stlpce
+        #----------------------------------------------------------------------
+        vals  = self.data.valArray(self.display['valKey'], points=actList)
+        npC   = InfoColumns.showArray(showFtion, vals)
+
+        npX = self.data.posArray(self.display['keyX'], points=actList) if self.display['keyX'] else np.array([])
+        npY = self.data.posArray(self.display['keyY'], points=actList) if self.display['keyY'] else np.array([])
+
+        #----------------------------------------------------------------------
+        # Komplexne hodnoty zobrazim fazou a quiver zlozkami
+        #----------------------------------------------------------------------
+        if np.iscomplexobj(npC):
+            npU = npC.real
+            npV = npC.imag
+            npC = np.angle(vals) if np.iscomplexobj(vals) else np.zeros(len(vals))
+
+        else:
+            npU = np.array([])
+            npV = np.array([])
+
+        #----------------------------------------------------------------------
+        logger.info(f'{self.name}.prepareChartColumns: {len(actList)} iPoints produced: axes [{npX.size}, {npY.size}] colors [{npC.size}], quivers([{npU.size}, {npV.size}])')
+        return npX, npY, npC, npU, npV
+
     #==========================================================================
     # Menus events
     #--------------------------------------------------------------------------
@@ -753,13 +794,46 @@ class InfoDataGui(ttk.Frame):
     # File menu
     #--------------------------------------------------------------------------
     def onOpen(self, event=None):
+        "Load InfoData saved by InfoData.save() from selected directory and show it in new window"
 
-        return
+        logger.info(f'{self.name}.onOpen:')
+
+        path = filedialog.askdirectory(parent=self, title='Select InfoData directory', mustexist=True)
+
+        if not path:
+            logger.info(f'{self.name}.onOpen: Open cancelled')
+            return
+
+        #----------------------------------------------------------------------
+        # Nacitanie dat, data s rovnakym menom dostanu novy nazov
+        #----------------------------------------------------------------------
+        name = os.path.basename(os.path.normpath(path))
+        if name in self.data.getDatas(): name = f'{name} ({len(self.data.getDatas())})'
+
+        dataObj = InfoData.load(path, name=name)
+
+        if dataObj is None:
+            showinfo(title='Open', message=f'InfoData can not be loaded from {path}')
+            return
+
+        self.refreshDataMenu()
+        self.new(dataObj=dataObj)
 
     #--------------------------------------------------------------------------
     def onSave(self, event=None):
+        "Save this InfoData into selected directory by InfoData.save()"
 
-        return
+        logger.info(f'{self.name}.onSave:')
+
+        path = filedialog.asksaveasfilename(parent=self, title='Save InfoData as directory', initialfile=self.data.name,
+                                            defaultextension='.idd', filetypes=(('InfoData', '*.idd'), ('All files', '*.*')))
+
+        if not path:
+            logger.info(f'{self.name}.onSave: Save cancelled')
+            return
+
+        if not self.data.save(path):
+            showinfo(title='Save', message=f'InfoData can not be saved into {path}')
 
     #==========================================================================
     # Data menu
@@ -961,8 +1035,8 @@ class InfoDataGui(ttk.Frame):
         #----------------------------------------------------------------------
         # Ziskanie definicie metody
         #----------------------------------------------------------------------
-        metDef = self.data.mapSetMethods()[metKey]
-        params = metDef['params']
+        metDef = self.data.methodDef(metKey)
+        params = dict(metDef['params'])
 
         logger.info(f'{self.name}.onMethodPlay: Play {metKey}({inKey}) params={params} for {cycles} cycles')
 
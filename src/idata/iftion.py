@@ -4,12 +4,12 @@
 import cmath
 
 from   .                      import logger
-from   .idata                 import InfoData
+from   .idata                 import InfoData, dataMethod
 
 #==============================================================================
 # Module's constants
 #------------------------------------------------------------------------------
-_VER    = '1.1.0'
+_VER    = '1.2.1'
 
 _CNT   = (100,)                                            # Default number of points
 _AX1D  = {'x': 'Os X'}                                     # Default axes for ftion of one variable
@@ -30,6 +30,7 @@ class IFtion(InfoData):
     #==========================================================================
     # Static variables & methods
     #--------------------------------------------------------------------------
+    _persistArgs = ()   # Constructor has no store argument, see InfoData.load()
 
     #==========================================================================
     # Constructor & utilities
@@ -84,28 +85,10 @@ class IFtion(InfoData):
         #----------------------------------------------------------------------
         logger.info(f"{self.name}.constructor: done")
 
-    #--------------------------------------------------------------------------
-    # Dynamics methods for IFtion
-    #--------------------------------------------------------------------------
-    def mapSetMethods(self) -> dict:
-        "Returns map of methods setting keyed value to function value for respective parameters"
-
-        methods = super().mapSetMethods()
-
-        methods['ISeries deltas'      ] = {'dataMethod' : self.deltas
-                                          ,'pointMethod':None
-                                          ,'params'     :{}
-                                          ,'visible'    :True
-                                          ,'paramAsk'   :True
-                                          ,'outData'    :None
-                                          ,'outKey'     :'d'
-                                          }
-
-        return methods
-
     #==========================================================================
     # Curve methods to apply in Dynamics methods
     #--------------------------------------------------------------------------
+    @dataMethod('ISeries deltas', outKey='d')
     def deltas(self, inKey:str, outKey:str, params:dict, outData:'InfoData'):
         """Compute auto-correlation of states for each phase.
         - inKey  : Key of the value to be read by the method
@@ -1,15 +1,21 @@
 #==============================================================================
 # Siqo class IMarkov
 #------------------------------------------------------------------------------
+import bisect
 import math
+import os
+import time
+import itertools
+import heapq
+import numpy                  as np
 
-from   .                      import logger
-from   .idata                 import InfoData
+from   .                      import logger, logOn
+from   .idata                 import InfoData, dataMethod
 
 #==============================================================================
 # Module's constants
 #------------------------------------------------------------------------------
-_VER    = '1.1.1'
+_VER    = '1.10.2'
 _IND    = '|  '                    # Info indentation
 
 _VALS  = {'obs' : 'Observations'       # Number of observations of the value X
@@ -18,9 +24,20 @@ _VALS  = {'obs' : 'Observations'       # Number of observations of the value X
          ,'mrk' : 'Markov analyser'    # Markov object for next dimension
          }
 
+_BACKENDS = ('points', 'table')        # Storage of n-gram counts: nested IMarkov objects or flat count tables
+
 #==============================================================================
 # Module's variables
 #------------------------------------------------------------------------------
+_RNG   = np.random.default_rng()   # Random generator for generate()
+
+#==============================================================================
+# Module's functions
+#------------------------------------------------------------------------------
+def _xlogx(c) -> float:
+    "Returns c * ln(c) with 0 * ln(0) = 0"
+
+    return c * math.log(c) if c > 0 else 0.0
 
 #==============================================================================
 # IMarkov
@@ -33,18 +50,30 @@ class IMarkov(InfoData):
     _INFO_STRUCT    = True
     _INFO_HISTOGRAM = True
 
+    _persistArgs    = ('dim', 'backend', 'store')   # Constructor arguments of the saved Markov analyser
+
     #==========================================================================
     # Constructor & utilities
     #--------------------------------------------------------------------------
-    def __init__(self, name, dim:int=1, axeName:str='Value'):
-        "Calls constructor of IMarkov process analyser/generator"
+    def __init__(self, name, dim:int=1, axeName:str='Value', backend:str='points', store:str='points'):
+        """Calls constructor of IMarkov process analyser/generator
+           backend : 'points' stores n-gram counts in InfoPoints with nested IMarkov objects for next dimensions,
+                     'table'  stores n-gram counts in flat dicts keyed by context tuples, InfoPoints are created
+                              only on demand in actPoints() and info()
+           store   : storage engine of the points of InfoData, 'compact' lowers memory of the histograms,
+                     nested IMarkov objects use the same store
+        """
+
+        logger.debug(f"{name}.constructor: Creating IMarkov object with dim={dim}, axeName='{axeName}' and backend='{backend}'")
 
-        logger.debug(f"{name}.constructor: Creating IMarkov object with dim={dim} and axeName='{axeName}'")
+        if backend not in _BACKENDS:
+            logger.error(f"{name}.constructor: Unknown backend '{backend}', expected one of {_BACKENDS}")
+            raise ValueError(f"Unknown backend '{backend}' for IMarkov")
 
         #----------------------------------------------------------------------
         # Super constructor
         #----------------------------------------------------------------------
-        super().__init__(name)
+        super().__init__(name, store=store)
 
         #----------------------------------------------------------------------
         # Private datove polozky triedy
@@ -52,6 +81,27 @@ class IMarkov(InfoData):
         self.dim      = dim   # Dimension, e.g. number of previous states to consider in the Markov process
         self.totObs   = 0     # Total number of observations in this Markov object
         self.eqProb   = 1     # Equal probability for all points, eqProb = 1 / len(self.points) if len(self.points) > 0 else 0
+        self.backend  = backend
+
+        #----------------------------------------------------------------------
+        # Count tables for backend 'table', context is tuple of values (X_1, ..., X_i)
+        #----------------------------------------------------------------------
+        self._obs     = {}    # Number of observations of the context as {(X_1, ..., X_i): obs}
+        self._tot     = {}    # Total observations of the children of the context as {(X_1, ..., X_i-1): totObs}
+        self._nKids   = {}    # Number of distinct children of the context as {(X_1, ..., X_i-1): count}
+
+        #----------------------------------------------------------------------
+        # Entropy sums per depth d of the context, maintained incrementally from count deltas
+        #----------------------------------------------------------------------
+        self._entN    = {}    # Number of observations of contexts in depth d as {d: N_d}
+        self._entS    = {}    # Sum of c*ln(c) over counts c of contexts in depth d as {d: S_d}
+        self._entT    = {}    # Sum of t*ln(t) over totals t of parent contexts in depth d-1 as {d: T_d}
+
+        #----------------------------------------------------------------------
+        # Cache of conditional distributions for generate()
+        #----------------------------------------------------------------------
+        self._genCache = {}   # Cumulative counts of the next values as {ctx: (vals, cums)}, invalidated on count change
+        self._genKids  = None # Next values of the contexts of backend 'table' as {ctx: [vals]}, built by _tableKids()
 
         #----------------------------------------------------------------------
         # Dynamic variables of the Markov process, used to store the last dim observed values
@@ -102,6 +152,7 @@ class IMarkov(InfoData):
         if struct:
             dat['ver'           ] = _VER
             dat['dim'           ] = self.dim
+            dat['backend'       ] = self.backend
             dat['axeName'       ] = self.axeNameByKey('x')
             dat['ipType'        ] = self.ipType
             dat['totObs'        ] = self.totObs
@@ -133,7 +184,20 @@ class IMarkov(InfoData):
         #----------------------------------------------------------------------
         # Ak dat, pridam info o vsetkych InfoPoints a ich Markov objektoch
         #----------------------------------------------------------------------
-        if histogram:
+        if histogram and self.backend == 'table':
+
+            msg.append(f"{indent*_IND}{60*'-'}\n")
+
+            for ctx, obs, pro, pgn in self._tableItems():
+
+                point  = self._tablePoint(ctx, obs, pro, pgn)
+                posStr = point._posStr()
+                valStr = point._valsStr()
+
+                dat[f'point{list(ctx)}'] = valStr
+                msg.append(f"{(indent+len(ctx)-1)*_IND}point {posStr}: {valStr}\n")
+
+        elif histogram:
 
             msg.append(f"{indent*_IND}{60*'-'}\n")
 
@@ -179,6 +243,17 @@ class IMarkov(InfoData):
         self.actPoint = None
         self.actVals  = []
 
+        self._obs     = {}
+        self._tot     = {}
+        self._nKids   = {}
+
+        self._entN    = {}
+        self._entS    = {}
+        self._entT    = {}
+
+        self._genCache = {}
+        self._genKids  = None
+
         #----------------------------------------------------------------------
         logger.info(f"{self.name}.reset: Markov analyser reset complete")
 
@@ -213,6 +288,17 @@ class IMarkov(InfoData):
         logger.debug(f"{self.name}.actPoints:")
         toRet = []
 
+        #---------------------------------------------------------------------
+        # Backend 'table' creates active Points from actual values on demand
+        #---------------------------------------------------------------------
+        if self.backend == 'table':
+
+            ctxs  = [tuple(self.actVals[:i]) for i in range(1, len(self.actVals)+1)]
+            toRet = [self._tablePoint(ctx, self._obs[ctx], *self._tableProb(ctx)) for ctx in ctxs if ctx in self._obs]
+
+            logger.info(f"{self.name}.actPoints: Found {len(toRet)} active Points")
+            return toRet
+
         #---------------------------------------------------------------------
         # If there is no active point, return an empty list
         #---------------------------------------------------------------------
@@ -274,7 +360,10 @@ class IMarkov(InfoData):
         4. Returns probability and gain for the active Point in the last dimension.
         """
 
-        logger.debug(f"{self.name}.observe: val={val}")
+        if logOn.debug: logger.debug(f"{self.name}.observe: val={val}")
+
+        if self.backend == 'table':
+            return self._tableObserve(val)
 
         #----------------------------------------------------------------------
         # Move one step forward and acquire list of active Points
@@ -288,11 +377,14 @@ class IMarkov(InfoData):
         cumPro    = 1.0           # Joint probability: P(X_1, X_2, ..., X_n)
         cumEqPro  = self.eqProb   # Joint equal probability: P_eq(X_1, X_2, ..., X_n)
 
-        for actPt in actPts:
+        for depth, actPt in enumerate(actPts, start=1):
 
             #------------------------------------------------------------------
             # Increment the total and point observation count
             #------------------------------------------------------------------
+            self._entAdd(depth, actPt._vals['obs'], parentMrk.totObs, 1)
+            if self._genCache: self._genCache.pop(tuple(self.actVals[:depth-1]), None)
+
             parentMrk.totObs   += 1
             actPt._vals['obs'] += 1
 
@@ -316,24 +408,249 @@ class IMarkov(InfoData):
         gain = actPts[-1]._vals['pgn'] if len(actPts) > 0 else 1
 
         #----------------------------------------------------------------------
-        logger.info(f"{self.name}.observe: '{val}' added, prob={prob:.5f}, gain={gain:.5f}, total obs = {self.totObs}")
+        if logOn.info: logger.info(f"{self.name}.observe: '{val}' added, prob={prob:.5f}, gain={gain:.5f}, total obs = {self.totObs}")
         return prob, gain
 
     #--------------------------------------------------------------------------
-    def generate(self, observe=False)->int|None:
-        """Generate new observation from the Markov analyser.
+    def observeMany(self, vals, actualise:bool=True):
+        """Add whole sequence of observations to the Markov analyser in one pass.
+
+        1. Sequence vals can be any iterable of values, numpy array or bytes object
+        2. Sequence is prefixed by actual values actVals, so context of previous observations is kept
+        3. All n-grams of length 1..dim of sliding windows are counted by np.unique and added into counts
+        4. Short windows at the very start of the stream (less than dim values observed) are counted one by one
+        5. If actualise, probabilities and gains are recalculated once by _probActualise()
+        6. Returns probability and gain for the active Point in the last dimension, the same as observe(),
+           if not actualise returns number of observed values
+
+        Counts are identical to calling observe() for every value of the sequence.
         """
 
-        logger.info(f"{self.name}.generate: observe={observe}")
-        toRet = None
+        #----------------------------------------------------------------------
+        # Konverzia vstupu na numpy pole
+        #----------------------------------------------------------------------
+        if isinstance(vals, (bytes, bytearray)): vals = np.frombuffer(vals, dtype=np.uint8)
+        else                                   : vals = np.asarray(vals if hasattr(vals, '__len__') else list(vals))
+
+        cnt = len(vals)
+        logger.debug(f"{self.name}.observeMany: {cnt} values")
+
+        if cnt == 0:
+            logger.warning(f"{self.name}.observeMany: No values to observe")
+            return None
 
         #----------------------------------------------------------------------
-        # Find InfoPoint with pos == val
+        # Cely tok = historia actVals + nove hodnoty, pozorovanie j ma okno full[max(0, j-dim+1) : j+1]
         #----------------------------------------------------------------------
+        hist = len(self.actVals)
+        full = self._joinHistory(vals) if hist > 0 else vals
+
+        counts = {}
+
+        #----------------------------------------------------------------------
+        # Kratke okna na zaciatku toku zacinaju na indexe 0
+        #----------------------------------------------------------------------
+        for j in range(hist, min(self.dim-1, hist+cnt)):
+
+            window = tuple(full[:j+1].tolist())
+            for i in range(1, j+2): counts[window[:i]] = counts.get(window[:i], 0) + 1
+
+        #----------------------------------------------------------------------
+        # Plne okna dlzky dim, ich zaciatky su sLo..sHi
+        #----------------------------------------------------------------------
+        sLo = max(0, hist-self.dim+1)
+        sHi = hist + cnt - self.dim
+
+        if sHi >= sLo:
+            windows = np.lib.stride_tricks.sliding_window_view(full, self.dim)[sLo:sHi+1]
+            counts  = self._countPrefixes(windows, counts)
+
+        #----------------------------------------------------------------------
+        # Pripocitam pocty do backendu
+        #----------------------------------------------------------------------
+        for ctx in sorted(counts):
+
+            if self.backend == 'table': self._tableAdd(ctx, counts[ctx])
+            else                      : self._pointsAdd(ctx, counts[ctx])
+
+        #----------------------------------------------------------------------
+        # Nastavim aktualne hodnoty a aktivne body podla posledneho okna
+        #----------------------------------------------------------------------
+        self.actVals = full[-self.dim:].tolist() if hist+cnt >= self.dim else full.tolist()
+
+        if self.backend == 'table':
+            self.totObs = self._tot[()]
+            self.eqProb = 1 / self._nKids[()]
+
+        if not actualise:
+            logger.debug(f"{self.name}.observeMany: {cnt} values added, total obs = {self.totObs}")
+            return cnt
+
+        prob, gain = self._actActualise()
+
+        #----------------------------------------------------------------------
+        logger.info(f"{self.name}.observeMany: {cnt} values added, prob={prob:.5f}, gain={gain:.5f}, total obs = {self.totObs}")
+        return prob, gain
+
+    #--------------------------------------------------------------------------
+    def observeStream(self, source, chunkSize:int=1<<20, callback=None):
+        """Add observations from the stream of symbols in chunks with bounded memory.
+
+        1. source can be path to the file, binary file object or any iterator of bytes chunks or of values
+        2. Stream is read in chunks of chunkSize values, every chunk is added by observeMany()
+        3. Last dim-1 values are carried across chunk boundaries in actVals, so context is not lost
+        4. After each chunk callback(progress) is called with progress as dict
+           {'chunks', 'symbols', 'totObs', 'elapsed', 'rate'}, rate is in symbols/second
+        5. Probabilities and gains are recalculated once at the end of the stream
+        6. Returns probability and gain for the active Point in the last dimension, the same as observe()
+
+        Counts are identical to observeMany() of the whole stream loaded into memory.
+        """
+
+        logger.info(f"{self.name}.observeStream: source={source}, chunkSize={chunkSize}")
+
+        if chunkSize < 1:
+            logger.error(f"{self.name}.observeStream: Invalid chunkSize {chunkSize}, must be >= 1")
+            return None
+
+        #----------------------------------------------------------------------
+        # Zdroj je cesta k suboru, subor sa otvori a po spracovani zavrie
+        #----------------------------------------------------------------------
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as file:
+                return self.observeStream(file, chunkSize=chunkSize, callback=callback)
+
+        #----------------------------------------------------------------------
+        # Spracovanie po chunkoch
+        #----------------------------------------------------------------------
+        progress = {'chunks': 0, 'symbols': 0, 'totObs': self.totObs, 'elapsed': 0.0, 'rate': 0.0}
+        start    = time.perf_counter()
+
+        for chunk in self._streamChunks(source, chunkSize):
+
+            if len(chunk) == 0: continue
+
+            progress['symbols'] += self.observeMany(chunk, actualise=False)
+            progress['chunks' ] += 1
+            progress['totObs' ]  = self.totObs
+            progress['elapsed']  = time.perf_counter() - start
+            progress['rate'   ]  = progress['symbols'] / progress['elapsed'] if progress['elapsed'] > 0 else 0.0
+
+            logger.debug(f"{self.name}.observeStream: {progress}")
+            if callback is not None: callback(progress)
+
+        #----------------------------------------------------------------------
+        if progress['symbols'] == 0:
+            logger.warning(f"{self.name}.observeStream: No values to observe")
+            return None
+
+        prob, gain = self._actActualise()
+
+        logger.info(f"{self.name}.observeStream: {progress['symbols']} values in {progress['chunks']} chunks added, {progress['rate']:.0f} symbols/s, total obs = {self.totObs}")
+        return prob, gain
+
+    #--------------------------------------------------------------------------
+    def generate(self, observe=False)->int|None:
+        """Generate new observation from the Markov analyser.
+
+        1. Context of the new value are the last dim-1 values of actVals
+        2. New value is drawn from the conditional distribution of the next values in the deepest level
+           matching the context, if the context was not observed, shorter context is used
+        3. Cumulative counts of the contexts are cached and invalidated only when counts of the context change
+        4. If observe, new value is added by observe()
+        5. Returns new value or None if nothing was observed yet
+        """
+
+        if logOn.debug: logger.debug(f"{self.name}.generate: observe={observe}")
+
+        toRet = self._genNext(self.actVals, _RNG.random())
+
+        if toRet is None:
+            logger.warning(f"{self.name}.generate: No observations to generate from")
+            return None
+
+        if observe: self.observe(toRet)
 
         #----------------------------------------------------------------------
+        if logOn.debug: logger.debug(f"{self.name}.generate: '{toRet}'")
         return toRet
 
+    #--------------------------------------------------------------------------
+    def generateMany(self, n:int, observe=False) -> np.ndarray|None:
+        """Generate sequence of n new values as numpy array.
+           Context continues from actVals and moves with generated values. If observe, every generated
+           value is added by observe(), otherwise the Markov analyser is not changed.
+           Returns None if nothing was observed yet.
+        """
+
+        logger.info(f"{self.name}.generateMany: n={n}, observe={observe}")
+
+        toRet   = []
+        actVals = list(self.actVals)
+        rnds    = _RNG.random(n).tolist()
+
+        for rnd in rnds:
+
+            val = self._genNext(actVals, rnd)
+
+            if val is None:
+                logger.warning(f"{self.name}.generateMany: No observations to generate from")
+                return None
+
+            toRet.append(val)
+
+            if observe:
+                self.observe(val)
+                actVals = self.actVals
+
+            else:
+                actVals = actVals[-(self.dim-1):] + [val] if self.dim > 1 else [val]
+
+        #----------------------------------------------------------------------
+        logger.info(f"{self.name}.generateMany: {len(toRet)} values generated")
+        return np.asarray(toRet)
+
+    #--------------------------------------------------------------------------
+    @property
+    def bits(self) -> float:
+        "Shannon entropy of the observed values in bits, S = -SUM(p_i * log2(p_i)) over points of the first dimension"
+
+        return self.entropy(depth=1)
+
+    #--------------------------------------------------------------------------
+    def entropy(self, depth:int=1) -> float:
+        """Returns joint Shannon entropy H(X_1, ..., X_depth) of the contexts of length depth in bits.
+           It is computed from incrementally maintained sums as H = log N - (1/N) * SUM(c * log c)
+           without walking through the points.
+        """
+
+        n = self._entN.get(depth, 0)
+        if n == 0: return 0.0
+
+        return (math.log(n) - self._entS[depth] / n) / math.log(2)
+
+    #--------------------------------------------------------------------------
+    def condEntropy(self, depth:int) -> float:
+        """Returns conditional Shannon entropy H(X_depth | X_1, ..., X_depth-1) in bits.
+           It is computed as (1/N) * (SUM(t * log t) - SUM(c * log c)), where t are totals of parent contexts
+           and c are counts of the contexts of length depth.
+           For depth = 1 it is equal to entropy(1).
+        """
+
+        n = self._entN.get(depth, 0)
+        if n == 0: return 0.0
+
+        return (self._entT[depth] - self._entS[depth]) / n / math.log(2)
+
+    #--------------------------------------------------------------------------
+    def entropyGain(self, depth:int) -> float:
+        """Returns information gain of the context of length depth-1 in bits, e.g. decrease of conditional
+           entropy H(X_depth-1 | ...) - H(X_depth | ...) when one more previous value is considered.
+        """
+
+        if depth < 2: return 0.0
+        return self.condEntropy(depth-1) - self.condEntropy(depth)
+
     #--------------------------------------------------------------------------
     def maxGain(self, minGain=1.0, minObs=10, maxPatterns=0) -> dict:
         """Returns dict of patterns with maximum gain in the Markov analyser.
@@ -345,25 +662,30 @@ class IMarkov(InfoData):
         Returns toRet[pattern] = {'gain': gain, 'obs': obs, 'pro': pro}
         Returned dict is sorted by gain in descending order.
         If maxPatterns > 0, returns only the first maxPatterns entries.
+
+        Subtrees of patterns with obs < minObs are pruned, because extended patterns can never have
+        more observations than their prefix. If maxPatterns > 0, only maxPatterns candidates are kept
+        in the heap during the search.
         """
 
         logger.info(f"{self.name}.maxGain: minGain={minGain}, minObs={minObs}, maxPatterns={maxPatterns}")
 
         #----------------------------------------------------------------------
-        # Collect all patterns recursively
+        # Generator of patterns from count tables or from nested IMarkov objects with pruning by minObs
         #----------------------------------------------------------------------
-        toRet = self._maxGainRecursive(minGain=minGain, minObs=minObs, pattern=())
+        if self.backend == 'table': items = self._tableItems(minObs=minObs)
+        else                      : items = self._pointItems(minObs=minObs, pattern=())
 
-        #----------------------------------------------------------------------
-        # Sort by gain in descending order
-        #----------------------------------------------------------------------
-        sorted_toRet = dict(sorted(toRet.items(), key=lambda x: x[1]['gain'], reverse=True))
+        items = (item for item in items if item[3] >= minGain)
 
         #----------------------------------------------------------------------
-        # Limit to maxPatterns if specified
+        # Top maxPatterns by gain from the heap or all patterns sorted by gain in descending order,
+        # both keep order of the crawl for equal gains
         #----------------------------------------------------------------------
-        if maxPatterns > 0:
-            sorted_toRet = dict(list(sorted_toRet.items())[:maxPatterns])
+        if maxPatterns > 0: items = heapq.nlargest(maxPatterns, items, key=lambda x: x[3])
+        else              : items = sorted(items, key=lambda x: x[3], reverse=True)
+
+        sorted_toRet = {ctx: {'gain': pgn, 'obs': obs, 'pro': pro} for ctx, obs, pro, pgn in items}
 
         #----------------------------------------------------------------------
         logger.info(f"{self.name}.maxGain: Found {len(sorted_toRet)} patterns with gain >= {minGain}")
@@ -382,16 +704,15 @@ class IMarkov(InfoData):
         3. Return list of activated InfoPoints in the Markov process.
         """
 
-        logger.debug(f"{self.name}._moveFwd: val={val}")
+        if logOn.debug: logger.debug(f"{self.name}._moveFwd: val={val}")
 
         #----------------------------------------------------------------------
-        # Move one step forward = last (dim-1) values from actVals plus new value val
-        # Note: For dim=1, we keep only the current value (sliding window size = 1)
-        # For dim=2, we keep the last 1 value plus new value (sliding window size = 2)
-        # etc.
+        # Move one step forward
         #----------------------------------------------------------------------
-        if self.dim > 1: self.actVals = self.actVals[-(self.dim-1):] + [val]
-        else           : self.actVals = [val]
+        self._shiftVals(val)
+
+        if self.backend == 'table':
+            return self.actPoints()
 
         #----------------------------------------------------------------------
         # Activate internal state of the Markov analyser according to the shifted values in actVals
@@ -402,49 +723,341 @@ class IMarkov(InfoData):
     #--------------------------------------------------------------------------
     # Internal methods for IMarkov
     #--------------------------------------------------------------------------
-    def _maxGainRecursive(self, minGain=1.0, minObs=10, pattern=()):
-        """Helper method to recursively crawl through all Markov patterns.
+    def _shiftVals(self, val:int):
+        """Move window of the actual values forward = last (dim-1) values from actVals plus new value val
+           Note: For dim=1, we keep only the current value (sliding window size = 1)
+           For dim=2, we keep the last 1 value plus new value (sliding window size = 2)
+           etc.
+        """
 
-        Args:
-            minGain (float): Minimum gain threshold
-            minObs  (int)  : Minimum observations threshold
-            pattern (tuple): Current pattern being built
+        if self.dim > 1: self.actVals = self.actVals[-(self.dim-1):] + [val]
+        else           : self.actVals = [val]
 
-        Returns:
-            dict: Patterns found at this level and nested levels
+    #--------------------------------------------------------------------------
+    def _tableObserve(self, val:int):
+        """Add new observation into count tables of backend 'table'.
+           Counts, probability and gain are the same as in observe() with backend 'points'.
         """
 
-        logger.debug(f"{self.name}._maxGainRecursive: minGain={minGain}, minObs={minObs}, pattern={pattern}")
-        toRet = {}
+        self._shiftVals(val)
+
+        ctx      = tuple(self.actVals)
+        cumPro   = 1.0
+        cumEqPro = 1.0
 
         #----------------------------------------------------------------------
-        # Process all points in this level
+        # Increment counts of all prefixes of the actual context (X_1, ..., X_i)
         #----------------------------------------------------------------------
-        for point in self.points:
+        for i in range(1, len(ctx)+1):
 
-            val = point.pos('x')
-            new_pattern = pattern + (val,)
+            parent = ctx[:i-1]
+            key    = ctx[:i]
+            obs    = self._obs.get(key, 0) + 1
 
-            gain = point._vals['pgn']
-            obs = point._vals['obs']
-            pro = point._vals['pro']
+            if obs == 1: self._tableNewKid(parent, key)
+            self._entAdd(i, obs-1, self._tot.get(parent, 0), 1)
+            if self._genCache: self._genCache.pop(parent, None)
+
+            self._obs[key]    = obs
+            self._tot[parent] = self._tot.get(parent, 0) + 1
+
+            cumEqPro = cumEqPro / self._nKids[parent]
+            cumPro   = cumPro * obs / self._tot[parent]
+
+        self.totObs = self._tot[()]
+        self.eqProb = 1 / self._nKids[()]
+
+        #----------------------------------------------------------------------
+        prob = cumPro
+        gain = cumPro / cumEqPro
+
+        if logOn.info: logger.info(f"{self.name}.observe: '{val}' added, prob={prob:.5f}, gain={gain:.5f}, total obs = {self.totObs}")
+        return prob, gain
+
+    #--------------------------------------------------------------------------
+    def _entAdd(self, depth:int, obs:int, tot:int, cnt:int):
+        """Updates entropy sums of the depth when cnt observations are added to the context with
+           count obs and to its parent context with total tot, only changed terms are updated.
+        """
+
+        self._entN[depth] = self._entN.get(depth, 0  ) + cnt
+        self._entS[depth] = self._entS.get(depth, 0.0) + _xlogx(obs+cnt) - _xlogx(obs)
+        self._entT[depth] = self._entT.get(depth, 0.0) + _xlogx(tot+cnt) - _xlogx(tot)
+
+    #--------------------------------------------------------------------------
+    def _actActualise(self) -> tuple:
+        """Recalculates probabilities and gains of all points, activates points according to actVals
+           and returns probability and gain for the active Point in the last dimension.
+        """
+
+        if self.backend == 'table':
+            return self._tableProb(tuple(self.actVals))
+
+        self._probActualise()
+
+        actPts = self._activate(actVals=self.actVals.copy())
+        prob   = actPts[-1]._vals['pro'] if len(actPts) > 0 else 0.0
+        gain   = actPts[-1]._vals['pgn'] if len(actPts) > 0 else 1
+
+        return prob, gain
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _streamChunks(source, chunkSize:int):
+        """Yields chunks of the stream source with at most chunkSize values.
+           Binary file objects are read by read(chunkSize), bytes chunks and numpy arrays of the iterator
+           are split by chunkSize, single values of the iterator are collected into lists of chunkSize values.
+        """
+
+        #----------------------------------------------------------------------
+        # Binarny subor
+        #----------------------------------------------------------------------
+        if hasattr(source, 'read'):
+            while chunk := source.read(chunkSize):
+                yield chunk
+            return
+
+        #----------------------------------------------------------------------
+        # Iterator chunkov alebo jednotlivych hodnot
+        #----------------------------------------------------------------------
+        if isinstance(source, (bytes, bytearray, np.ndarray)): source = [source]
+        source = iter(source)
+
+        for item in source:
 
+            if isinstance(item, (bytes, bytearray, np.ndarray)):
+                for i in range(0, len(item), chunkSize): yield item[i:i+chunkSize]
+
+            else:
+                yield [item] + list(itertools.islice(source, chunkSize-1))
+
+    #--------------------------------------------------------------------------
+    def _joinHistory(self, vals:np.ndarray) -> np.ndarray:
+        """Returns actual values actVals followed by vals in dtype able to store both without loss,
+           values of different kinds which numpy can not promote are joined as objects.
+        """
+
+        hist = np.asarray(self.actVals)
+
+        try               : dtype = np.result_type(hist, vals)
+        except TypeError  : dtype = object
+
+        return np.concatenate([hist.astype(dtype), vals.astype(dtype)])
+
+    #--------------------------------------------------------------------------
+    def _countPrefixes(self, windows:np.ndarray, counts:dict) -> dict:
+        """Adds counts of all prefixes of length 1..dim of the rows of windows into dict counts {ctx: count}.
+           Rows are encoded as integers in base of the alphabet size if it fits into int64, otherwise
+           np.unique over rows is used.
+        """
+
+        alphabet, codes = np.unique(windows, return_inverse=True)
+        codes = codes.reshape(windows.shape).astype(np.int64)
+        base  = len(alphabet)
+
+        for i in range(1, self.dim+1):
+
+            #------------------------------------------------------------------
+            # Unikatne prefixy dlzky i s poctami
             #------------------------------------------------------------------
-            # Add this pattern if it meets minGain threshold
-            if gain >= minGain and obs >= minObs:
-                toRet[new_pattern] = {'gain': gain, 'obs': obs, 'pro': pro}
+            if base ** i < 2**62:
+                keys = np.zeros(len(codes), dtype=np.int64)
+                for k in range(i): keys = keys * base + codes[:, k]
+
+                keys, cnts = np.unique(keys, return_counts=True)
+                rows = np.stack([(keys // base**(i-1-k)) % base for k in range(i)], axis=1)
+
+            else:
+                rows, cnts = np.unique(codes[:, :i], axis=0, return_counts=True)
 
             #------------------------------------------------------------------
-            # Recursively process nested Markov if it exists
+            # Dekodovanie na hodnoty a pripocitanie
             #------------------------------------------------------------------
-            mrk = point._vals['mrk']
+            for row, c in zip(alphabet[rows].tolist(), cnts.tolist()):
+                ctx = tuple(row)
+                counts[ctx] = counts.get(ctx, 0) + c
 
-            if mrk is not None and isinstance(mrk, IMarkov):
-                nested = mrk._maxGainRecursive(minGain=minGain, minObs=minObs, pattern=new_pattern)
-                toRet.update(nested)
+        return counts
+
+    #--------------------------------------------------------------------------
+    def _tableAdd(self, ctx:tuple, cnt:int):
+        "Adds cnt observations of the context ctx into count tables of backend 'table'"
+
+        parent = ctx[:-1]
+        if ctx not in self._obs: self._tableNewKid(parent, ctx)
+
+        self._entAdd(len(ctx), self._obs.get(ctx, 0), self._tot.get(parent, 0), cnt)
+        if self._genCache: self._genCache.pop(parent, None)
+        self._obs[ctx]    = self._obs.get(ctx, 0) + cnt
+        self._tot[parent] = self._tot.get(parent, 0) + cnt
+
+    #--------------------------------------------------------------------------
+    def _pointsAdd(self, ctx:tuple, cnt:int):
+        """Adds cnt observations of the context ctx into nested IMarkov objects of backend 'points'.
+           Markov analysers for the next dimension are created the same way as in _activate().
+        """
+
+        mrk = self
+
+        for i, val in enumerate(ctx):
+
+            point = mrk._getPoint(val=val, create=True)
+
+            if i == len(ctx)-1:
+                self._entAdd(len(ctx), point._vals['obs'], mrk.totObs, cnt)
+                if self._genCache: self._genCache.pop(ctx[:-1], None)
+                point._vals['obs'] += cnt
+                mrk.totObs         += cnt
+
+            if mrk.dim > 1: mrk = mrk._nextMark(point=point, val=val)
+
+    #--------------------------------------------------------------------------
+    def _tableNewKid(self, parent:tuple, ctx:tuple):
+        "Registers new context ctx as the child of the context parent in backend 'table'"
+
+        self._nKids[parent] = self._nKids.get(parent, 0) + 1
+        if self._genKids is not None: self._genKids.setdefault(parent, []).append(ctx[-1])
+
+    #--------------------------------------------------------------------------
+    def _genDist(self, ctx:tuple):
+        """Returns cached conditional distribution of the next value after the context ctx
+           as (vals, cums), where cums are cumulative counts of vals. Returns None if ctx has no next values.
+        """
+
+        if ctx in self._genCache: return self._genCache[ctx]
 
         #----------------------------------------------------------------------
-        return toRet
+        # Next values and their counts from count tables
+        #----------------------------------------------------------------------
+        if self.backend == 'table':
+
+            vals = self._tableKids().get(ctx, [])
+            cnts = [self._obs[ctx + (val,)] for val in vals]
+
+        #----------------------------------------------------------------------
+        # Next values and their counts from points of the nested IMarkov object
+        #----------------------------------------------------------------------
+        else:
+            mrk = self
+
+            for val in ctx:
+                point = mrk.pointByAxeVal(val)
+                mrk   = point._vals['mrk'] if point is not None else None
+                if not isinstance(mrk, IMarkov): return None
+
+            vals = [point.pos('x')    for point in mrk.points]
+            cnts = [point._vals['obs'] for point in mrk.points]
+
+        #----------------------------------------------------------------------
+        if sum(cnts) == 0: return None
+
+        self._genCache[ctx] = (vals, list(itertools.accumulate(cnts)))
+        return self._genCache[ctx]
+
+    #--------------------------------------------------------------------------
+    def _genNext(self, actVals:list, rnd:float):
+        """Returns next value drawn for the random number 0 <= rnd < 1 from the conditional distribution
+           of the deepest context matching the end of actVals. Returns None if nothing was observed.
+        """
+
+        ctx = tuple(actVals[-(self.dim-1):]) if self.dim > 1 else ()
+
+        for i in range(len(ctx)+1):
+
+            dist = self._genDist(ctx[i:])
+
+            if dist is not None:
+                vals, cums = dist
+                return vals[bisect.bisect_right(cums, rnd * cums[-1])]
+
+        return None
+
+    #--------------------------------------------------------------------------
+    def _tableProb(self, ctx:tuple) -> tuple:
+        "Returns (pro, pgn) of the context ctx in count tables of backend 'table'"
+
+        pro   = 1.0
+        eqPro = 1.0
+
+        for i in range(1, len(ctx)+1):
+
+            parent = ctx[:i-1]
+            tot    = self._tot.get(parent, 0)
+
+            pro   = pro * self._obs.get(ctx[:i], 0) / tot if tot > 0 else 0.0
+            eqPro = eqPro / self._nKids[parent]           if tot > 0 else eqPro
+
+        return pro, pro / eqPro
+
+    #--------------------------------------------------------------------------
+    def _tableKids(self) -> dict:
+        """Returns index of the next values of the contexts of backend 'table' as {ctx: [vals]},
+           index is built with the first call and then updated by _tableNewKid().
+        """
+
+        if self._genKids is None:
+            self._genKids = {}
+            for key in self._obs: self._genKids.setdefault(key[:-1], []).append(key[-1])
+
+        return self._genKids
+
+    #--------------------------------------------------------------------------
+    def _tableItems(self, minObs:int=0):
+        """Yields (ctx, obs, pro, pgn) for contexts in count tables of backend 'table' by depth first
+           walk through the index of the next values from the root context ().
+           Next values of each visited context are ordered, so contexts are ordered lexicographically
+           and each context follows its parent context.
+           Contexts with obs < minObs are not entered, so their extensions are never visited nor sorted.
+        """
+
+        kids  = self._tableKids()
+        stack = [((), 1.0, 1.0)]   # Contexts to visit as (ctx, pro, eqPro), the next one on the top
+
+        while stack:
+
+            ctx, pro, eqPro = stack.pop()
+            if ctx: yield ctx, self._obs[ctx], pro, pro / eqPro
+
+            #------------------------------------------------------------------
+            # Deti s obs >= minObs, na vrch zasobnika ide najmensia hodnota
+            #------------------------------------------------------------------
+            vals = sorted(val for val in kids.get(ctx, ()) if self._obs[ctx + (val,)] >= minObs)
+            if not vals: continue
+
+            tot = self._tot[ctx]
+            cnt = self._nKids[ctx]
+
+            for val in reversed(vals):
+                kid = ctx + (val,)
+                stack.append((kid, pro * self._obs[kid] / tot, eqPro / cnt))
+
+    #--------------------------------------------------------------------------
+    def _tablePoint(self, ctx:tuple, obs:int, pro:float, pgn:float):
+        "Creates InfoPoint for the context ctx of backend 'table'"
+
+        return self._newPoint(pos={'x': ctx[-1]}, vals={'obs': obs, 'pro': pro, 'pgn': pgn, 'mrk': None})
+
+    #--------------------------------------------------------------------------
+    def _pointItems(self, minObs:int=0, pattern:tuple=()):
+        """Yields (pattern, obs, pro, pgn) for all points of this level and nested levels depth first.
+           Points with obs < minObs and their nested Markov objects are skipped.
+        """
+
+        for point in self.points:
+
+            obs = point._vals['obs']
+            if obs < minObs: continue
+
+            newPattern = pattern + (point.pos('x'),)
+            yield newPattern, obs, point._vals['pro'], point._vals['pgn']
+
+            #------------------------------------------------------------------
+            # Dive into nested Markov if it exists
+            #------------------------------------------------------------------
+            mrk = point._vals['mrk']
+
+            if mrk is not None and isinstance(mrk, IMarkov):
+                yield from mrk._pointItems(minObs=minObs, pattern=newPattern)
 
     #--------------------------------------------------------------------------
     def _probActualise(self, cumPro=1.0, cumEqPro=None):
@@ -458,13 +1071,18 @@ class IMarkov(InfoData):
             cumEqPro (float): Equal probability from parent dimension (default: self.eqProb at root level)
         """
 
+        #----------------------------------------------------------------------
+        # Backend 'table' computes probabilities on demand, nothing to actualise
+        #----------------------------------------------------------------------
+        if self.backend == 'table': return
+
         #----------------------------------------------------------------------
         # If called at root level without cumEqPro, use this Markov's eqProb
         #----------------------------------------------------------------------
         if cumEqPro is None:
             cumEqPro = self.eqProb
 
-        logger.debug(f"{self.name}._probActualise: cumPro={cumPro}, cumEqPro={cumEqPro}")
+        if logOn.debug: logger.debug(f"{self.name}._probActualise: cumPro={cumPro}, cumEqPro={cumEqPro}")
 
         #----------------------------------------------------------------------
         # Recalculate probability and gain for all points in this layer
@@ -498,7 +1116,7 @@ class IMarkov(InfoData):
         4. If actVals is empty, return empty list.
         """
 
-        logger.debug(f"{self.name}._activate: actVals={actVals}")
+        if logOn.debug: logger.debug(f"{self.name}._activate: actVals={actVals}")
         toRet = []
 
         #----------------------------------------------------------------------
@@ -512,7 +1130,7 @@ class IMarkov(InfoData):
         # Pop the leftmost value from actVals and use it as the new observation value for this dimension
         #----------------------------------------------------------------------
         val = actVals.pop(0)
-        logger.debug(f"{self.name}._activate: val={val}")
+        if logOn.debug: logger.debug(f"{self.name}._activate: val={val}")
 
         #----------------------------------------------------------------------
         # Find/create InfoPoint with pos == val in this dimension of the Markov process
@@ -533,11 +1151,7 @@ class IMarkov(InfoData):
             #------------------------------------------------------------------
             # Get or create Markov analyser for the next dimension
             #------------------------------------------------------------------
-            nextMark = self.actPoint._vals.get('mrk', None)
-
-            if nextMark is None or not isinstance(nextMark, IMarkov):
-                nextMark = IMarkov(name=f"{self.name}/({val})", dim=self.dim-1, axeName=self.axeNameByKey('x'))
-                self.actPoint.set(vals={'mrk': nextMark})
+            nextMark = self._nextMark(point=self.actPoint, val=val)
 
             #------------------------------------------------------------------
             # Dive into the next dimension
@@ -552,9 +1166,21 @@ class IMarkov(InfoData):
                 logger.error(f"{self.name}._activate: actVals list is not empty in the last dimension, remaining values: {actVals}")
 
         #----------------------------------------------------------------------
-        logger.debug(f"{self.name}._activate: Activated {len(toRet)} InfoPoints in the Markov process")
+        if logOn.debug: logger.debug(f"{self.name}._activate: Activated {len(toRet)} InfoPoints in the Markov process")
         return toRet
 
+    #--------------------------------------------------------------------------
+    def _nextMark(self, point, val:int) -> 'IMarkov':
+        "Returns Markov analyser for the next dimension stored in the point with pos = val, creates it if it does not exist"
+
+        nextMark = point._vals.get('mrk', None)
+
+        if nextMark is None or not isinstance(nextMark, IMarkov):
+            nextMark = IMarkov(name=f"{self.name}/({val})", dim=self.dim-1, axeName=self.axeNameByKey('x'), store=self.store)
+            point.set(vals={'mrk': nextMark})
+
+        return nextMark
+
     #--------------------------------------------------------------------------
     def _getPoint(self, val:int, create=False):
         """Returns InfoPoint in this Markov analyser with pos = val.
@@ -562,41 +1188,28 @@ class IMarkov(InfoData):
         If create is False, returns None if InfoPoint with pos = val does not exist.
         """
 
-        logger.debug(f"{self.name}._getPoint: val={val} with create={create}")
+        if logOn.debug: logger.debug(f"{self.name}._getPoint: val={val} with create={create}")
 
         #----------------------------------------------------------------------
-        # Find InfoPoint with pos == val
+        # Find InfoPoint with pos == val in the index of points
         #----------------------------------------------------------------------
-        pointIdx = self._idxByAxeVal(axeKey='x', axeVal=val)
+        point = self.pointByAxeVal(val)
+
+        if point is not None or not create:
+            return point
 
         #----------------------------------------------------------------------
-        # InfoPoint with pos == val does not exists
+        # Create new InfoPoint with pos == val
         #----------------------------------------------------------------------
-        if pointIdx is None:
+        point = self.initAdd(axeVal=val)
 
-            if create:
-                #--------------------------------------------------------------
-                # Create new InfoPoint with pos == val
-                #--------------------------------------------------------------
-                point = self.initAdd(axeVal=val)
-
-                #--------------------------------------------------------------
-                # Compute equal probability for all points in this Markov analyser
-                #--------------------------------------------------------------
-                if point is not None:
-                    self.eqProb = 1 / len(self.points) if len(self.points) > 0 else 1
-
-                #--------------------------------------------------------------
-                return point
-
-            else:
-                return None
+        #----------------------------------------------------------------------
+        # Compute equal probability for all points in this Markov analyser
+        #----------------------------------------------------------------------
+        if point is not None:
+            self.eqProb = 1 / len(self.points) if len(self.points) > 0 else 1
 
-        else:
-            #------------------------------------------------------------------
-            # InfoPoint with pos == val exists
-            #------------------------------------------------------------------
-            return self.points[pointIdx]
+        return point
 
     #--------------------------------------------------------------------------
     def _idxByAxeVal(self, axeKey:str, axeVal:float) -> int|None:
@@ -607,51 +1220,25 @@ class IMarkov(InfoData):
            non-equidistant axes, so the index can not be calculated by (axeVal-axeOrig)/diff
         """
 
-        logger.debug(f"{self.name}._idxByAxeVal: axeKey={axeKey}, axeVal={axeVal}")
-        toRet = None
+        if logOn.debug: logger.debug(f"{self.name}._idxByAxeVal: axeKey={axeKey}, axeVal={axeVal}")
 
         #----------------------------------------------------------------------
         # Kontrola existencie osi
         #----------------------------------------------------------------------
         if axeKey not in self._cnts.keys():
             logger.error(f"{self.name}._idxByAxeVal: Axe '{axeKey}' is not in InfoData axes {list(self._cnts.keys())}")
-            return toRet
+            return None
 
         #----------------------------------------------------------------------
-        # Prechadzam vsetky InfoPoints az po _pos[axeKey] == axeVal
+        # Binarne hladam axeVal v usporiadanom zozname hodnot osi
         #----------------------------------------------------------------------
-        for idx, point in enumerate(self.points):
-
-            if point._pos[axeKey] == axeVal:
-                toRet = idx
-                break
-
-        #----------------------------------------------------------------------
-        logger.debug(f"{self.name}._idxByAxeVal: axeKey={axeKey}, axeVal={axeVal} -> idx={toRet}")
-        return toRet
-
-    #==========================================================================
-    # Dynamics methods for IMarkov
-    #--------------------------------------------------------------------------
-    def mapSetMethods(self) -> dict:
-        "Returns map of methods setting keyed value to function value for respective parameters"
-
-        methods = super().mapSetMethods()
-
-        methods['ISeries deltas'      ] = {'dataMethod' : self.deltas
-                                          ,'pointMethod':None
-                                          ,'params'     :{}
-                                          ,'visible'    :True
-                                          ,'paramAsk'   :True
-                                          ,'outData'    :None
-                                          ,'outKey'     :'d'
-                                          }
-
-        return methods
+        if self.pointByAxeVal(axeVal) is None: return None
+        return bisect.bisect_left(self._axeSorted, axeVal)
 
     #==========================================================================
     # IMarkov methods to apply in Dynamics methods
     #--------------------------------------------------------------------------
+    @dataMethod('ISeries deltas', outKey='d')
     def deltas(self, inKey:str, outKey:str, params:dict, outData:'InfoData'):
         """Compute auto-correlation of states for each phase.
         - inKey  : Key of the value to be read by the method
@@ -702,6 +1289,66 @@ class IMarkov(InfoData):
     #==========================================================================
     # Persistency methods
     #--------------------------------------------------------------------------
+    def toJson(self) -> dict:
+        "Converts IMarkov into json structure, see InfoData.toJson(), with actual values of the Markov process"
+
+        toRet = super().toJson()
+        toRet['actVals'] = list(self.actVals)
+
+        return toRet
+
+    #--------------------------------------------------------------------------
+    def _persistArrays(self) -> dict:
+        """Returns counts of all contexts (n-grams of length 1..dim) as arrays for both backends:
+           - 'ctxLen': length of the context
+           - 'ctxVal': values of all contexts concatenated
+           - 'ctxObs': number of observations of the context
+           Contexts are ordered lexicographically, so each context follows its parent context.
+        """
+
+        if self.backend == 'table': items = sorted(self._obs.items())
+        else                      : items = sorted((ctx, obs) for ctx, obs, pro, pgn in self._pointItems())
+
+        return {'ctxLen': np.array([len(ctx) for ctx, obs in items], dtype=np.int64)
+               ,'ctxVal': np.array([val for ctx, obs in items for val in ctx])
+               ,'ctxObs': np.array([obs for ctx, obs in items], dtype=np.int64)
+               }
+
+    #--------------------------------------------------------------------------
+    def _restore(self, header:dict, arrays:dict):
+        """Restores Markov analyser from the saved counts of the contexts, counts are added into
+           the backend the same way as in observeMany(), probabilities and gains are recalculated.
+        """
+
+        logger.debug(f"{self.name}._restore: {len(arrays['ctxObs'])} contexts")
+
+        self.setSchema(header['schema'])
+        self.reset()
+
+        #----------------------------------------------------------------------
+        # Pripocitam pocty kontextov do backendu
+        #----------------------------------------------------------------------
+        vals = arrays['ctxVal'].tolist()
+        end  = 0
+
+        for cnt, obs in zip(arrays['ctxLen'].tolist(), arrays['ctxObs'].tolist()):
+
+            ctx  = tuple(vals[end:end+cnt])
+            end += cnt
+
+            if self.backend == 'table': self._tableAdd(ctx, obs)
+            else                      : self._pointsAdd(ctx, obs)
+
+        #----------------------------------------------------------------------
+        # Aktualne hodnoty a aktivne body
+        #----------------------------------------------------------------------
+        self.actVals = header['actVals']
+
+        if self.backend == 'table' and self._tot:
+            self.totObs = self._tot[()]
+            self.eqProb = 1 / self._nKids[()]
+
+        if self.totObs > 0: self._actActualise()
 
 #==============================================================================
 # Inicializacia modulu
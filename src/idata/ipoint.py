@@ -3,15 +3,17 @@
 #------------------------------------------------------------------------------
 import copy
 import math
+from   collections.abc        import MutableMapping
 import cmath
 import random                 as rnd
+import numpy                  as np
 
-from   .                      import logger
+from   .                      import logger, logOn
 
 #==============================================================================
 # Module's constants
 #------------------------------------------------------------------------------
-_VER      = '3.3.0'
+_VER      = '3.6.0'
 
 _IND      = '|  '                      # Info indentation
 _F_SCHEMA = 1                          # Format for ipType
@@ -31,10 +33,13 @@ _CIRCLE      = 2*cmath.pi              # Full circle in radians
 _PHASE_START = cmath.pi/2              # Start phase in radians
 _CLOSE_ZERO  = 1e-12                   # Close to zero threshold
 
+_UNSET       = object()                # Not set position or value in InfoPointCompact
+
 #==============================================================================
 # Module's variables
 #------------------------------------------------------------------------------
 _InfoDataClass = None  # Cache for InfoData class (lazy import to avoid circular dependency)
+_RNG           = np.random.default_rng()  # Random generator for batch methods
 
 #==============================================================================
 # InfoPoint
@@ -46,10 +51,13 @@ class InfoPoint:
        Methods for manipulation of InfoPoint values are defined as static methods and can be mapped to method names in mapSetMethods() static method.
     """
 
+    __slots__ = ('_ipType', '_pos', '_vals')
+
     #==========================================================================
     # Static variables & methods
     #--------------------------------------------------------------------------
-    _schema = copy.deepcopy(_SCHEMA)  # Static schema for all InfoPoint types
+    _schema  = copy.deepcopy(_SCHEMA)  # Static schema for all InfoPoint types
+    _lookups = {}                      # Lookup tables of the schema as {ipType: tables}, see _lookup()
 
     #--------------------------------------------------------------------------
     # Schema methods
@@ -61,9 +69,43 @@ class InfoPoint:
            This method has impact on all InfoPoints because schema is static variable for all type of InfoPoints.
         """
 
-        InfoPoint._schema = copy.deepcopy(_SCHEMA)
+        InfoPoint._schema  = copy.deepcopy(_SCHEMA)
+        InfoPoint._lookups = {}
         logger.info("InfoPoint.resetSchema:")
 
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _lookup(ipType) -> dict:
+        """Returns lookup tables of the schema for respective ipType as dict
+           {'axeKeys': (key,), 'axeIdxs': {key: idx}, 'axeNames': {name: key},
+            'valKeys': (key,), 'valIdxs': {key: idx}, 'valNames': {name: key}}.
+           Tables are built with the first use and dropped by every change of the schema for this ipType.
+        """
+
+        toRet = InfoPoint._lookups.get(ipType)
+        if toRet is not None: return toRet
+
+        toRet = {}
+        for part, pre in (('axes', 'axe'), ('vals', 'val')):
+
+            keys  = tuple(InfoPoint._schema[ipType][part].keys())
+            names = {}
+            for key, name in InfoPoint._schema[ipType][part].items(): names.setdefault(name, key)
+
+            toRet[f"{pre}Keys" ] = keys
+            toRet[f"{pre}Idxs" ] = {key: i for i, key in enumerate(keys)}
+            toRet[f"{pre}Names"] = names
+
+        InfoPoint._lookups[ipType] = toRet
+        return toRet
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def _schemaChanged(ipType):
+        "Drops lookup tables of the schema for respective ipType after change of the schema"
+
+        InfoPoint._lookups.pop(ipType, None)
+
     #--------------------------------------------------------------------------
     @staticmethod
     def checkSchema(ipType):
@@ -83,6 +125,7 @@ class InfoPoint:
 
         InfoPoint.checkSchema(ipType)
         InfoPoint._schema[ipType] = {'axes':copy.deepcopy(_SCH_AXES), 'vals':copy.deepcopy(_SCH_VALS)}
+        InfoPoint._schemaChanged(ipType)
         logger.info(f"InfoPoint.clearSchema: clearSchema ipType '{ipType}'")
 
     #--------------------------------------------------------------------------
@@ -173,6 +216,7 @@ class InfoPoint:
 
         InfoPoint.checkSchema(ipType)
         InfoPoint._schema[ipType] = copy.deepcopy(schema)
+        InfoPoint._schemaChanged(ipType)
 
     #--------------------------------------------------------------------------
     # Axes methods
@@ -198,6 +242,7 @@ class InfoPoint:
         InfoPoint.checkSchema(ipType)
         if key in InfoPoint._schema[ipType]['axes'].keys():
             InfoPoint._schema[ipType]['axes'].pop(key)
+            InfoPoint._schemaChanged(ipType)
 
         logger.debug(f"InfoPoint.delSchemaAxe: key '{key}' was deleted from axes")
 
@@ -215,6 +260,7 @@ class InfoPoint:
         if (key not in InfoPoint._schema[ipType]['axes'].keys()) or (InfoPoint._schema[ipType]['axes'][key] != name):
 
             InfoPoint._schema[ipType]['axes'][key] = name
+            InfoPoint._schemaChanged(ipType)
             logger.debug(f"InfoPoint.setSchemaAxe: set key '{key}' for axe '{name}'")
 
         else:
@@ -238,10 +284,11 @@ class InfoPoint:
         #----------------------------------------------------------------------
         # Find index of the axe's key
         #----------------------------------------------------------------------
-        for i, keyAxe in enumerate(InfoPoint._schema[ipType]['axes'].keys()):
-            if key==keyAxe:
-                logger.debug(f"InfoPoint.axeIdxByKey: Key '{key}' found in axes {InfoPoint._schema[ipType]['axes']} at index {i}")
-                return i
+        i = InfoPoint._lookup(ipType)['axeIdxs'].get(key)
+
+        if i is not None:
+            if logOn.debug: logger.debug(f"InfoPoint.axeIdxByKey: Key '{key}' found in axes {InfoPoint._schema[ipType]['axes']} at index {i}")
+            return i
 
         #----------------------------------------------------------------------
         # Key not found
@@ -267,15 +314,16 @@ class InfoPoint:
         #----------------------------------------------------------------------
         # Check if idx is not out of the range
         #----------------------------------------------------------------------
-        if idx >= len(InfoPoint._schema[ipType]['axes'].keys()):
+        keys = InfoPoint._lookup(ipType)['axeKeys']
+
+        if idx >= len(keys):
             logger.warning(f"InfoPoint.axeKeyByIdx: Idx '{idx}' is out of the range in {InfoPoint._schema[ipType]['axes']}")
             return None
 
         #----------------------------------------------------------------------
         # Find key for index
         #----------------------------------------------------------------------
-        key = list(InfoPoint._schema[ipType]['axes'].keys())[idx]
-        return key
+        return keys[idx]
 
     #--------------------------------------------------------------------------
     @staticmethod
@@ -320,11 +368,11 @@ class InfoPoint:
         #----------------------------------------------------------------------
         # Find the axe's key for the axe's name
         #----------------------------------------------------------------------
-        for key, axeName in InfoPoint._schema[ipType]['axes'].items():
+        key = InfoPoint._lookup(ipType)['axeNames'].get(name)
 
-            if axeName == name:
-                logger.debug(f"InfoPoint.axeKeyByName: Name '{name}' found in axes {InfoPoint._schema[ipType]['axes']} for key '{key}'")
-                return key
+        if key is not None:
+            if logOn.debug: logger.debug(f"InfoPoint.axeKeyByName: Name '{name}' found in axes {InfoPoint._schema[ipType]['axes']} for key '{key}'")
+            return key
 
         #----------------------------------------------------------------------
         logger.warning(f"InfoPoint.axeKeyByName: Name '{name}' not found in axes {InfoPoint._schema[ipType]['axes']}")
@@ -354,6 +402,7 @@ class InfoPoint:
         InfoPoint.checkSchema(ipType)
         if key in InfoPoint._schema[ipType]['vals'].keys():
             InfoPoint._schema[ipType]['vals'].pop(key)
+            InfoPoint._schemaChanged(ipType)
 
         logger.debug(f"InfoPoint.delSchemaVal: key '{key}' was deleted from values")
 
@@ -371,6 +420,7 @@ class InfoPoint:
         if (key not in InfoPoint._schema[ipType]['vals'].keys()) or (InfoPoint._schema[ipType]['vals'][key] != name):
 
             InfoPoint._schema[ipType]['vals'][key] = name
+            InfoPoint._schemaChanged(ipType)
             logger.debug(f"InfoPoint.setSchemaVal: set key '{key}' for value '{name}'")
 
         else:
@@ -394,8 +444,8 @@ class InfoPoint:
         #----------------------------------------------------------------------
         # Find index of the value's key
         #----------------------------------------------------------------------
-        for i, keyVal in enumerate(InfoPoint._schema[ipType]['vals'].keys()):
-            if key==keyVal: return i
+        i = InfoPoint._lookup(ipType)['valIdxs'].get(key)
+        if i is not None: return i
 
         #----------------------------------------------------------------------
         # Key not found
@@ -421,15 +471,16 @@ class InfoPoint:
         #----------------------------------------------------------------------
         # Check if idx is not out of the range
         #----------------------------------------------------------------------
-        if idx >= len(InfoPoint._schema[ipType]['vals'].keys()):
+        keys = InfoPoint._lookup(ipType)['valKeys']
+
+        if idx >= len(keys):
             logger.warning(f"InfoPoint.valKeyByIdx: Idx '{idx}' is out of the range in {InfoPoint._schema[ipType]['vals']}")
             return None
 
         #----------------------------------------------------------------------
         # Find key for index
         #----------------------------------------------------------------------
-        key = list(InfoPoint._schema[ipType]['vals'].keys())[idx]
-        return key
+        return keys[idx]
 
     #--------------------------------------------------------------------------
     @staticmethod
@@ -474,11 +525,11 @@ class InfoPoint:
         #----------------------------------------------------------------------
         # Find the val's key for the val's name
         #----------------------------------------------------------------------
-        for key, valName in InfoPoint._schema[ipType]['vals'].items():
+        key = InfoPoint._lookup(ipType)['valNames'].get(name)
 
-            if valName == name:
-                logger.debug(f"InfoPoint.valKeyByName: Name '{name}' found in values {InfoPoint._schema[ipType]['vals']} for key '{key}'")
-                return key
+        if key is not None:
+            if logOn.debug: logger.debug(f"InfoPoint.valKeyByName: Name '{name}' found in values {InfoPoint._schema[ipType]['vals']} for key '{key}'")
+            return key
 
         #----------------------------------------------------------------------
         logger.warning(f"InfoPoint.valKeyByName: Name '{name}' not found in values {InfoPoint._schema[ipType]['vals']}")
@@ -510,6 +561,7 @@ class InfoPoint:
         Structure:
             {pointMethodName: {
                               'pointMethod': callable_function,   -- method to be applied to each point in the active subdata
+                              'batchMethod': callable_function,   -- optional method returning values for all target points at once
                               'params'     : {paramName: defaultValue},
                               'visible'    : False/True,
                               'paramAsk'   : False/True
@@ -522,19 +574,20 @@ class InfoPoint:
         - If paramAsk is False, default values are used without asking
         - If visible is False, method should not be shown in GUI
         - If visible is True, method should be shown in GUI
+        - If batchMethod is defined, InfoData uses it instead of calling pointMethod for each point
         """
 
-        return {'<Point Methods>'        : {'pointMethod':InfoPoint.nullMethod,    'params':{                                                           }, 'visible':True, 'paramAsk':False}
-               ,'Integer constant'       : {'pointMethod':InfoPoint.intConst,      'params':{'const'  :0                                                }, 'visible':True, 'paramAsk':True}
-               ,'Integer random uniform' : {'pointMethod':InfoPoint.intRandUni,    'params':{'min'    :0,   'max'   :1                                  }, 'visible':True, 'paramAsk':True}
-               ,'Real constant'          : {'pointMethod':InfoPoint.fltConst,      'params':{'const'  :0                                                }, 'visible':True, 'paramAsk':True}
-               ,'Real random uniform'    : {'pointMethod':InfoPoint.fltRandUni,    'params':{'min'    :0,   'max'   :1                                  }, 'visible':True, 'paramAsk':True}
-               ,'Random bit'             : {'pointMethod':InfoPoint.fltRandBit,    'params':{'prob1'  :0.1                                              }, 'visible':True, 'paramAsk':True}
-               ,'Comp constant (re/im)'  : {'pointMethod':InfoPoint.cmpConstR,     'params':{'real'   :0,   'imag'  :0                                  }, 'visible':True, 'paramAsk':True}
-               ,'Comp constant (abs/phs)': {'pointMethod':InfoPoint.cmpConstP,     'params':{'abs'    :0,   'phase' :0                                  }, 'visible':True, 'paramAsk':True}
-               ,'Comp random   (re/im)'  : {'pointMethod':InfoPoint.cmpRandUniR,   'params':{'reMin'  :0,   'reMax' :1, 'imMin'   :0, 'imMax'   :1      }, 'visible':True, 'paramAsk':True}
-               ,'Comp random   (abs/phs)': {'pointMethod':InfoPoint.cmpRandUniP,   'params':{'absMin' :0,   'absMax':1, 'phaseMin':0, 'phaseMax':_CIRCLE}, 'visible':True, 'paramAsk':True}
-               ,'Comp discrete phase'    : {'pointMethod':InfoPoint.cmpDiscPhases, 'params':{'probAbs':0.5, 'phases':2                                  }, 'visible':True, 'paramAsk':True}
+        return {'<Point Methods>'        : {'pointMethod':InfoPoint.nullMethod,    'batchMethod':None,                       'params':{                                                           }, 'visible':True, 'paramAsk':False}
+               ,'Integer constant'       : {'pointMethod':InfoPoint.intConst,      'batchMethod':InfoPoint.intConstBatch,      'params':{'const'  :0                                                }, 'visible':True, 'paramAsk':True}
+               ,'Integer random uniform' : {'pointMethod':InfoPoint.intRandUni,    'batchMethod':InfoPoint.intRandUniBatch,    'params':{'min'    :0,   'max'   :1                                  }, 'visible':True, 'paramAsk':True}
+               ,'Real constant'          : {'pointMethod':InfoPoint.fltConst,      'batchMethod':InfoPoint.fltConstBatch,      'params':{'const'  :0                                                }, 'visible':True, 'paramAsk':True}
+               ,'Real random uniform'    : {'pointMethod':InfoPoint.fltRandUni,    'batchMethod':InfoPoint.fltRandUniBatch,    'params':{'min'    :0,   'max'   :1                                  }, 'visible':True, 'paramAsk':True}
+               ,'Random bit'             : {'pointMethod':InfoPoint.fltRandBit,    'batchMethod':InfoPoint.fltRandBitBatch,    'params':{'prob1'  :0.1                                              }, 'visible':True, 'paramAsk':True}
+               ,'Comp constant (re/im)'  : {'pointMethod':InfoPoint.cmpConstR,     'batchMethod':InfoPoint.cmpConstRBatch,     'params':{'real'   :0,   'imag'  :0                                  }, 'visible':True, 'paramAsk':True}
+               ,'Comp constant (abs/phs)': {'pointMethod':InfoPoint.cmpConstP,     'batchMethod':InfoPoint.cmpConstPBatch,     'params':{'abs'    :0,   'phase' :0                                  }, 'visible':True, 'paramAsk':True}
+               ,'Comp random   (re/im)'  : {'pointMethod':InfoPoint.cmpRandUniR,   'batchMethod':InfoPoint.cmpRandUniRBatch,   'params':{'reMin'  :0,   'reMax' :1, 'imMin'   :0, 'imMax'   :1      }, 'visible':True, 'paramAsk':True}
+               ,'Comp random   (abs/phs)': {'pointMethod':InfoPoint.cmpRandUniP,   'batchMethod':InfoPoint.cmpRandUniPBatch,   'params':{'absMin' :0,   'absMax':1, 'phaseMin':0, 'phaseMax':_CIRCLE}, 'visible':True, 'paramAsk':True}
+               ,'Comp discrete phase'    : {'pointMethod':InfoPoint.cmpDiscPhases, 'batchMethod':InfoPoint.cmpDiscPhasesBatch, 'params':{'probAbs':0.5, 'phases':2                                  }, 'visible':True, 'paramAsk':True}
                }
 
     #==========================================================================
@@ -649,10 +702,10 @@ class InfoPoint:
            these keys are ignored without warning. FIX IN THE FUTURE
         """
 
-        for keyVal in InfoPoint._schema[self._ipType]['vals'].keys():
+        for keyVal in InfoPoint._lookup(self._ipType)['valKeys']:
             self._vals[keyVal] = vals.get(keyVal, 0)
 
-        logger.debug(f"InfoPoint.clear: {self._vals}")
+        if logOn.debug: logger.debug(f"InfoPoint.clear: {self._vals}")
         return self
 
     #--------------------------------------------------------------------------
@@ -683,10 +736,7 @@ class InfoPoint:
                 # Ak pos je list alebo tuple, zmapujem osami
                 #--------------------------------------------------------------
                 else:
-                    axeKeys = list(InfoPoint._schema[self._ipType]['axes'].keys())
-                    for i, p in enumerate(pos):
-                        if i < len(axeKeys):
-                            self._pos[axeKeys[i]] = p
+                    self._pos.update(zip(InfoPoint._lookup(self._ipType)['axeKeys'], pos))
 
         #----------------------------------------------------------------------
         # Set values
@@ -705,10 +755,7 @@ class InfoPoint:
                 # Ak vals je list alebo tuple, zmapujem s hodnotami
                 #--------------------------------------------------------------
                 else:
-                    valKeys = list(InfoPoint._schema[self._ipType]['vals'].keys())
-                    for i, v in enumerate(vals):
-                        if i < len(valKeys):
-                            self._vals[valKeys[i]] = v
+                    self._vals.update(zip(InfoPoint._lookup(self._ipType)['valKeys'], vals))
 
     #==========================================================================
     # InfoPoint Value's retrieval
@@ -1011,6 +1058,322 @@ class InfoPoint:
         infoPoint.set(vals={outKey: val})
         return 1
 
+    #==========================================================================
+    # Batch Methods returning values for all target points at once.
+    # Signature is the same as for Set Methods but the first argument is list of points
+    # and the method returns numpy array of values in the order of points.
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def intConstBatch(points, inKey:str, outKey:str, params:dict) -> np.ndarray:
+        """Batch version of intConst"""
+
+        return np.full(len(points), int(params.get('const', 0)), dtype=np.int64)
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def intRandUniBatch(points, inKey:str, outKey:str, params:dict) -> np.ndarray:
+        """Batch version of intRandUni"""
+
+        minVal = int(params.get('min',  0))
+        maxVal = int(params.get('max', 10))
+
+        return _RNG.integers(minVal, maxVal, size=len(points), endpoint=True)
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def fltConstBatch(points, inKey:str, outKey:str, params:dict) -> np.ndarray:
+        """Batch version of fltConst"""
+
+        return np.full(len(points), float(params.get('const', 0)), dtype=np.float64)
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def fltRandUniBatch(points, inKey:str, outKey:str, params:dict) -> np.ndarray:
+        """Batch version of fltRandUni"""
+
+        minVal = float(params.get('min', 0))
+        maxVal = float(params.get('max', 1))
+
+        return _RNG.uniform(minVal, maxVal, size=len(points))
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def fltRandBitBatch(points, inKey:str, outKey:str, params:dict) -> np.ndarray:
+        """Batch version of fltRandBit"""
+
+        prob1 = params.get('prob1', 0.5)
+
+        return (_RNG.random(len(points)) < prob1).astype(np.int64)
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def cmpConstRBatch(points, inKey:str, outKey:str, params:dict) -> np.ndarray:
+        """Batch version of cmpConstR"""
+
+        val = complex(params.get('real', 0), params.get('imag', 0))
+
+        return np.full(len(points), val, dtype=np.complex128)
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def cmpConstPBatch(points, inKey:str, outKey:str, params:dict) -> np.ndarray:
+        """Batch version of cmpConstP"""
+
+        val = params.get('abs', 0) * cmath.exp(complex(0, params.get('phase', 0)))
+
+        return np.full(len(points), val, dtype=np.complex128)
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def cmpRandUniRBatch(points, inKey:str, outKey:str, params:dict) -> np.ndarray:
+        """Batch version of cmpRandUniR"""
+
+        reMin  = params.get('reMin' , 0)
+        reMax  = params.get('reMax' , 1)
+        imMin  = params.get('imMin' , 0)
+        imMax  = params.get('imMax' , 1)
+
+        real = reMin + (reMax - reMin) * _RNG.random(len(points))
+        imag = imMin + (imMax - imMin) * _RNG.random(len(points))
+
+        return real + 1j * imag
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def cmpRandUniPBatch(points, inKey:str, outKey:str, params:dict) -> np.ndarray:
+        """Batch version of cmpRandUniP"""
+
+        absMin   = params.get('absMin'  , 0)
+        absMax   = params.get('absMax'  , 1)
+        phaseMin = params.get('phaseMin', 0)
+        phaseMax = params.get('phaseMax', _CIRCLE)
+
+        abs_val = absMin   + (absMax   - absMin  ) * _RNG.random(len(points))
+        phase   = phaseMin + (phaseMax - phaseMin) * _RNG.random(len(points))
+
+        return abs_val * np.exp(1j * phase)
+
+    #--------------------------------------------------------------------------
+    @staticmethod
+    def cmpDiscPhasesBatch(points, inKey:str, outKey:str, params:dict) -> np.ndarray:
+        """Batch version of cmpDiscPhases"""
+
+        probAbs = params.get('probAbs', 0.5)
+        phases  = params.get('phases', 2)
+
+        abs_val   = (_RNG.random(len(points)) < probAbs).astype(np.float64)
+        phase_idx = _RNG.integers(0, phases, size=len(points))
+
+        return abs_val * np.exp(1j * phase_idx * _CIRCLE / phases)
+
+#==============================================================================
+# Write-through dict view of InfoPointCompact
+#------------------------------------------------------------------------------
+class _SlotMap(MutableMapping):
+    """Dict-like view of set positions or values of InfoPointCompact.
+       Reading and writing goes directly into the list of the point, so code
+       working with point._pos / point._vals keeps working on compact points.
+    """
+
+    __slots__ = ('_point', '_part')
+
+    def __init__(self, point:'InfoPointCompact', part:str):
+
+        self._point = point
+        self._part  = part      # 'axe' or 'val'
+
+    def __getitem__(self, key):
+
+        val = self._point._slotGet(self._part, key)
+        if val is _UNSET: raise KeyError(key)
+        return val
+
+    def get(self, key, default=None):
+
+        val = self._point._slotGet(self._part, key)
+        return default if val is _UNSET else val
+
+    def __setitem__(self, key, val):
+
+        self._point._slotSet(self._part, key, val)
+
+    def __delitem__(self, key):
+
+        if self._point._slotGet(self._part, key) is _UNSET: raise KeyError(key)
+        self._point._slotSet(self._part, key, _UNSET)
+
+    def __iter__(self):
+
+        return iter(self._point._slotKeys(self._part))
+
+    def __len__(self):
+
+        return len(self._point._slotKeys(self._part))
+
+    def copy(self) -> dict:
+
+        return dict(self.items())
+
+    def __repr__(self):
+
+        return repr(self.copy())
+
+#==============================================================================
+# InfoPointCompact
+#------------------------------------------------------------------------------
+class InfoPointCompact(InfoPoint):
+    """Compact InfoPoint without instance dict. Positions and values are stored in one list
+       ordered as axe keys followed by value keys of the schema of ipType, not set items hold _UNSET.
+       Dicts of positions and values are produced only on demand by pos(), val(), get()
+       and by write-through views _pos / _vals. Keys not defined in the schema are not stored.
+       List is realigned to the schema with the first access after change of the schema.
+    """
+
+    __slots__ = ('_lay', '_data')
+
+    #--------------------------------------------------------------------------
+    def __init__(self, ipType:str, *, pos=None, vals=None):
+        "Calls constructor of InfoPointCompact on respective position, see InfoPoint"
+
+        InfoPoint.checkSchema(ipType)
+
+        self._ipType = ipType                     # Type of InfoPoint (ipReal, ipComplex, ...)
+        self._lay    = InfoPoint._lookup(ipType)  # Lookup tables of the schema the list is aligned to
+        self._data   = [_UNSET] * (len(self._lay['axeKeys']) + len(self._lay['valKeys']))
+
+        self.set(pos=pos, vals=vals)
+
+    #--------------------------------------------------------------------------
+    @property
+    def _pos(self) -> _SlotMap:
+        "Write-through dict view of the positions of this point"
+
+        return _SlotMap(self, 'axe')
+
+    #--------------------------------------------------------------------------
+    @property
+    def _vals(self) -> _SlotMap:
+        "Write-through dict view of the values of this point"
+
+        return _SlotMap(self, 'val')
+
+    #--------------------------------------------------------------------------
+    def _layout(self) -> dict:
+        "Returns lookup tables of the actual schema, realigns the list if the schema was changed"
+
+        if InfoPoint._lookups.get(self._ipType) is self._lay: return self._lay
+
+        old, data = self._lay, self._data
+        lay       = InfoPoint._lookup(self._ipType)
+        off, nOff = len(old['axeKeys']), len(lay['axeKeys'])
+
+        self._data = [_UNSET] * (nOff + len(lay['valKeys']))
+
+        for key, i in lay['axeIdxs'].items():
+            if key in old['axeIdxs']: self._data[i] = data[old['axeIdxs'][key]]
+
+        for key, i in lay['valIdxs'].items():
+            if key in old['valIdxs']: self._data[nOff + i] = data[off + old['valIdxs'][key]]
+
+        self._lay = lay
+        return lay
+
+    #--------------------------------------------------------------------------
+    def _slotIdx(self, part:str, key) -> int|None:
+        "Returns index of the axe ('axe') or value ('val') key in the list or None if key is not in the schema"
+
+        lay = self._layout()
+
+        if part == 'axe': return lay['axeIdxs'].get(key)
+
+        i = lay['valIdxs'].get(key)
+        return None if i is None else len(lay['axeKeys']) + i
+
+    #--------------------------------------------------------------------------
+    def _slotGet(self, part:str, key):
+        "Returns position or value for respective key or _UNSET"
+
+        i = self._slotIdx(part, key)
+        return _UNSET if i is None else self._data[i]
+
+    #--------------------------------------------------------------------------
+    def _slotSet(self, part:str, key, val):
+        "Sets position or value for respective key, key not defined in the schema is not stored"
+
+        i = self._slotIdx(part, key)
+
+        if i is None:
+            logger.error(f"InfoPointCompact._slotSet: Key '{key}' is not defined in the schema of '{self._ipType}', not stored")
+            return
+
+        self._data[i] = val
+
+    #--------------------------------------------------------------------------
+    def _slotKeys(self, part:str) -> list:
+        "Returns keys of set positions or values in the schema order"
+
+        lay  = self._layout()
+        keys = lay['axeKeys'] if part == 'axe' else lay['valKeys']
+        off  = 0 if part == 'axe' else len(lay['axeKeys'])
+
+        return [key for i, key in enumerate(keys) if self._data[off + i] is not _UNSET]
+
+    #==========================================================================
+    # InfoPoint Value's modification & retrieval
+    #--------------------------------------------------------------------------
+    def clear(self, *, vals:dict={}) -> 'InfoPointCompact':
+        "Sets all values of this point to provided values or to 0"
+
+        lay = self._layout()
+        off = len(lay['axeKeys'])
+
+        for i, keyVal in enumerate(lay['valKeys']): self._data[off + i] = vals.get(keyVal, 0)
+
+        return self
+
+    #--------------------------------------------------------------------------
+    def set(self, *, pos:'dict|list|tuple|None'=None, vals:'dict|list|tuple|None'=None):
+        "Set position and values of this point, see InfoPoint.set()"
+
+        lay = self._layout()
+        off = len(lay['axeKeys'])
+
+        if pos is not None:
+
+            if type(pos) == dict:
+                for key, p in pos.items(): self._slotSet('axe', key, p)
+
+            elif type(pos) in (tuple, list):
+                cnt = min(len(pos), off)
+                self._data[:cnt] = pos[:cnt]
+
+        if vals is not None:
+
+            if type(vals) == dict:
+                for key, v in vals.items(): self._slotSet('val', key, v)
+
+            elif type(vals) in (tuple, list):
+                cnt = min(len(vals), len(lay['valKeys']))
+                self._data[off:off+cnt] = vals[:cnt]
+
+    #--------------------------------------------------------------------------
+    def pos(self, axeKey=None)->float|dict|None:
+        "Returns position on respective axe or whole position dict of this point"
+
+        if axeKey is None: return self._pos.copy()
+
+        val = self._slotGet('axe', axeKey)
+        return None if val is _UNSET else val
+
+    #--------------------------------------------------------------------------
+    def val(self, valKey=None):
+        "Returns value for respective key or whole values dict of this point"
+
+        if valKey is None: return self._vals.copy()
+
+        val = self._slotGet('val', valKey)
+        return None if val is _UNSET else val
+
 #==============================================================================
 # Inicializacia modulu
 #------------------------------------------------------------------------------
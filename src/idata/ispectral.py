@@ -0,0 +1,118 @@
+#==============================================================================
+# Siqo module ISpectral - spectral tools shared by InfoData subclasses
+#------------------------------------------------------------------------------
+import numpy                  as np
+
+from   .                      import logger
+
+#==============================================================================
+# Module's constants
+#------------------------------------------------------------------------------
+_VER    = '1.1.0'
+
+_AC_DIRECT = 16         # Max count of lags computed by direct dot products in autoCorrCircular()
+
+#==============================================================================
+# Module's variables
+#------------------------------------------------------------------------------
+
+#==============================================================================
+# Windowed real Fourier transform
+#------------------------------------------------------------------------------
+def rftRad(n:int, rad:int=0) -> int:
+    "Returns radix level of the FFT window, for rad == 0 the biggest power of two not greater than n"
+
+    if rad == 0 and n > 0: rad = n.bit_length() - 1
+    return rad
+
+#------------------------------------------------------------------------------
+def rftWindowed(vals, rad:int=0) -> np.ndarray|None:
+    """Compute Fourier transform of real values accumulated over windows of size = 2^rad.
+
+    1. If rad == 0, rad is set to the biggest power of two not greater than len(vals)
+    2. vals are split into consecutive windows of size values, the last window is padded with zeros
+    3. Fourier coefficients of all windows are summed, because FFT is linear, windows are summed
+       first and transformed by one numpy.fft.rfft call
+    4. Returns complex coefficients for frequency bins k = 0..size/2 or None if there are less
+       than size values
+
+    Index k of the result corresponds to frequency f(k) = k * (sampling_frequency / size).
+    """
+
+    vals = np.asarray(vals, dtype=np.float64)
+    n    = len(vals)
+    rad  = rftRad(n, rad)
+    size = 1 << rad
+
+    if n == 0 or n < size:
+        logger.error(f"ISpectral.rftWindowed: Not enough points for FFT (n={n}, rad={rad}, size={size})")
+        return None
+
+    #--------------------------------------------------------------------------
+    # Okna dlzky size, posledne okno doplnim nulami a okna spocitam
+    #--------------------------------------------------------------------------
+    wins = -(-n // size)
+    vec  = np.zeros(wins * size, dtype=np.float64)
+    vec[:n] = vals
+
+    logger.debug(f"ISpectral.rftWindowed: rad={rad}, size={size}, windows={wins}")
+    return np.fft.rfft(vec.reshape(wins, size).sum(axis=0))
+
+#------------------------------------------------------------------------------
+def rftMagnitudes(vals, rad:int=0) -> np.ndarray|None:
+    """Returns magnitudes |X[k]| of windowed Fourier transform of real values for all k = 0..size-1,
+       upper half of the spectrum is the mirror of the lower half, |X[size-k]| = |X[k]|.
+       Returns None if there are less than size values.
+    """
+
+    coefs = rftWindowed(vals, rad)
+    if coefs is None: return None
+
+    size = 1 << rftRad(len(vals), rad)
+    mags = np.abs(coefs)
+
+    return np.concatenate([mags, mags[1:(size+1)//2][::-1]])
+
+#==============================================================================
+# Auto-correlation
+#------------------------------------------------------------------------------
+def autoCorrCircular(vals, maxTau:int) -> np.ndarray:
+    """Compute circular auto-correlation ac[tau] = SUM_i(x[i] * x[(i+tau) % n]) / n for tau = 0..maxTau.
+
+    For small maxTau direct numpy dot products with rolled values are used, otherwise Wiener-Khinchin
+    route ac = ifft(X[-k] * X[k]) / n. FFT of length n without zero padding gives exactly the circular
+    definition. Returns real array for real values, complex array for complex values.
+    """
+
+    vals = np.asarray(vals)
+    if vals.dtype.kind not in 'fc': vals = vals.astype(np.float64)
+
+    n    = len(vals)
+    taus = np.arange(maxTau+1) % n
+
+    #--------------------------------------------------------------------------
+    # Priame skalarne sucty pre maly pocet posunov
+    #--------------------------------------------------------------------------
+    if maxTau < _AC_DIRECT:
+        logger.debug(f"ISpectral.autoCorrCircular: direct, n={n}, maxTau={maxTau}")
+        return np.array([np.dot(vals, np.roll(vals, -tau)) for tau in taus.tolist()]) / n
+
+    #--------------------------------------------------------------------------
+    # Wiener-Khinchin: korelacia = inverzna FFT vykonoveho spektra
+    #--------------------------------------------------------------------------
+    logger.debug(f"ISpectral.autoCorrCircular: FFT, n={n}, maxTau={maxTau}")
+
+    spec = np.fft.fft(vals)
+    corr = np.fft.ifft(spec[-np.arange(n) % n] * spec)
+
+    if vals.dtype.kind == 'f': corr = corr.real
+    return corr[taus] / n
+
+#==============================================================================
+# Inicializacia modulu
+#------------------------------------------------------------------------------
+print(f"ISpectral ver {_VER}")
+
+#==============================================================================
+#                              END OF FILE
+#------------------------------------------------------------------------------
@@ -3,16 +3,18 @@
 #------------------------------------------------------------------------------
 
 from   siqolib.logger         import SiqoLogger
+from   idata                  import LogLevels
 
 #==============================================================================
 # Package's constants
 #------------------------------------------------------------------------------
-_VER            = '1.1.0'
+_VER            = '1.2.0'
 
 #==============================================================================
 # Package's variables
 #------------------------------------------------------------------------------
 logger = SiqoLogger(name='IFieldPackage')   # Logger for IFieldPackage
+logOn  = LogLevels(logger)                  # Cached level flags of the logger for hot paths
 
 #==============================================================================
 # Inicializacia modulu
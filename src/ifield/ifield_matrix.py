@@ -2,22 +2,153 @@
 # Siqo class InfoFieldMatrix
 #------------------------------------------------------------------------------
 import cmath
+import time
+import weakref
+from   collections            import Counter
+from   concurrent.futures     import ProcessPoolExecutor
+from   multiprocessing        import shared_memory
+import numpy                  as np
 
-from   .                      import logger
-from   idata.idata            import InfoData
+from   .                      import logger, logOn
+from   idata.idata            import InfoData, dataMethod
 
 #==============================================================================
 # Module's constants
 #------------------------------------------------------------------------------
-_VER    = '1.1.0'
+_VER    = '1.5.2'
 
 _LAMBDA = 120       # Default points for Lambda axis
 _EPOCH  =  60       # Default points for Epoch axis
 _PHASES =   2       # Default number of the discrete phases for complex values
+_STEPS  = 1000      # Default count of the epoch steps in runEpochs()
+
+_STYPES = {'bool':np.bool_, 'int':np.int64, 'complex':np.complex128}  # numpy dtype of the state for respective sType
+_ACCS   = {'bool':np.int64, 'int':np.int64, 'complex':np.complex128}  # numpy dtype of the aggregated states for respective sType
+_KERNEL_AGGS = ('nearest', 'min', 'max', 'sum')                       # sAgg methods supported by vectorized kernel
 
 #==============================================================================
 # Module's variables
 #------------------------------------------------------------------------------
+_SHMS   = {}        # Shared memory blocks attached in this process as {name: SharedMemory}
+
+#==============================================================================
+# Vectorized epoch step
+#------------------------------------------------------------------------------
+def _absSq(state):
+    """Returns square of the absolute value of the state or numpy array of states.
+       Real and imaginary parts are computed by the same float operations for python
+       scalars and numpy arrays, so ordering of the states is the same in both cases.
+    """
+
+    return state.real * state.real + state.imag * state.imag
+
+#------------------------------------------------------------------------------
+def _rotKernel(vals:np.ndarray, rot:complex) -> np.ndarray:
+    """Returns complex states rotated by rot computed exactly as python complex product,
+       numpy complex multiplication may differ in the last bit.
+    """
+
+    toRet      = np.empty(vals.shape, dtype=np.complex128)
+    toRet.real = vals.real * rot.real - vals.imag * rot.imag
+    toRet.imag = vals.real * rot.imag + vals.imag * rot.real
+
+    return toRet
+
+#------------------------------------------------------------------------------
+def _aggKernel(S:np.ndarray, tab:dict, rows:np.ndarray, side:int, sType:str, sAgg:str, lo:int=0, hi:int=None) -> np.ndarray:
+    """Aggregates states of left (side=-1) or right (side=1) neighbors for lambdas lo .. hi-1 at once.
+       S is state array [epoch x lambda], tab is table of the neighbors from InfoFieldMatrix._neighTable()
+       and rows are rows of S with the neighbors in distances tab['dLs'].
+       Neighbors are taken in order dL = 1, 2, ... exactly as getNeighStates() does, so results
+       are the same as results of aggStates(). Lambdas without neighbors get zero state.
+    """
+
+    L = S.shape[1]
+    if hi is None: hi = L
+
+    acc   = np.zeros(hi-lo, dtype=_ACCS[sType])
+    found = np.zeros(hi-lo, dtype=bool)
+
+    for dL, row, rot in zip(tab['dLs'].tolist(), rows.tolist(), tab['rots']):
+
+        #----------------------------------------------------------------------
+        # Rozsah lambd, ktore maju suseda vo vzdialenosti dL, left plati pre (l-dL) > 0
+        #----------------------------------------------------------------------
+        if side < 0: t0, t1 = max(lo, dL+1), hi
+        else       : t0, t1 = lo, min(hi, L-dL)
+
+        if t0 >= t1: break
+
+        tgt  = slice(t0-lo, t1-lo)
+        vals = S[row, t0+side*dL:t1+side*dL].astype(acc.dtype)
+        if sType == 'complex': vals = _rotKernel(vals, rot)
+
+        #----------------------------------------------------------------------
+        # Agregacia stavov v poradi dL
+        #----------------------------------------------------------------------
+        if sAgg == 'sum':
+            acc[tgt] += vals
+            continue
+
+        act = acc[tgt]
+        fnd = found[tgt]
+
+        if   sAgg == 'nearest': upd = ~fnd & (vals != 0)
+        elif sAgg == 'min'    : upd = ~fnd | (_absSq(vals) < _absSq(act))
+        elif sAgg == 'max'    : upd = ~fnd | (_absSq(vals) > _absSq(act))
+
+        act[upd] = vals[upd]
+        fnd[upd] = True
+
+    if sType == 'bool': acc = acc != 0
+    return acc
+
+#------------------------------------------------------------------------------
+def _ruleKernel(leftState:np.ndarray, actState:np.ndarray, rightState:np.ndarray, sType:str, rule:str) -> np.ndarray:
+    "Vectorized version of InfoFieldMatrix.aggNeighbors() for all lambdas at once"
+
+    if rule == 'and':
+        return np.where(leftState == rightState, leftState, actState)
+
+    if rule == 'xand':
+        opposite = ~leftState if sType == 'bool' else -leftState
+        return np.where(leftState == rightState, opposite, actState)
+
+    if rule == 'sum':
+        if sType == 'bool': return leftState | rightState
+        return leftState + rightState
+
+    logger.warning(f"InfoFieldMatrix._ruleKernel: Unknown rule '{rule}', returning actState")
+    return actState
+
+#------------------------------------------------------------------------------
+def _rowKernel(S:np.ndarray, tab:dict, rows:np.ndarray, row0:int, sType:str, sAgg:str, rule:str, lo:int=0, hi:int=None) -> np.ndarray:
+    "Returns new states of lambdas lo .. hi-1 in the row row0 of the state array S"
+
+    if hi is None: hi = S.shape[1]
+
+    leftState  = _aggKernel(S, tab, rows, -1, sType, sAgg, lo, hi)
+    rightState = _aggKernel(S, tab, rows,  1, sType, sAgg, lo, hi)
+
+    return _ruleKernel(leftState, S[row0, lo:hi], rightState, sType, rule)
+
+#------------------------------------------------------------------------------
+def _chunkKernel(shmName:str, shape:tuple, dtype:str, tab:dict, rows:np.ndarray, row0:int, sType:str, sAgg:str, rule:str, lo:int, hi:int) -> np.ndarray:
+    """Returns new states of lambdas lo .. hi-1 computed in the process of the pool.
+       State array is read from the shared memory, chunk reads halo of K = len(tab['dLs'])
+       lambdas on both sides. Shared memory is attached once per process.
+    """
+
+    shm = _SHMS.get(shmName)
+
+    if shm is None:
+        for name in list(_SHMS.keys()): _SHMS.pop(name).close()   # Stare bloky uz matica nepouziva
+
+        shm = shared_memory.SharedMemory(name=shmName)
+        _SHMS[shmName] = shm
+
+    S = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    return _rowKernel(S, tab, rows, row0, sType, sAgg, rule, lo, hi)
 
 #==============================================================================
 # InfoFieldMatrix
@@ -27,6 +158,9 @@ class InfoFieldMatrix(InfoData):
     #==========================================================================
     # Static variables & methods
     #--------------------------------------------------------------------------
+    _visiblePrefix = 'IField '   # Only own methods of InfoFieldMatrix are visible in GUI
+    _persistArgs   = ()          # Constructor has no store argument, see InfoData.load()
+    _persistAttrs  = ('l2e', 'phs', 'l2p', 'maxL', 'sType', 'sAgg', 'rule', 'vectorized', 'workers')   # Settings restored after construction
 
     #==========================================================================
     # Constructor & utilities
@@ -37,7 +171,7 @@ class InfoFieldMatrix(InfoData):
         #----------------------------------------------------------------------
         # Super constructor
         #----------------------------------------------------------------------
-        super().__init__(name)
+        super().__init__(name, store='columns')
 
         #----------------------------------------------------------------------
         # Private datove polozky triedy
@@ -67,159 +201,489 @@ class InfoFieldMatrix(InfoData):
                        ,'sum'       # Sucet stavov oboch susedov
                        )            # Podoporovane pravidla agregacie stavov susednych bodov
 
+        self.vectorized = True      # Epoch step is computed by numpy kernel if True and settings allow it
+
+        self.workers    = 0         # Count of processes computing chunks of lambdas in parallel, 0 or 1 for one process
+
+        self._neighKey    = None    # Settings for which the table of the neighbors was computed
+        self._neighTab    = None    # Cached table of the neighbors, see _neighTable()
+        self._pool        = None    # Process pool for parallel epoch steps
+        self._poolWorkers = 0       # Count of workers of the process pool
+        self._shm         = None    # Shared memory block with the column of the states
+        self._shmKey      = None    # Value key of the column in the shared memory
+        self._shmArr      = None    # Column of the states in the shared memory
+        self._shmFin      = None    # Finalizer unlinking the shared memory block
+
         #----------------------------------------------------------------------
         # Inicializacia
         #----------------------------------------------------------------------
         self.setIpType('ipTest')
         self.setSchema({'axes': {'l': 'Lambda', 'e': 'Epoch'}, 'vals': {'s': 'State', 'omg': 'Omega'}})
         self.init(cnts={'l':_LAMBDA, 'e':_EPOCH})
+        self.setRingAxe('e')
 
-        self.applyDataMethod(methodKey='Comp constant (re/im)', valueKey='s', params={'real':0, 'imag':0})
+        self.applyDataMethod(methodKey='Comp constant (re/im)', inKey='s', outKey='s', params={'real':0, 'imag':0, 'all':True}, outData=self)
 
         #----------------------------------------------------------------------
         logger.info(f"{self.name}.constructor: done")
 
-    #--------------------------------------------------------------------------
-    # Method's methods
-    #--------------------------------------------------------------------------
-    def mapSetMethods(self) -> dict:
-        "Returns map of methods setting keyed value to function value for respective parameters"
-
-        methods = super().mapSetMethods()
-
-        methods['IField init Complex'] = {'dataMethod': self.rndComplex,'pointMethod':None, 'params':{'probAbs':0.5, 'phases':_PHASES}, 'paramAsk':'quiet'}
-        methods['IField epoch step'  ] = {'dataMethod': self.epochStep, 'pointMethod':None, 'params':{}                               , 'paramAsk':'ask'  }
-
-        for methodKey in methods.keys():
-            if not methodKey.startswith('IField '): methods[methodKey]['visible'] = False
-
-        return methods
-
     #==========================================================================
     # Data methods to apply in Dynamics methods
     #--------------------------------------------------------------------------
-    def rndBool(self, valueKey:str, params:dict):
+    def rndBool(self, inKey:str, outKey:str, params:dict, outData:'InfoData|None'=None) -> int|None:
         """Clear all model and set state as random Boolean values."""
-        logger.debug(f"{self.name}.rndBool: for key '{valueKey}' with params {params}")
+        logger.debug(f"{self.name}.rndBool: for key '{outKey}' with params {params}")
         pts = 0
 
-        self.clearPoints(defs={valueKey: False})
+        self.setValArray(outKey, np.zeros(len(self.points), dtype=np.bool_))
         self.actSubData( {'e': 0} )
-        pts = self.applyDataMethod(methodKey='Random bit', valueKey=valueKey, params=params)
+        pts = self.applyDataMethod(methodKey='Random bit', inKey=inKey, outKey=outKey, params=params, outData=self)
         self.actSubData()
 
-        logger.info(f"{self.name}.rndBool: {pts} InfoPoints was set to random Boolean values for key '{valueKey}'")
+        logger.info(f"{self.name}.rndBool: {pts} InfoPoints was set to random Boolean values for key '{outKey}'")
+        return pts
 
     #--------------------------------------------------------------------------
-    def rndComplex(self, valueKey:str, params:dict):
+    @dataMethod('IField init Complex', params={'probAbs':0.5, 'phases':_PHASES}, paramAsk='quiet')
+    def rndComplex(self, inKey:str, outKey:str, params:dict, outData:'InfoData|None'=None) -> int|None:
         """Clear all model and set state as random complex values with respective number of discrete phases."""
-        logger.debug(f"{self.name}.rndComplex: for key '{valueKey}' with params {params}")
+        logger.debug(f"{self.name}.rndComplex: for key '{outKey}' with params {params}")
         pts = 0
 
-        self.clearPoints(defs={valueKey: False})
+        self.setValArray(outKey, np.zeros(len(self.points), dtype=np.complex128))
         self.actSubData( {'e': 0} )
         params['phases'] = self.phs
-        pts = self.applyDataMethod(methodKey='Comp discrete phase', valueKey=valueKey, params=params)
+        pts = self.applyDataMethod(methodKey='Comp discrete phase', inKey=inKey, outKey=outKey, params=params, outData=self)
         self.actSubData()
 
-        logger.info(f"{self.name}.rndBool: {pts} InfoPoints was set to random Boolean values for key '{valueKey}'")
+        logger.info(f"{self.name}.rndComplex: {pts} InfoPoints was set to random complex values for key '{outKey}'")
+        return pts
 
     #--------------------------------------------------------------------------
-    def epochStep(self, valueKey:str, params:dict):
-        """Compute next epoch state."""
+    @dataMethod('IField epoch step', paramAsk='ask')
+    def epochStep(self, inKey:str, outKey:str, params:dict, outData:'InfoData|None'=None) -> int|None:
+        """Compute next epoch state.
+           All epochs are moved by one index up and new state of the epoch 0 is computed
+           from the states of the neighbors in previous epochs.
+           If self.vectorized is True, step is computed by numpy kernel for all lambdas at once,
+           otherwise or if settings are not supported by the kernel (l2e < 1 or sAgg 'cnt')
+           by serial computation for each lambda. Both ways give the same results,
+           new states are computed from inKey and written into the epoch 0 of outKey.
+           Returns count of updated InfoPoints.
+        """
 
-        logger.info(f"{self.name}.epochStep: for key '{valueKey}' with params {params}")
-        pts = 0
+        if logOn.info: logger.info(f"{self.name}.epochStep: for key '{inKey}'->'{outKey}' with params {params}")
+
+        pts = self._stepFtion()(inKey, outKey)
+
+        if logOn.info: logger.info(f"{self.name}.epochStep: {pts} InfoPoints was updated for key '{outKey}' in epoch step")
+        return pts
+
+    #--------------------------------------------------------------------------
+    @dataMethod('IField run epochs', params={'steps':_STEPS}, paramAsk='ask')
+    def runEpochs(self, inKey:str, outKey:str, params:dict, outData:'InfoData|None'=None) -> int|None:
+        """Runs params['steps'] epoch steps at once without snapshots, see run().
+           Returns count of updated InfoPoints in the last step.
+        """
+
+        logger.info(f"{self.name}.runEpochs: for key '{inKey}'->'{outKey}' with params {params}")
+
+        stats = self.run(steps=params.get('steps', _STEPS), inKey=inKey, outKey=outKey)
+        if stats is None: return None
+
+        return stats['pts']
+
+    #--------------------------------------------------------------------------
+    def run(self, steps:int, every:int=0, callback=None, keep:int=0, inKey:str='s', outKey:str=None) -> dict|None:
+        """Runs respective count of epoch steps back-to-back on the in-memory states
+           without method dispatch and GUI updates.
+           - every    : every k-th step states of the epoch 0 are taken as snapshot, 0 means no snapshots
+           - callback : is called as callback(step, states) for every snapshot, if it returns False, run stops
+           - keep     : size of preallocated ring buffer of the last snapshots, 0 means no buffer
+           Returns dict with keys
+           - 'steps'      : count of done steps
+           - 'secs'       : duration of the run in seconds
+           - 'stepsPerSec': speed of the run
+           - 'pts'        : count of updated InfoPoints in the last step
+           - 'history'    : last kept snapshots as array [snapshot x lambda] in chronological order or None
+           or None if parameters are not valid.
+        """
+
+        if outKey is None: outKey = inKey
+        logger.info(f"{self.name}.run: {steps} steps for key '{inKey}'->'{outKey}', every={every}, keep={keep}")
+
+        #----------------------------------------------------------------------
+        # Kontrola parametrov
+        #----------------------------------------------------------------------
+        if steps < 0 or every < 0 or keep < 0:
+            logger.error(f"{self.name}.run: steps={steps}, every={every} and keep={keep} must not be negative")
+            return None
+
+        if not self.isInSchema(valKeys=[inKey, outKey]):
+            logger.error(f"{self.name}.run: Value keys '{inKey}', '{outKey}' are not in schema {list(self.getSchemaVals().keys())}")
+            return None
+
+        #----------------------------------------------------------------------
+        # Kruhovy buffer snapshotov a funkcia kroku vybrana raz pre cely beh
+        #----------------------------------------------------------------------
+        if keep > 0 and every > 0: history = np.zeros((keep, self.axeCntByKey('l')), dtype=_STYPES[self.sType])
+        else                     : history = None
+
+        stepFtion = self._stepFtion()
+        snaps     = 0
+        pts       = 0
+        step      = 0
+        start     = time.perf_counter()
+
+        #----------------------------------------------------------------------
+        # Hlavny cyklus bez logovania jednotlivych krokov
+        #----------------------------------------------------------------------
+        while step < steps:
+
+            pts   = stepFtion(inKey, outKey)
+            step += 1
+
+            if every == 0 or step % every != 0: continue
+
+            states = self._epochStates(outKey)
+            if history is not None: history[snaps % keep] = states
+            snaps += 1
+
+            if callback is not None and callback(step, states) is False:
+                logger.info(f"{self.name}.run: Stopped by callback after {step} steps")
+                break
+
+        secs = time.perf_counter() - start
+
+        #----------------------------------------------------------------------
+        # Snapshoty v chronologickom poradi
+        #----------------------------------------------------------------------
+        if history is not None:
+            if snaps < keep: history = history[:snaps]
+            else           : history = np.roll(history, -(snaps % keep), axis=0)
+
+        stats = {'steps'      : step
+                ,'secs'       : secs
+                ,'stepsPerSec': step / secs if secs > 0 else float('inf')
+                ,'pts'        : pts
+                ,'history'    : history
+                }
+
+        logger.info(f"{self.name}.run: {step} steps in {secs:.3f} s, {stats['stepsPerSec']:.1f} steps/s, {snaps} snapshots")
+        return stats
+
+    #--------------------------------------------------------------------------
+    def _stepFtion(self):
+        "Returns method computing one epoch step for actual settings, kernel if possible, serial otherwise"
+
+        if self.vectorized and self.l2e >= 1 and self.sAgg in _KERNEL_AGGS: return self._epochStepKernel
+        return self._epochStepSerial
 
+    #--------------------------------------------------------------------------
+    def _epochStates(self, valueKey:str, e:int=0) -> np.ndarray:
+        "Returns copy of the states of all lambdas in respective epoch as numpy array"
+
+        poss = self._possByAxeIdx(axeKey='e', axeIdx=e)
+        return np.array(self._valsByPoss(valueKey, poss), dtype=_STYPES[self.sType])
+
+    #--------------------------------------------------------------------------
+    def _epochStepKernel(self, inKey:str, outKey:str) -> int:
+        """Computes epoch step by numpy kernel on the state array [epoch x lambda] of inKey.
+           Epochs of all value keys are moved by _shiftEpochs(), new states of the epoch 0
+           are computed from inKey and written only into the epoch 0 of outKey.
+        """
+
+        cntLambda = self.axeCntByKey('l')
+        cntEpoch  = self.axeCntByKey('e')
+
+        self._shiftEpochs()
+
+        #----------------------------------------------------------------------
+        # Stavy inKey ako pole [epoch x lambda] len na citanie, os 'l' je v poziciach najrychlejsia
+        #----------------------------------------------------------------------
+        parallel = self.workers > 1 and self.store == 'columns'
+
+        if parallel: col = self._sharedColumn(inKey)
+        else       : col = self.valArray(inKey)
+
+        S = col.astype(_STYPES[self.sType], copy=False).reshape(cntEpoch, cntLambda)
+
+        #----------------------------------------------------------------------
+        # Riadky S pre epochu 0 a pre susedov podla tabulky susedov
+        #----------------------------------------------------------------------
+        off  = self._ringOffs.get('e', 0)
+        tab  = self._neighTable()
+        row0 = (0 - off) % cntEpoch
+        rows = (tab['rows'] - off) % cntEpoch
+
+        #----------------------------------------------------------------------
+        # Novy stav epochy 0 v jednom procese alebo po chunkoch lambd v poole procesov
+        #----------------------------------------------------------------------
+        if parallel:
+            pool   = self._poolGet()
+            bounds = np.linspace(0, cntLambda, self.workers+1).astype(np.int64).tolist()
+            futs   = [pool.submit(_chunkKernel, self._shm.name, S.shape, S.dtype.str, tab, rows, row0, self.sType, self.sAgg, self.rule, lo, hi)
+                      for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+            states = np.concatenate([fut.result() for fut in futs])
+
+        else:
+            states = _rowKernel(S, tab, rows, row0, self.sType, self.sAgg, self.rule)
+
+        #----------------------------------------------------------------------
+        # Zapisem iba epochu 0 outKey
+        #----------------------------------------------------------------------
+        poss = np.arange(row0 * cntLambda, (row0+1) * cntLambda, dtype=np.int64)
+
+        if self.store == 'columns': self.points.setValArray(outKey, states, poss)
+        else                      : self.setValArray(outKey, states, points=[self.points[pos] for pos in poss.tolist()])
+
+        return cntLambda * cntEpoch
+
+    #--------------------------------------------------------------------------
+    def _shiftEpochs(self):
+        """Moves epochs of all value keys by one index up and clears the epoch 0, the same as
+           moveByAxe('e', 0, 1). Ring axe 'e' only changes its offset, columns are shifted
+           by one slice assignment per value key.
+        """
+
+        if 'e' in self._ringOffs or self.store != 'columns':
+            self.moveByAxe(axeKey='e', deltaIdx=1, startIdx=0)
+            return
+
+        cntLambda = self.axeCntByKey('l')
+        cntEpoch  = self.axeCntByKey('e')
+
+        for valKey in self.getSchemaVals().keys():
+
+            col = self.points.column(valKey)
+            if col is None: continue
+
+            S = col.reshape(cntEpoch, cntLambda)
+            S[1:] = S[:-1]
+
+        self.points.clearRows(np.arange(cntLambda, dtype=np.int64))
+
+    #--------------------------------------------------------------------------
+    def _poolGet(self) -> ProcessPoolExecutor:
+        "Returns process pool for parallel epoch steps, pool is created with the first use or with change of workers"
+
+        if self._pool is not None and self._poolWorkers != self.workers:
+            self._pool.shutdown()
+            self._pool = None
+
+        if self._pool is None:
+            self._pool        = ProcessPoolExecutor(max_workers=self.workers)
+            self._poolWorkers = self.workers
+            logger.info(f"{self.name}._poolGet: Process pool with {self.workers} workers was created")
+
+        return self._pool
+
+    #--------------------------------------------------------------------------
+    def _sharedColumn(self, valueKey:str) -> np.ndarray:
+        """Returns column of the states for respective key in the shared memory.
+           If the column is not in the shared memory yet or its dtype does not match sType,
+           column is copied into new shared memory block and replaces the column in the store.
+        """
+
+        col   = self.points.column(valueKey)
+        dtype = np.dtype(_STYPES[self.sType])
+
+        if col is not None and col is self._shmArr and col.dtype == dtype: return col
+
+        #----------------------------------------------------------------------
+        # Novy blok zdielanej pamate so stavmi typu sType
+        #----------------------------------------------------------------------
+        vals = self.valArray(valueKey).astype(dtype)
+        self._sharedFree()
+
+        self._shm    = shared_memory.SharedMemory(create=True, size=max(vals.nbytes, 1))
+        self._shmFin = weakref.finalize(self, self._shm.unlink)   # Blok sa uvolni aj ked closePool() nebolo volane
+        self._shmArr = np.ndarray(vals.shape, dtype=dtype, buffer=self._shm.buf)
+        self._shmArr[:] = vals
+        self._shmKey    = valueKey
+        self.points.setColumn(valueKey, self._shmArr)
+
+        logger.info(f"{self.name}._sharedColumn: Column '{valueKey}' was moved into shared memory '{self._shm.name}'")
+        return self._shmArr
+
+    #--------------------------------------------------------------------------
+    def _sharedFree(self):
+        "Copies columns from the shared memory back into the store and releases the shared memory"
+
+        if self._shm is None: return
+
+        if self.points.column(self._shmKey) is self._shmArr:
+            self.points.setColumn(self._shmKey, self._shmArr.copy())
+
+        self._shmArr = None
+        self._shmKey = None
+
+        try              : self._shm.close()
+        except BufferError: logger.warning(f"{self.name}._sharedFree: Shared memory '{self._shm.name}' is still referenced")
+
+        self._shmFin.detach()
+        self._shm.unlink()
+        self._shm = None
+
+    #--------------------------------------------------------------------------
+    def closePool(self):
+        "Shuts down process pool of the parallel epoch steps and releases the shared memory"
+
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+        self._sharedFree()
+        logger.info(f"{self.name}.closePool: done")
+
+    #--------------------------------------------------------------------------
+    def _epochStepSerial(self, inKey:str, outKey:str) -> int:
+        "Computes epoch step lambda by lambda, reference implementation of the kernel"
+
+        pts = 0
         self.moveByAxe(axeKey='e', deltaIdx=1, startIdx=0)
 
         for l in range( 0, self.axeCntByKey('l') ):
             actPoint = self.pointByIdxs([l, 0])
-            actState = actPoint.val(valueKey)
+            actState = actPoint.val(inKey)
 
-            leftStates, rightStates = self.getNeighStates(valueKey, l)
+            leftStates, rightStates = self.getNeighStates(inKey, l)
             leftState = self.aggStates(leftStates )
             rightState= self.aggStates(rightStates)
 
             newState = self.aggNeighbors(leftState, actState, rightState)
-            actPoint.set(vals={valueKey: newState})
+            actPoint.set(vals={outKey: newState})
             pts += 1
 
-        logger.info(f"{self.name}.epochStep: {pts} InfoPoints was updated for key '{valueKey}' in epoch step")
+        return pts
 
     #==========================================================================
     # Internal tools
     #--------------------------------------------------------------------------
-    def getNeighStates(self, valueKey:str, l:int, e:int=0):
-        "Returns list of states of neighbor points along given axis at given position"
-
-        logger.debug(f"{self.name}.getNeighStates: For {valueKey} at [{l}, {e}]")
+    def _neighTable(self) -> dict:
+        """Returns table of the neighbors of the point in epoch 0 ordered by distance dL = 1 .. K:
+           - 'dLs'  : distances dL on the axis Lambda
+           - 'rows' : epoch indices dL * l2e of the neighbors (l-dL, dL*l2e) and (l+dL, dL*l2e)
+           - 'rots' : phase rotations of the neighbors as list of python complex numbers
+           K is limited by maxL and by counts of the points in the axes.
+           Table is cached and recomputed only if phs, l2p, l2e, maxL or counts of the points change.
+        """
 
         cntLambda = self.axeCntByKey('l')
         cntEpoch  = self.axeCntByKey('e')
 
-        leftStates  = []
-        rightStates = []
+        key = (self.phs, self.l2p, self.l2e, self.maxL, cntLambda, cntEpoch)
+        if key == self._neighKey: return self._neighTab
 
-        for dL in range(1, self.maxL+1):
+        #----------------------------------------------------------------------
+        # Pocet vzdialenosti dL s existujucimi susedmi
+        #----------------------------------------------------------------------
+        K = min(self.maxL, cntLambda-1)
+        if self.l2e > 0: K = min(K, (cntEpoch-1) // self.l2e)
+        K = max(K, 0)
 
-            eH = e + (dL * self.l2e)
-            if eH >= cntEpoch: break
+        dLs  = np.arange(1, K+1, dtype=np.int64)
+        rows = dLs * self.l2e
 
-            deltaPhase = (2*cmath.pi) / self.phs
-            deltaPhase = deltaPhase * (dL * self.l2p)
-            rot        = cmath.exp( complex(0, deltaPhase) )
+        #----------------------------------------------------------------------
+        # Rotacie pocitane rovnakym vyrazom ako povodne v kazdom kroku
+        #----------------------------------------------------------------------
+        deltaPhase = (2*cmath.pi) / self.phs
+        rots = [cmath.exp( complex(0, deltaPhase * (dL * self.l2p)) ) for dL in dLs.tolist()]
 
-            if (l-dL) > 0:
-                leftPoint = self.pointByIdxs( [l-dL, eH] )
-                leftValue = leftPoint.val(valueKey) * rot
-                leftStates.append( leftValue )
+        self._neighTab = {'dLs'  : dLs
+                         ,'rows' : rows
+                         ,'rots' : rots
+                         }
+        self._neighKey = key
 
-            if (l+dL) < cntLambda:
-                rightPoint = self.pointByIdxs( [l+dL, eH] )
-                rightValue = rightPoint.val(valueKey) * rot
-                rightStates.append( rightValue )
+        logger.info(f"{self.name}._neighTable: computed {K} neighbors' distances for {key}")
+        return self._neighTab
 
-        logger.debug(f"{self.name}.getNeighStates: leftStates={leftStates}, rightStates={rightStates}")
-        return leftStates, rightStates
+    #--------------------------------------------------------------------------
+    def _valsByPoss(self, valueKey:str, poss:np.ndarray) -> list:
+        "Returns values of the points at respective positions as list of python values"
+
+        if self.store == 'columns': return self.points.valArray(valueKey, poss).tolist()
+        return [self.points[pos].val(valueKey) for pos in poss.tolist()]
 
     #--------------------------------------------------------------------------
-    def aggStates(self, states:list):
-        "Aggregates list of states into single state according to given type and aggregation method"
+    def getNeighStates(self, valueKey:str, l:int, e:int=0):
+        """Returns lists of states of left and right neighbor points at given position ordered by distance dL.
+           Complex states are rotated by l2p phases for each step dL on the axis Lambda.
+        """
 
-        logger.debug(f"{self.name}.aggStates: states={states}, sType={self.sType}, sAgg={self.sAgg}")
-        aggState = None
+        if logOn.debug: logger.debug(f"{self.name}.getNeighStates: For {valueKey} at [{l}, {e}]")
 
-        if len(states) == 0:
-            logger.warning(f"{self.name}.aggStates: empty states list, returning None")
-            return aggState
+        cntLambda = self.axeCntByKey('l')
+        cntEpoch  = self.axeCntByKey('e')
+        tab       = self._neighTable()
+
+        #----------------------------------------------------------------------
+        # Pocet susedov v rozsahu epoch a lambd, left plati pre (l-dL) > 0
+        #----------------------------------------------------------------------
+        cnt    = int(np.searchsorted(tab['rows'], cntEpoch - e))
+        cntL   = min(cnt, max(l-1, 0))
+        cntR   = min(cnt, cntLambda-1-l)
+
+        leftPoss  = self._posByIdxs([l - tab['dLs'][:cntL], e + tab['rows'][:cntL]])
+        rightPoss = self._posByIdxs([l + tab['dLs'][:cntR], e + tab['rows'][:cntR]])
 
-        aggState = sum(states)
+        leftStates  = self._valsByPoss(valueKey, leftPoss )
+        rightStates = self._valsByPoss(valueKey, rightPoss)
 
-        if   self.sType == 'bool'   : aggState = bool   (aggState) if aggState else False
-        elif self.sType == 'int'    : aggState = int    (aggState) if aggState else 0
-        elif self.sType == 'complex': aggState = complex(aggState) if aggState else complex(0,0)
+        if self.sType == 'complex':
+            leftStates  = [state * rot for state, rot in zip(leftStates , tab['rots'])]
+            rightStates = [state * rot for state, rot in zip(rightStates, tab['rots'])]
 
-        logger.debug(f"{self.name}.aggStates: {aggState}<-{states}")
+        if logOn.debug: logger.debug(f"{self.name}.getNeighStates: leftStates={leftStates}, rightStates={rightStates}")
+        return leftStates, rightStates
+
+    #--------------------------------------------------------------------------
+    def aggStates(self, states:list):
+        """Aggregates list of states into single state according to given type and aggregation method.
+           Empty list of states aggregates to zero state of the respective type.
+        """
+
+        if logOn.debug: logger.debug(f"{self.name}.aggStates: states={states}, sType={self.sType}, sAgg={self.sAgg}")
+        aggState = 0
+
+        if   len(states) == 0      : aggState = 0
+        elif self.sAgg == 'nearest': aggState = next((state for state in states if state), 0)
+        elif self.sAgg == 'min'    : aggState = min(states, key=_absSq)
+        elif self.sAgg == 'max'    : aggState = max(states, key=_absSq)
+        elif self.sAgg == 'sum'    : aggState = sum(states)
+        elif self.sAgg == 'cnt'    : aggState = Counter(states).most_common(1)[0][0]
+        else: logger.warning(f"{self.name}.aggStates: Unknown aggregation '{self.sAgg}', returning 0")
+
+        if   self.sType == 'bool'   : aggState = bool   (aggState)
+        elif self.sType == 'int'    : aggState = int    (aggState)
+        elif self.sType == 'complex': aggState = complex(aggState)
+
+        if logOn.debug: logger.debug(f"{self.name}.aggStates: {aggState}<-{states}")
         return aggState
 
     #--------------------------------------------------------------------------
     def aggNeighbors(self, leftState, actState, rightState):
         "Aggregates states of neighors into single state according to given rule"
 
-        logger.debug(f"{self.name}.aggNeighbors: leftState={leftState}, actState={actState}, rightState={rightState}, rule={self.rule}")
+        if logOn.debug: logger.debug(f"{self.name}.aggNeighbors: leftState={leftState}, actState={actState}, rightState={rightState}, rule={self.rule}")
         aggState = actState
 
         if self.rule == 'and':
             if (leftState == rightState): aggState = leftState
 
+        elif self.rule == 'xand':
+            if (leftState == rightState): aggState = (not leftState) if self.sType == 'bool' else -leftState
+
         elif self.rule == 'sum':
             if   self.sType == 'bool'            : aggState = bool(leftState or rightState)
             elif self.sType in ('int', 'complex'): aggState = leftState + rightState
 
         else: logger.warning(f"{self.name}.aggNeighbors: Unknown rule '{self.rule}', returning actState")
 
-        logger.debug(f"{self.name}.aggNeighbors: {aggState}<-({leftState},{actState},{rightState})")
+        if logOn.debug: logger.debug(f"{self.name}.aggNeighbors: {aggState}<-({leftState},{actState},{rightState})")
         return aggState
 
     #==========================================================================
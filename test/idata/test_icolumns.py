@@ -0,0 +1,130 @@
+"""Unit tests for InfoColumns module."""
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def grid_pair():
+    """Create the same 3x4 grid with 'points' and 'columns' store."""
+    from idata.idata import InfoData
+
+    datas = []
+    for store in ('points', 'columns'):
+        data = InfoData(name=f"grid_{store}", store=store)
+        data.setIpType('ipGridTest')
+        data.setSchema({'axes': {'x': 'X', 'y': 'Y'}, 'vals': {'s': 'State'}})
+        data.init(cnts=(3, 4))
+        datas.append(data)
+
+    return datas
+
+
+class TestInfoColumnsStore:
+    """Test InfoData with columnar store."""
+
+    def test_unknown_store(self):
+        """Test unknown store is rejected."""
+        from idata.idata import InfoData
+
+        with pytest.raises(ValueError):
+            InfoData(name="bad_store", store='tree')
+
+    def test_positions_equal(self, grid_pair):
+        """Test columnar positions are equal to positions of InfoPoints."""
+        points, columns = grid_pair
+
+        assert len(columns.points) == len(points.points) == 12
+        for pp, cp in zip(points.points, columns.points):
+            assert pp.pos() == cp.pos()
+
+    def test_view_write_through(self, grid_pair):
+        """Test writing through InfoPointView lands in the column."""
+        _, columns = grid_pair
+
+        point = columns.pointByIdxs((1, 2))
+        point.set(vals={'s': 3})
+        point._vals['s'] += 0.5
+
+        assert columns.points.column('s').dtype == np.float64
+        assert columns.pointByIdxs((1, 2)).val('s') == 3.5
+
+    def test_upcast_complex(self, grid_pair):
+        """Test column is upcasted when complex value is written."""
+        _, columns = grid_pair
+
+        columns.points[0].set(vals={'s': 1})
+        columns.points[1].set(vals={'s': 1j})
+
+        assert columns.points.column('s').dtype == np.complex128
+        assert columns.points[0].val('s') == 1
+
+    def test_actsubdata_and_array(self, grid_pair):
+        """Test active subdata and array are equal for both stores."""
+        for data in grid_pair:
+            data.setValArray('s', np.arange(12))
+            data.actVal = 's'
+            data.actSubData({'y': 2})
+
+            assert [p.val('s') for p in data.actList] == [6, 7, 8]
+            assert np.asarray(data).tolist() == [6, 7, 8]
+
+    def test_copy(self, grid_pair):
+        """Test copy does not share values with the original."""
+        for data in grid_pair:
+            data.setValArray('s', np.arange(12))
+            other = data.copy(f"{data.name}_copy")
+            other.points[5].set(vals={'s': -1})
+
+            assert data.points[5].val('s') == 5
+            assert other.points[5].val('s') == -1
+            assert other.store == data.store
+
+    def test_batch_method(self, grid_pair):
+        """Test applyDataMethod uses batch method for both stores."""
+        for data in grid_pair:
+            data.actSubData({'x': 1})
+            pts = data.applyDataMethod('Real constant', inKey='s', outKey='s', params={'const': 2.5}, outData=data)
+
+            assert pts == 4
+            assert [p.val('s') for p in data.points if p.pos('x') == 1] == [2.5] * 4
+            assert data.pointByIdxs((0, 0)).val('s') in (None, 0)
+
+
+class TestInfoColumnsLazyGrid:
+    """Test lazy positions of the regular grid in columnar store."""
+
+    def test_positions_not_stored(self, grid_pair):
+        """Test init of columnar store keeps only the grid definition."""
+        columns = grid_pair[1]
+
+        assert columns.points._pos is None
+        assert columns.points.nbytes() == 0
+
+    def test_pos_array_equal(self, grid_pair):
+        """Test lazy positions in bulk are equal to positions of InfoPoints."""
+        points, columns = grid_pair
+
+        for axe in ('x', 'y'):
+            expected = [p.pos(axe) for p in points.points]
+            assert columns.points.posArray(axe).tolist() == expected
+            assert columns.points.posArray(axe, [5, 0]).tolist() == [expected[5], expected[0]]
+
+    def test_set_pos_materializes(self, grid_pair):
+        """Test writing a position stores positions of all rows."""
+        columns = grid_pair[1]
+        before  = columns.points.posArray('y').tolist()
+
+        columns.points[7].set(pos={'y': 9.5})
+
+        assert columns.points._pos is not None
+        assert columns.points[7].pos('y') == 9.5
+        assert columns.points.posArray('y').tolist() == before[:7] + [9.5] + before[8:]
+
+    def test_copy_keeps_grid(self, grid_pair):
+        """Test copy of lazy columnar data keeps equal positions."""
+        columns = grid_pair[1]
+        other   = columns.copy("grid_copy")
+
+        assert other.points._pos is None
+        assert [p.pos() for p in other.points] == [p.pos() for p in columns.points]
@@ -148,3 +148,324 @@ class TestInfoDataEdgeCases:
         special_name = "data-#$%@!_test"
         data = InfoData(name=special_name)
         assert data.name == special_name
+
+
+class TestInfoDataActSubData:
+    """Test active subdata computed as lattice of positions."""
+
+    @pytest.fixture
+    def grid3d(self):
+        """Create 3x4x5 InfoData grid."""
+        from idata.idata import InfoData
+
+        data = InfoData(name="grid3d")
+        data.setIpType('ipGrid3DTest')
+        data.setSchema({'axes': {'x': 'X', 'y': 'Y', 'z': 'Z'}, 'vals': {'s': 'State'}})
+        data.init(cnts=(3, 4, 5))
+        return data
+
+    def test_lattice_ordered(self, grid3d):
+        """Test lattice positions are ordered and match indices of the points."""
+        for subIdxs in ({'y': 2}, {'x': 1, 'z': 4}, {'x': 2, 'z': None}, {}):
+            poss = grid3d._latticePoss(subIdxs).tolist()
+
+            assert poss == sorted(poss)
+            for pos in poss:
+                idxs = grid3d._idxsByPos(pos)
+                for axe, axeIdx in subIdxs.items():
+                    if axeIdx is not None:
+                        assert idxs[grid3d.axeIdxByKey(axe)] == axeIdx
+
+    def test_actsubdata_cached(self, grid3d):
+        """Test switching back to previous cut returns cached list."""
+        first = grid3d.actSubData({'z': 1})
+        grid3d.actSubData({'z': 2})
+        again = grid3d.actSubData({'z': 1})
+
+        assert again is first
+        assert len(again) == 12
+
+    def test_cache_reset_by_init(self, grid3d):
+        """Test init() invalidates cached active subdata."""
+        first = grid3d.actSubData({'z': 1})
+        grid3d.init(cnts=(2, 2, 2))
+
+        assert len(grid3d.actSubData({'z': 1})) == 4
+        assert grid3d.actList is not first
+
+
+class TestInfoDataRingAxe:
+    """Test ring axes moved by offset instead of copying of the data."""
+
+    def _grid(self, name, ring):
+        """Create 4x5 columns grid with values equal to positions, optionally with ring axe 'e'."""
+        import numpy as np
+        from idata.idata import InfoData
+
+        data = InfoData(name=name, store='columns')
+        data.setIpType('ipRingTest')
+        data.setSchema({'axes': {'l': 'Lambda', 'e': 'Epoch'}, 'vals': {'s': 'State'}})
+        data.init(cnts=(4, 5), rects=(6.0, 8.0))
+        data.setValArray('s', np.arange(20.0) + 1)
+        if ring: data.setRingAxe('e')
+        return data
+
+    def _logical(self, data):
+        """Values and positions in the order of logical positions."""
+        points = data.actSubData()
+        return data.valArray('s', points).tolist(), data.posArray('e', points).tolist()
+
+    @pytest.mark.parametrize("deltas", [[1], [2, 1], [-1], [1, -3], [7]])
+    def test_move_equals_physical(self, deltas):
+        """Test moving of the ring axe gives the same data as physical moving."""
+        ring = self._grid('ring', True)
+        phys = self._grid('phys', False)
+
+        for delta in deltas:
+            ring.moveByAxe(axeKey='e', startIdx=0, deltaIdx=delta)
+            phys.moveByAxe(axeKey='e', startIdx=0, deltaIdx=delta)
+
+        assert self._logical(ring) == self._logical(phys)
+
+    def test_indices_honour_offset(self):
+        """Test index and position translations honour offset of the ring axe."""
+        ring = self._grid('ring', True)
+        ring.moveByAxe(axeKey='e', startIdx=0, deltaIdx=2)
+
+        for pos in range(20):
+            assert ring._posByIdxs(ring._idxsByPos(pos)) == pos
+
+        point = ring.pointByIdxs([3, 4])
+        assert point.val('s') == 12.0
+        assert point.pos('e') == 8.0
+
+    def test_actsubdata_refreshed(self):
+        """Test active subdata is refreshed after the move of the ring axe."""
+        ring  = self._grid('ring', True)
+        first = ring.actSubData({'e': 1})
+        ring.moveByAxe(axeKey='e', startIdx=0, deltaIdx=1)
+
+        assert ring.valArray('s', ring.actSubData({'e': 1})).tolist() == [1.0, 2.0, 3.0, 4.0]
+        assert ring.actList is not first
+
+    def test_ring_removed(self):
+        """Test removing of the ring mode reorders data physically."""
+        import numpy as np
+
+        ring = self._grid('ring', True)
+        ring.moveByAxe(axeKey='e', startIdx=0, deltaIdx=3)
+        logical = self._logical(ring)
+
+        assert ring.setRingAxe('e', False)
+        assert ring.valArray('s').tolist() == logical[0]
+        assert np.allclose(ring.posArray('e'), logical[1])
+
+    def test_points_store_denied(self, idata_instance):
+        """Test ring axes are not supported for 'points' store."""
+        idata_instance.setIpType('ipRingTest')
+        idata_instance.init(cnts=(4, 5))
+
+        assert not idata_instance.setRingAxe('e')
+
+
+class TestInfoDataAsArray:
+    """Test N-D array access to the values of InfoData."""
+
+    def _grid(self, store):
+        """Create 3x4 grid with values equal to positions."""
+        import numpy as np
+        from idata.idata import InfoData
+
+        data = InfoData(name=f"arr_{store}", store=store)
+        data.setIpType('ipArrTest')
+        data.setSchema({'axes': {'x': 'X', 'y': 'Y'}, 'vals': {'s': 'State'}})
+        data.init(cnts=(3, 4))
+        data.setValArray('s', np.arange(12.0))
+        return data
+
+    @pytest.mark.parametrize("store", ['points', 'columns'])
+    def test_shape_and_values(self, store):
+        """Test array axis i is the i-th axe of the schema."""
+        data = self._grid(store)
+        arr  = data.asArray('s')
+
+        assert arr.shape == (3, 4)
+        assert arr[2, 1] == data.pointByIdxs((2, 1)).val('s')
+        assert data.asArray('s', {'y': 2}).tolist() == [6.0, 7.0, 8.0]
+        assert data.asArray('s', {'x': 1}).tolist() == [1.0, 4.0, 7.0, 10.0]
+
+    def test_columns_view(self):
+        """Test columns store returns view without copying."""
+        import numpy as np
+
+        data = self._grid('columns')
+        arr  = data.asArray('s', {'y': 1})
+
+        assert np.shares_memory(arr, data.points.column('s'))
+        arr[0] = -1.0
+        assert data.pointByIdxs((0, 1)).val('s') == -1.0
+
+    def test_ring_offset(self):
+        """Test ring axe with offset is returned in logical order."""
+        data = self._grid('columns')
+        data.setRingAxe('y')
+        data.moveByAxe(axeKey='y', startIdx=0, deltaIdx=1)
+
+        arr = data.asArray('s')
+        for x in range(3):
+            for y in range(4):
+                assert arr[x, y] == data.pointByIdxs((x, y)).val('s')
+
+        assert data.asArray('s', {'y': 2}).tolist() == [p.val('s') for p in data.actSubData({'y': 2})]
+
+    def test_dunder_array(self):
+        """Test __array__ uses actVal, active subdata and dtype."""
+        import numpy as np
+
+        data = self._grid('columns')
+        data.actVal = 's'
+        data.actSubData({'x': 2})
+
+        assert np.asarray(data, dtype=np.int64).tolist() == [2, 5, 8, 11]
+
+    def test_invalid(self):
+        """Test invalid value key or index returns None."""
+        data = self._grid('points')
+
+        assert data.asArray() is None
+        assert data.asArray('s', {'x': 3}) is None
+
+
+class TestLogLevels:
+    """Test cached level flags of the package logger."""
+
+    def test_flags_follow_set_level(self):
+        """Test flags are refreshed by setLevel of the logger."""
+        from idata import logger, logOn
+
+        level = logger.level
+        try:
+            logger.setLevel('DEBUG')
+            assert logOn.debug and logOn.info
+
+            logger.setLevel('ERROR')
+            assert not logOn.debug and not logOn.info and not logOn.warning
+        finally:
+            logger.setLevel(level)
+
+
+class TestInfoDataMethodRegistry:
+    """Test registry of the set methods built once per class."""
+
+    def _subclass(self):
+        """Create subclass of InfoData with one registered data method."""
+        from idata.idata import InfoData, dataMethod
+
+        class IRegTest(InfoData):
+            _visiblePrefix = 'Reg '
+
+            @dataMethod('Reg double', params={'factor': 2}, outKey='d')
+            def double(self, inKey, outKey, params, outData=None):
+                vals = self.valArray(inKey) * params['factor']
+                return self.setValArray(outKey, vals)
+
+        return IRegTest
+
+    def test_registry_built_once(self):
+        """Test registry and bound map are cached per class and per instance."""
+        from idata.idata import InfoData
+
+        data = InfoData(name="reg_once")
+        assert InfoData._methodRegistry() is InfoData._methodRegistry()
+        assert data.mapSetMethods() is data.mapSetMethods()
+        assert data.methodDef('Move data')['dataMethod'] == data.moveData
+
+    def test_subclass_registration(self):
+        """Test registered method of the subclass with metadata and visibility."""
+        cls  = self._subclass()
+        data = cls(name="reg_sub")
+
+        method = data.methodDef('Reg double')
+        assert method['dataMethod'] == data.double
+        assert method['params'] == {'factor': 2}
+        assert method['outKey'] == 'd'
+        assert data.visibleMethodKeys() == ['Reg double']
+        assert 'Move data' in data.mapSetMethods()
+
+    def test_apply_registered(self):
+        """Test applyDataMethod calls registered method of the subclass."""
+        import numpy as np
+
+        data = self._subclass()(name="reg_apply")
+        data.setIpType('ipRegTest')
+        data.setSchema({'axes': {'x': 'X'}, 'vals': {'s': 'State', 'd': 'Double'}})
+        data.init(cnts=(3,))
+        data.setValArray('s', np.arange(3.0))
+
+        assert data.applyDataMethod('Reg double', inKey='s', outKey='d', params={'factor': 3}, outData=data) == 3
+        assert data.valArray('d').tolist() == [0.0, 3.0, 6.0]
+        assert data.applyDataMethod('Unknown', inKey='s', outKey='d', params={}, outData=data) is None
+
+
+class TestInfoDataPersistence:
+    """Test save and load of InfoData."""
+
+    def test_points_roundtrip(self, tmp_path):
+        """Test points store with complex values and 1-axe positions is restored."""
+        import numpy as np
+        from idata.idata import InfoData
+
+        data = InfoData("persistPoints", store="compact")
+        data.setIpType("ipPersistPoints")
+        data.setSchema({'axes': {'x': 'X'}, 'vals': {'a': 'A', 'c': 'C'}})
+        data.init(cnts=(0,))
+        for val in [3.0, 1.0, 7.0]: data.initAdd(val)
+        data.setValArray('c', np.array([1+2j, 3j, -1]))
+        data.actVal = 'c'
+
+        assert data.save(str(tmp_path / "points")) is True
+
+        loaded = InfoData.load(str(tmp_path / "points"), name="persistPointsLoaded")
+
+        assert type(loaded) is InfoData
+        assert loaded.store  == 'compact'
+        assert loaded.actVal == 'c'
+        assert loaded._cnts  == {'x': 3}
+        assert loaded.posArray('x').tolist() == [1.0, 3.0, 7.0]
+        assert np.array_equal(loaded.valArray('c'), data.valArray('c'))
+        assert loaded.pointByAxeVal(7.0).val('c') == -1
+
+    def test_columns_mmap(self, tmp_path):
+        """Test columns store with ring axe is memory mapped and writes do not change the file."""
+        import numpy as np
+        from idata.idata import InfoData
+
+        data = InfoData("persistColumns", store="columns")
+        data.setIpType("ipPersistColumns")
+        data.setSchema({'axes': {'x': 'X', 'y': 'Y'}, 'vals': {'v': 'V'}})
+        data.init(cnts=(4, 3), rects=(6, 2))
+        data.setRingAxe('y')
+        data.setValArray('v', np.arange(12) * 1j)
+        data.moveByAxe('y', 0, 1)
+
+        path = str(tmp_path / "columns")
+        data.save(path)
+
+        loaded = InfoData.load(path, name="persistColumnsLoaded")
+
+        assert isinstance(loaded.points.column('v'), np.memmap)
+        assert loaded.points.positions() is None
+        assert loaded._ringOffs == {'y': 1}
+        assert np.array_equal(loaded.asArray('v'), data.asArray('v'))
+        assert np.array_equal(loaded.posArray('y'), data.posArray('y'))
+
+        loaded.points.column('v')[:] = 0
+        again = InfoData.load(path, name="persistColumnsAgain", mmap=False)
+
+        assert np.array_equal(again.asArray('v'), data.asArray('v'))
+
+    def test_load_errors(self, tmp_path):
+        """Test loading of missing data returns None."""
+        from idata.idata import InfoData
+
+        assert InfoData.load(str(tmp_path / "missing")) is None
@@ -264,3 +264,363 @@ class TestIMarkovEdgeCases:
         assert mrk.dim == 10
         mrk.observe(1)
         assert mrk.totObs == 1
+
+
+class TestIMarkovIndex:
+    """Test index of points by observed value."""
+
+    def test_points_sorted_and_indexed(self):
+        """Test points stay sorted and are found by index for unordered observations."""
+        from idata.imarkov import IMarkov
+
+        mrk = IMarkov(name="test", dim=1)
+        for val in [5, -2, 9, 0, 5, 3, -2]:
+            mrk.observe(val)
+
+        poss = [point.pos('x') for point in mrk.points]
+        assert poss == [-2, 0, 3, 5, 9]
+
+        for idx, val in enumerate(poss):
+            assert mrk._idxByAxeVal('x', val) == idx
+            assert mrk._getPoint(val, create=False) is mrk.points[idx]
+
+        assert mrk._getPoint(7, create=False) is None
+        assert mrk._idxByAxeVal('x', 7) is None
+        assert mrk.initAdd(3) is None
+
+
+class TestIMarkovTableBackend:
+    """Test backend 'table' with flat count tables."""
+
+    def test_unknown_backend(self):
+        """Test unknown backend is rejected."""
+        from idata.imarkov import IMarkov
+
+        with pytest.raises(ValueError):
+            IMarkov(name="test", dim=2, backend="trie")
+
+    def test_table_equals_points(self):
+        """Test backend 'table' gives the same results as backend 'points'."""
+        from idata.imarkov import IMarkov
+
+        seq = [1, 2, 1, 3, 1, 2, 2, 1, 3, 3, 1, 2, 1, 1, 2, 3]
+
+        for dim in [1, 2, 3]:
+            pts = IMarkov(name="pts", dim=dim)
+            tbl = IMarkov(name="tbl", dim=dim, backend="table")
+
+            for val in seq:
+                assert tbl.observe(val) == pytest.approx(pts.observe(val))
+
+            pts._probActualise()
+            tbl._probActualise()
+
+            assert tbl.totObs     == pts.totObs
+            assert tbl.eqProb     == pts.eqProb
+            assert tbl.actAddress() == pts.actAddress()
+            assert len(tbl.points) == 0
+
+            gPts = pts.maxGain(minGain=0, minObs=0)
+            gTbl = tbl.maxGain(minGain=0, minObs=0)
+
+            assert list(gTbl.keys()) == list(gPts.keys())
+            for pattern, res in gPts.items():
+                assert gTbl[pattern] == pytest.approx(res)
+
+
+class TestIMarkovObserveMany:
+    """Test batch observation of whole sequences."""
+
+    @pytest.mark.parametrize("backend", ["points", "table"])
+    def test_observe_many_equals_loop(self, backend):
+        """Test observeMany gives the same counts as observe in a loop, also with history."""
+        import numpy as np
+        from idata.imarkov import IMarkov
+
+        seq = np.random.default_rng(3).integers(0, 4, 200)
+
+        for dim in [1, 2, 3]:
+            for split in [0, 1, 100]:
+                loop  = IMarkov(name="loop",  dim=dim, backend=backend)
+                batch = IMarkov(name="batch", dim=dim, backend=backend)
+
+                for val in seq.tolist(): res = loop.observe(val)
+                loop._probActualise()
+
+                for val in seq[:split].tolist(): batch.observe(val)
+                assert batch.observeMany(seq[split:]) == pytest.approx(res)
+
+                assert batch.totObs  == loop.totObs
+                assert batch.actVals == loop.actVals
+
+                gLoop  = loop.maxGain(minGain=0, minObs=0)
+                gBatch = batch.maxGain(minGain=0, minObs=0)
+
+                assert list(gBatch.keys()) == list(gLoop.keys())
+                for pattern, res in gLoop.items():
+                    assert gBatch[pattern] == pytest.approx(res)
+
+    def test_observe_many_bytes(self):
+        """Test observeMany accepts bytes object."""
+        from idata.imarkov import IMarkov
+
+        mrk = IMarkov(name="test", dim=2, backend="table")
+        mrk.observeMany(b"abab")
+
+        assert mrk.totObs == 4
+        assert mrk.maxGain(minGain=0, minObs=0)[(97, 98)]['obs'] == 2
+
+    @pytest.mark.parametrize("backend", ["points", "table"])
+    @pytest.mark.parametrize("hist, vals", [([1.5, 2.5], [3, 4]), ([300], b"\x01\x02")])
+    def test_observe_many_history_dtype(self, backend, hist, vals):
+        """Test history of other dtype than the batch is not truncated nor overflows."""
+        import numpy as np
+        from idata.imarkov import IMarkov
+
+        loop  = IMarkov(name="loop",  dim=2, backend=backend)
+        batch = IMarkov(name="batch", dim=2, backend=backend)
+
+        for val in hist + list(vals): loop.observe(val)
+        loop._probActualise()
+
+        for val in hist: batch.observe(val)
+        batch.observeMany(vals if isinstance(vals, bytes) else np.array(vals))
+
+        gLoop  = loop.maxGain(minGain=0, minObs=0)
+        gBatch = batch.maxGain(minGain=0, minObs=0)
+
+        assert list(gBatch.keys()) == list(gLoop.keys())
+        for pattern, res in gLoop.items():
+            assert gBatch[pattern] == pytest.approx(res)
+
+
+class TestIMarkovObserveStream:
+    """Test streaming observation in chunks."""
+
+    def test_stream_file_equals_batch(self, tmp_path):
+        """Test chunked file stream gives the same counts as batch of the whole data."""
+        import numpy as np
+        from idata.imarkov import IMarkov
+
+        data = np.random.default_rng(5).integers(0, 5, 1000).astype(np.uint8).tobytes()
+        path = tmp_path / "stream.bin"
+        path.write_bytes(data)
+
+        batch = IMarkov(name="batch", dim=3, backend="table")
+        res   = batch.observeMany(data)
+
+        progress = []
+        stream   = IMarkov(name="stream", dim=3, backend="table")
+
+        assert stream.observeStream(path, chunkSize=97, callback=lambda prg: progress.append(dict(prg))) == pytest.approx(res)
+        assert stream.maxGain(minGain=0, minObs=0) == batch.maxGain(minGain=0, minObs=0)
+
+        assert len(progress) == 11
+        assert progress[-1]['symbols'] == 1000
+        assert progress[-1]['totObs' ] == 1000
+
+    def test_stream_iterator_of_values(self):
+        """Test stream of single values keeps context across chunks."""
+        from idata.imarkov import IMarkov
+
+        seq  = [1, 2, 3, 1, 2, 3, 1, 2]
+        loop = IMarkov(name="loop", dim=2)
+        for val in seq: loop.observe(val)
+        loop._probActualise()
+
+        stream = IMarkov(name="stream", dim=2)
+        stream.observeStream(iter(seq), chunkSize=3)
+
+        assert stream.actVals == loop.actVals
+        assert stream.maxGain(minGain=0, minObs=0) == loop.maxGain(minGain=0, minObs=0)
+
+
+class TestIMarkovEntropy:
+    """Test incrementally maintained entropy."""
+
+    @pytest.mark.parametrize("backend", ["points", "table"])
+    def test_entropy_equals_direct(self, backend):
+        """Test entropy per depth equals Shannon entropy computed from all counts."""
+        from idata.imarkov import IMarkov
+
+        mrk = IMarkov(name="test", dim=2, backend=backend)
+        for val in [1, 2, 1, 3, 1, 2, 2, 1, 3, 3, 1, 2]:
+            mrk.observe(val)
+
+        patterns = mrk.maxGain(minGain=0, minObs=0)
+
+        for depth in [1, 2]:
+            cnts  = [res['obs'] for pattern, res in patterns.items() if len(pattern) == depth]
+            total = sum(cnts)
+            bits  = -sum(c / total * math.log2(c / total) for c in cnts)
+
+            assert mrk.entropy(depth) == pytest.approx(bits)
+
+        assert mrk.bits == pytest.approx(mrk.entropy(1))
+        assert mrk.condEntropy(1) == pytest.approx(mrk.entropy(1))
+        assert mrk.entropyGain(2) == pytest.approx(mrk.condEntropy(1) - mrk.condEntropy(2))
+
+    def test_entropy_reset(self, imarkov_instance):
+        """Test entropy is zero after single value and after reset."""
+        imarkov_instance.observe(1)
+        imarkov_instance.observe(1)
+        assert imarkov_instance.bits == 0.0
+
+        imarkov_instance.observe(2)
+        assert imarkov_instance.bits == pytest.approx(0.9183, abs=1e-4)
+
+        imarkov_instance.reset()
+        assert imarkov_instance.bits == 0.0
+
+
+class TestIMarkovTopK:
+    """Test top-K search of patterns with maximum gain."""
+
+    @pytest.mark.parametrize("backend", ["points", "table"])
+    def test_topk_equals_full_sort(self, backend):
+        """Test top-K patterns equal first K patterns of full sorted result."""
+        import numpy as np
+        from idata.imarkov import IMarkov
+
+        mrk = IMarkov(name="test", dim=3, backend=backend)
+        mrk.observeMany(np.random.default_rng(7).integers(0, 4, 500))
+
+        full = list(mrk.maxGain(minGain=0, minObs=3).items())
+        topK = list(mrk.maxGain(minGain=0, minObs=3, maxPatterns=10).items())
+
+        assert topK == full[:10]
+        assert all(res['obs'] >= 3 for pattern, res in full)
+
+    def test_pruned_subtree(self):
+        """Test extensions of rare pattern are not returned."""
+        from idata.imarkov import IMarkov
+
+        mrk = IMarkov(name="test", dim=2, backend="table")
+        mrk.observeMany([1, 1, 1, 1, 2, 1, 1, 1])
+
+        patterns = mrk.maxGain(minGain=0, minObs=2)
+
+        assert (2,) not in patterns
+        assert all(pattern[0] != 2 for pattern in patterns)
+        assert (1, 1) in patterns
+
+    def test_table_walk_order(self):
+        """Test depth first walk of the table yields contexts in lexicographic order and skips pruned subtrees."""
+        import numpy as np
+        from idata.imarkov import IMarkov
+
+        mrk = IMarkov(name="test", dim=3, backend="table")
+        mrk.observeMany(np.random.default_rng(5).integers(0, 5, 400))
+        mrk.maxGain(minGain=0, minObs=0)   # Index of the next values is built here and updated by next observations
+        mrk.observe(7)
+
+        for minObs in [0, 3, 20]:
+            ctxs = [ctx for ctx, obs, pro, pgn in mrk._tableItems(minObs=minObs)]
+            ref  = [ctx for ctx in sorted(mrk._obs) if all(mrk._obs[ctx[:i]] >= minObs for i in range(1, len(ctx)+1))]
+
+            assert ctxs == ref
+
+        assert list(mrk._tableItems(minObs=mrk.totObs + 1)) == []
+
+
+class TestIMarkovGenerate:
+    """Test generating values from the Markov analyser."""
+
+    @pytest.mark.parametrize("backend", ["points", "table"])
+    def test_generate_deterministic_chain(self, backend):
+        """Test generated sequence follows deterministic cycle."""
+        from idata.imarkov import IMarkov
+
+        mrk = IMarkov(name="test", dim=2, backend=backend)
+        mrk.observeMany([0, 1, 2] * 20)
+
+        assert mrk.generateMany(9).tolist() == [0, 1, 2] * 3
+        assert mrk.totObs == 60
+
+    @pytest.mark.parametrize("backend", ["points", "table"])
+    def test_generate_cache_invalidated(self, backend):
+        """Test cached distribution is invalidated by new observation of the context."""
+        from idata.imarkov import IMarkov
+
+        mrk = IMarkov(name="test", dim=1, backend=backend)
+        mrk.observe(5)
+        assert mrk.generate() == 5
+
+        for i in range(100): mrk.observe(7)
+        assert 7 in mrk.generateMany(50).tolist()
+
+    def test_generate_observe(self):
+        """Test generated values are observed and empty analyser generates None."""
+        from idata.imarkov import IMarkov
+
+        mrk = IMarkov(name="test", dim=2)
+        assert mrk.generate() is None
+
+        mrk.observeMany([1, 2, 1, 2])
+        vals = mrk.generateMany(10, observe=True)
+
+        assert len(vals) == 10
+        assert mrk.totObs == 14
+        assert mrk.actVals[-1] == vals[-1]
+
+
+class TestIMarkovCompactStore:
+    """Test IMarkov with compact points store."""
+
+    def test_compact_equals_points(self):
+        """Test store 'compact' gives the same results as store 'points'."""
+        from idata.imarkov import IMarkov
+        from idata.ipoint import InfoPointCompact
+
+        seq = [1, 2, 1, 3, 1, 2, 2, 1, 3, 3, 1, 2, 1, 1, 2, 3]
+
+        pts = IMarkov(name="pts", dim=2)
+        cmp = IMarkov(name="cmp", dim=2, store="compact")
+
+        for val in seq:
+            assert cmp.observe(val) == pytest.approx(pts.observe(val))
+
+        assert cmp.store == 'compact'
+        assert all(type(point) is InfoPointCompact for point in cmp.points)
+        assert len(cmp.points) == len(pts.points)
+
+        gPts = pts.maxGain(minGain=0, minObs=0)
+        gCmp = cmp.maxGain(minGain=0, minObs=0)
+
+        assert list(gCmp.keys()) == list(gPts.keys())
+        for pattern, res in gPts.items():
+            assert gCmp[pattern] == pytest.approx(res)
+
+
+class TestIMarkovPersistence:
+    """Test save and load of IMarkov."""
+
+    @pytest.mark.parametrize("backend", ["points", "table"])
+    def test_roundtrip(self, tmp_path, backend):
+        """Test loaded IMarkov has the same counts, entropy and continues the same way."""
+        from idata.idata import InfoData
+        from idata.imarkov import IMarkov
+
+        seq = [1, 2, 1, 3, 1, 2, 2, 1, 3, 3, 1, 2, 1, 1, 2, 3]
+
+        mrk = IMarkov(name="persistMrk" + backend, dim=3, backend=backend)
+        mrk.observeMany(seq)
+        mrk.save(str(tmp_path / "mrk"))
+
+        loaded = InfoData.load(str(tmp_path / "mrk"), name="persistMrkLoaded" + backend)
+
+        assert type(loaded) is IMarkov
+        assert loaded.backend == backend
+        assert loaded.dim     == 3
+        assert loaded.totObs  == mrk.totObs
+        assert loaded.actVals == mrk.actVals
+        assert loaded.entropy(3) == pytest.approx(mrk.entropy(3))
+
+        gMrk = mrk.maxGain(minGain=0, minObs=0)
+        gLoaded = loaded.maxGain(minGain=0, minObs=0)
+
+        assert list(gLoaded.keys()) == list(gMrk.keys())
+        for pattern, res in gMrk.items():
+            assert gLoaded[pattern] == pytest.approx(res)
+
+        assert loaded.observe(2) == pytest.approx(mrk.observe(2))
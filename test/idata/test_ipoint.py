@@ -95,3 +95,113 @@ class TestIPointEdgeCases:
 
         point = InfoPoint(ipType='ipReal', pos={'x': 3.14159})
         assert abs(point.pos('x') - 3.14159) < 0.001
+
+
+class TestIPointBatchMethods:
+    """Test batch versions of the InfoPoint set methods."""
+
+    def test_batch_methods_declared(self):
+        """Test every set method except nullMethod declares batch method."""
+        from idata.ipoint import InfoPoint
+
+        for key, method in InfoPoint.mapSetMethods().items():
+            if method['pointMethod'] is InfoPoint.nullMethod: continue
+            assert callable(method['batchMethod']), key
+
+    def test_batch_ranges(self):
+        """Test batch random methods respect ranges."""
+        import numpy as np
+        from idata.ipoint import InfoPoint
+
+        points = [None] * 1000
+
+        vals = InfoPoint.intRandUniBatch(points, inKey='v', outKey='v', params={'min': 2, 'max': 4})
+        assert vals.min() >= 2 and vals.max() <= 4
+
+        vals = InfoPoint.cmpDiscPhasesBatch(points, inKey='v', outKey='v', params={'probAbs': 1, 'phases': 2})
+        assert np.allclose(np.abs(vals), 1)
+        assert np.allclose(vals.imag, 0)
+
+
+class TestIPointSchemaLookup:
+    """Test lookup tables of the schema."""
+
+    def test_lookup_follows_schema(self):
+        """Test lookups are refreshed by every change of the schema."""
+        from idata.ipoint import InfoPoint
+
+        InfoPoint.setSchema('ipLookupTest', {'axes': {'x': 'X', 'y': 'Y'}, 'vals': {'a': 'A', 'b': 'B'}})
+
+        assert InfoPoint.axeIdxByKey('ipLookupTest', 'y') == 1
+        assert InfoPoint.valKeyByIdx('ipLookupTest', 1) == 'b'
+        assert InfoPoint.axeKeyByName('ipLookupTest', 'X') == 'x'
+
+        InfoPoint.setSchemaVal('ipLookupTest', 'c', 'C')
+        InfoPoint.delSchemaVal('ipLookupTest', 'a')
+        InfoPoint.setSchemaAxe('ipLookupTest', 'y', 'Ypsilon')
+
+        assert InfoPoint.valIdxByKey('ipLookupTest', 'c') == 1
+        assert InfoPoint.valIdxByKey('ipLookupTest', 'a') is None
+        assert InfoPoint.valKeyByName('ipLookupTest', 'C') == 'c'
+        assert InfoPoint.axeKeyByName('ipLookupTest', 'Ypsilon') == 'y'
+        assert InfoPoint.axeKeyByName('ipLookupTest', 'Y') is None
+
+    def test_set_by_tuple(self):
+        """Test set with tuples maps values to keys in the schema order."""
+        from idata.ipoint import InfoPoint
+
+        InfoPoint.setSchema('ipLookupSet', {'axes': {'x': 'X', 'y': 'Y'}, 'vals': {'a': 'A', 'b': 'B'}})
+        point = InfoPoint('ipLookupSet')
+        point.set(pos=(1.0, 2.0, 3.0), vals=[5])
+
+        assert point.pos() == {'x': 1.0, 'y': 2.0}
+        assert point.val('a') == 5
+
+
+class TestIPointCompact:
+    """Test compact InfoPoint aligned to the schema."""
+
+    def test_compact_no_dict(self):
+        """Test compact point has no instance dict and returns dicts on demand."""
+        from idata.ipoint import InfoPoint, InfoPointCompact
+
+        InfoPoint.setSchema('ipCompact', {'axes': {'x': 'X', 'y': 'Y'}, 'vals': {'a': 'A', 'b': 'B'}})
+        point = InfoPointCompact('ipCompact', pos={'y': 2.0, 'x': 1.0}, vals=[5])
+
+        assert not hasattr(point, '__dict__')
+        assert not hasattr(InfoPoint('ipCompact'), '__dict__')
+
+        assert point.pos() == {'x': 1.0, 'y': 2.0}
+        assert point.val() == {'a': 5}
+        assert point.val('b') is None
+        assert point.get() == {'pos': {'x': 1.0, 'y': 2.0}, 'vals': {'a': 5}}
+
+    def test_compact_write_through(self):
+        """Test _vals view writes into the point and unknown keys are not stored."""
+        from idata.ipoint import InfoPoint, InfoPointCompact
+
+        InfoPoint.setSchema('ipCompactView', {'axes': {'x': 'X'}, 'vals': {'a': 'A', 'b': 'B'}})
+        point = InfoPointCompact('ipCompactView', pos=[3.0])
+
+        point._vals['b'] = 7
+        point.set(vals={'z': 1})
+
+        assert point.val() == {'b': 7}
+        assert 'z' not in point._vals
+
+        point.clear()
+        assert point.val() == {'a': 0, 'b': 0}
+
+    def test_compact_follows_schema(self):
+        """Test compact point keeps its values after change of the schema."""
+        from idata.ipoint import InfoPoint, InfoPointCompact
+
+        InfoPoint.setSchema('ipCompactSchema', {'axes': {'x': 'X'}, 'vals': {'a': 'A', 'b': 'B'}})
+        point = InfoPointCompact('ipCompactSchema', pos=[1.0], vals={'a': 1, 'b': 2})
+
+        InfoPoint.delSchemaVal('ipCompactSchema', 'a')
+        InfoPoint.setSchemaVal('ipCompactSchema', 'c', 'C')
+        point._vals['c'] = 3
+
+        assert point.val() == {'b': 2, 'c': 3}
+        assert point.pos('x') == 1.0
@@ -73,3 +73,35 @@ class TestISeriesEdgeCases:
         except AttributeError:
             # If reset method doesn't exist, that's ok
             pass
+
+
+class TestISeriesAPC:
+    """Test vectorized auto-phase-correlation."""
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_apc_equals_definition(self, workers):
+        """Test APC cells equal mean of products with modular positions, cells without phase are 0."""
+        import numpy as np
+        from idata.iSeries import ISeries
+        from idata.iftion import IFtion
+
+        n      = 53
+        maxTau = 6
+        vals   = np.random.default_rng(4).integers(-5, 5, n)
+
+        series = ISeries(name=f"apc{workers}", cnt=n)
+        series.setValArray('s', vals)
+
+        outData = IFtion(name=f"apcOut{workers}", dim='2D')
+        params  = {'maxTau': maxTau, 'workers': workers}
+        assert series.APC(inKey='s', outKey='apc', params=params, outData=outData) == (maxTau + 1) * maxTau
+
+        for tau in range(maxTau + 1):
+            for phs in range(maxTau):
+
+                if phs < max(1, tau - 1):
+                    ref = sum(vals[(phs + i * tau) % n] * vals[(phs + i * tau + tau) % n] for i in range(n)) / n
+                else:
+                    ref = 0
+
+                assert outData.pointByIdxs((tau, phs)).val('apc') == pytest.approx(ref)
@@ -0,0 +1,58 @@
+"""Unit tests for ISpectral module."""
+
+import pytest
+
+
+class TestISpectralRft:
+    """Test windowed real Fourier transform."""
+
+    def test_single_window_equals_fft(self):
+        """Test magnitudes of one full window equal magnitudes of complex FFT."""
+        import numpy as np
+        from idata.ispectral import rftMagnitudes
+
+        vals = np.random.default_rng(0).random(64)
+        assert np.allclose(rftMagnitudes(vals), np.abs(np.fft.fft(vals)))
+
+    def test_windows_accumulated(self):
+        """Test windows are zero padded and accumulated."""
+        import numpy as np
+        from idata.ispectral import rftMagnitudes
+
+        vals = np.random.default_rng(1).random(100)
+        wins = np.concatenate([vals, np.zeros(28)]).reshape(4, 32)
+        ref  = sum(np.fft.fft(win) for win in wins)
+
+        assert np.allclose(rftMagnitudes(vals, rad=5), np.abs(ref))
+
+    def test_not_enough_points(self):
+        """Test too short input returns None."""
+        from idata.ispectral import rftMagnitudes
+
+        assert rftMagnitudes([1.0, 2.0], rad=3) is None
+        assert rftMagnitudes([]) is None
+
+
+class TestISpectralAutoCorr:
+    """Test circular auto-correlation."""
+
+    @pytest.mark.parametrize("maxTau", [5, 79])
+    def test_equals_circular_definition(self, maxTau):
+        """Test direct and FFT route match circular definition, also for maxTau >= n."""
+        import numpy as np
+        from idata.ispectral import autoCorrCircular
+
+        vals = np.random.default_rng(2).integers(-3, 4, 50)
+        ref  = [sum(vals[i] * vals[(i + tau) % 50] for i in range(50)) / 50 for tau in range(maxTau + 1)]
+
+        assert np.allclose(autoCorrCircular(vals, maxTau), ref)
+
+    def test_complex_values(self):
+        """Test complex values are multiplied without conjugation."""
+        import numpy as np
+        from idata.ispectral import autoCorrCircular
+
+        vals = np.exp(1j * np.arange(40))
+        ref  = [sum(vals[i] * vals[(i + tau) % 40] for i in range(40)) / 40 for tau in range(21)]
+
+        assert np.allclose(autoCorrCircular(vals, 20), ref)
@@ -1,6 +1,5 @@
 """
 IField Package Unit Tests
 
-Testy pre ifield package (v budúcnosti).
-V súčasnosti je adresár prázdny.
+Testy pre ifield package.
 """
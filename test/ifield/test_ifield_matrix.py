@@ -0,0 +1,280 @@
+"""Unit tests for InfoFieldMatrix module."""
+
+import pytest
+
+
+def _matrix(name, vals, vectorized, **settings):
+    """Create small InfoFieldMatrix with respective states and settings."""
+    from ifield.ifield_matrix import InfoFieldMatrix
+
+    matrix = InfoFieldMatrix(name)
+    matrix.init(cnts={'l': 13, 'e': 7})
+    for key, val in settings.items(): setattr(matrix, key, val)
+
+    matrix.vectorized = vectorized
+    matrix.setValArray('s', vals)
+    return matrix
+
+
+def _logical(matrix):
+    """States of the matrix in the order of logical positions."""
+    return matrix.valArray('s', points=matrix.actSubData())
+
+
+def _states(sType):
+    """Random states of respective type for 13 x 7 matrix."""
+    import numpy as np
+
+    rng = np.random.default_rng(1)
+    if sType == 'bool': return rng.random(91) < 0.5
+    if sType == 'int' : return rng.integers(-2, 3, 91)
+    return rng.integers(0, 3, 91) * np.exp(2j * np.pi * rng.integers(0, 3, 91) / 3)
+
+
+class TestIFieldMatrixEpochStep:
+    """Test vectorized epoch step against serial computation."""
+
+    @pytest.mark.parametrize("sType", ['bool', 'int', 'complex'])
+    @pytest.mark.parametrize("sAgg" , ['nearest', 'min', 'max', 'sum'])
+    @pytest.mark.parametrize("rule" , ['and', 'xand', 'sum'])
+    def test_kernel_equals_serial(self, sType, sAgg, rule):
+        """Test kernel gives the same states as serial computation."""
+        import numpy as np
+
+        settings = {'sType': sType, 'sAgg': sAgg, 'rule': rule, 'l2e': 2, 'l2p': 1, 'phs': 3, 'maxL': 4}
+        vals     = _states(sType)
+        kernel   = _matrix('kernel', vals, True , **settings)
+        serial   = _matrix('serial', vals, False, **settings)
+        serial.setRingAxe('e', False)
+
+        for _ in range(3):
+            assert kernel.epochStep('s', 's', {}) == 91
+            serial.epochStep('s', 's', {})
+
+        assert np.array_equal(_logical(kernel).astype(complex), _logical(serial).astype(complex))
+
+    @pytest.mark.parametrize("ring", [True, False])
+    def test_kernel_other_out_key(self, ring):
+        """Test kernel equals serial computation when outKey differs from inKey, all keys are moved."""
+        import numpy as np
+
+        settings = {'sType': 'int', 'sAgg': 'sum', 'rule': 'sum', 'maxL': 3}
+        kernel   = _matrix('kernelOut', _states('int'), True , **settings)
+        serial   = _matrix('serialOut', _states('int'), False, **settings)
+
+        omg = np.arange(91)
+        for matrix in (kernel, serial):
+            matrix.setRingAxe('e', ring)
+            matrix.setValArray('omg', omg)
+
+        for _ in range(3):
+            kernel.epochStep('s', 'omg', {})
+            serial.epochStep('s', 'omg', {})
+
+        for key in ('s', 'omg'):
+            kVals = kernel.valArray(key, points=kernel.actSubData())
+            sVals = serial.valArray(key, points=serial.actSubData())
+            assert np.array_equal(kVals, sVals), key
+
+    def test_epochs_moved(self):
+        """Test older epochs are moved by one index up."""
+        import numpy as np
+
+        vals   = _states('complex')
+        matrix = _matrix('moved', vals, True)
+        matrix.epochStep('s', 's', {})
+
+        assert np.array_equal(_logical(matrix)[13:], vals[:-13])
+
+    def test_edges_without_neighbors(self):
+        """Test lambdas without neighbors aggregate to zero state, lambda 0 is not a left neighbor."""
+        import numpy as np
+
+        matrix = _matrix('edges', np.ones(91, dtype=complex), True, maxL=1)
+        matrix.epochStep('s', 's', {})
+
+        assert np.array_equal(_logical(matrix)[:13], [1, 1] + [2]*10 + [1])
+
+
+class TestIFieldMatrixNeighTable:
+    """Test cached table of the neighbors."""
+
+    def test_table_cached(self):
+        """Test table is reused and recomputed only after change of the settings."""
+        from ifield.ifield_matrix import InfoFieldMatrix
+
+        matrix = InfoFieldMatrix('table')
+        tab    = matrix._neighTable()
+
+        assert matrix._neighTable() is tab
+        matrix.sType = 'bool'
+        assert matrix._neighTable() is tab
+
+        matrix.l2p = 1
+        assert matrix._neighTable() is not tab
+
+    def test_neigh_states_by_definition(self):
+        """Test neighbor states equal rotated states at (l-dL, dL*l2e) and (l+dL, dL*l2e)."""
+        import cmath
+        import numpy as np
+
+        matrix = _matrix('neigh', _states('complex'), True, l2e=2, l2p=1, phs=3, maxL=5)
+        states = matrix.valArray('s').reshape(7, 13)
+        rot    = lambda dL: cmath.exp(complex(0, 2*cmath.pi/3 * dL))
+
+        left, right = matrix.getNeighStates('s', 4)
+
+        assert left  == pytest.approx([states[dL*2, 4-dL] * rot(dL) for dL in (1, 2, 3)])
+        assert right == pytest.approx([states[dL*2, 4+dL] * rot(dL) for dL in (1, 2, 3)])
+
+
+class TestIFieldMatrixRun:
+    """Test headless multi-epoch runner."""
+
+    def test_run_equals_steps(self):
+        """Test run gives the same states as repeated epoch steps."""
+        import numpy as np
+
+        vals   = _states('complex')
+        runner = _matrix('runner', vals, True, l2p=1, phs=3)
+        single = _matrix('single', vals, True, l2p=1, phs=3)
+
+        stats = runner.run(5)
+        for _ in range(5): single.epochStep('s', 's', {})
+
+        assert stats['steps'] == 5
+        assert stats['stepsPerSec'] > 0
+        assert np.array_equal(_logical(runner), _logical(single))
+
+    def test_ring_buffer(self):
+        """Test ring buffer keeps last snapshots in chronological order."""
+        import numpy as np
+
+        vals   = _states('int')
+        runner = _matrix('ring'  , vals, True, sType='int')
+        single = _matrix('single', vals, True, sType='int')
+
+        snaps = []
+        stats = runner.run(10, every=2, keep=3, callback=lambda step, states: snaps.append(step))
+
+        for _ in range(10):
+            single.epochStep('s', 's', {})
+
+        assert snaps == [2, 4, 6, 8, 10]
+        assert stats['history'].shape == (3, 13)
+        assert np.array_equal(stats['history'][-1], _logical(single)[:13])
+        assert np.array_equal(stats['history'][0] , _logical(single)[4*13:5*13])
+
+    def test_callback_stops(self):
+        """Test callback returning False stops the run."""
+        runner = _matrix('stop', _states('bool'), True, sType='bool')
+        stats  = runner.run(100, every=1, callback=lambda step, states: step < 7)
+
+        assert stats['steps'] == 7
+
+    def test_invalid_params(self):
+        """Test negative parameters and unknown value keys return None."""
+        runner = _matrix('invalid', _states('bool'), True)
+
+        assert runner.run(-1) is None
+        assert runner.run(10, inKey='x') is None
+
+
+class TestIFieldMatrixRunOutKey:
+    """Test run of many epochs with outKey different from inKey."""
+
+    def test_run_other_out_key(self):
+        """Test run by kernel equals run by serial computation for outKey != inKey."""
+        import numpy as np
+
+        settings = {'sType': 'int', 'sAgg': 'max', 'rule': 'sum', 'maxL': 2}
+        kernel   = _matrix('runKernelOut', _states('int'), True , **settings)
+        serial   = _matrix('runSerialOut', _states('int'), False, **settings)
+
+        for matrix in (kernel, serial): matrix.setValArray('omg', np.arange(91))
+
+        kStats = kernel.run(5, every=1, keep=5, inKey='s', outKey='omg')
+        sStats = serial.run(5, every=1, keep=5, inKey='s', outKey='omg')
+
+        assert np.array_equal(kStats['history'], sStats['history'])
+        for key in ('s', 'omg'):
+            assert np.array_equal(kernel.valArray(key, points=kernel.actSubData()), serial.valArray(key, points=serial.actSubData()))
+
+    def test_run_epochs_default_steps(self):
+        """Test runEpochs without steps uses the default of the data method."""
+        matrix = _matrix('runDefault', _states('int'), True, sType='int')
+        calls  = []
+        matrix.run = lambda steps, **kwargs: calls.append(steps) or {'pts': 0}
+
+        matrix.runEpochs('s', 's', {})
+        assert calls == [matrix.methodDef('IField run epochs')['params']['steps']]
+
+
+class TestIFieldMatrixParallel:
+    """Test parallel epoch steps in the process pool over shared memory."""
+
+    @pytest.mark.parametrize("sType, sAgg, rule", [('complex', 'sum', 'sum'), ('bool', 'min', 'xand'), ('int', 'nearest', 'and')])
+    def test_parallel_equals_serial(self, sType, sAgg, rule):
+        """Test parallel steps give bit-identical states as one process."""
+        import numpy as np
+
+        settings = {'sType': sType, 'sAgg': sAgg, 'rule': rule, 'l2e': 1, 'l2p': 1, 'phs': 3, 'maxL': 3}
+        vals     = _states(sType)
+        single   = _matrix('single'  , vals, True, **settings)
+        parallel = _matrix('parallel', vals, True, workers=3, **settings)
+
+        try:
+            single.run(4)
+            parallel.run(4)
+            assert np.array_equal(_logical(parallel), _logical(single))
+
+        finally:
+            parallel.closePool()
+
+        assert parallel._shm is None
+        assert np.array_equal(_logical(parallel), _logical(single))
+
+    def test_parallel_other_out_key(self):
+        """Test parallel steps with outKey != inKey write only outKey and keep inKey in shared memory."""
+        import numpy as np
+
+        settings = {'sType': 'int', 'sAgg': 'sum', 'rule': 'sum', 'maxL': 3}
+        single   = _matrix('singleOut'  , _states('int'), True, **settings)
+        parallel = _matrix('parallelOut', _states('int'), True, workers=2, **settings)
+
+        for matrix in (single, parallel): matrix.setValArray('omg', np.arange(91))
+
+        try:
+            single.run(3, inKey='s', outKey='omg')
+            parallel.run(3, inKey='s', outKey='omg')
+
+            assert parallel.points.column('s') is parallel._shmArr
+
+            for key in ('s', 'omg'):
+                assert np.array_equal(parallel.valArray(key, points=parallel.actSubData()), single.valArray(key, points=single.actSubData()))
+
+        finally:
+            parallel.closePool()
+
+
+class TestIFieldMatrixPersistence:
+    """Test save and load of InfoFieldMatrix."""
+
+    def test_roundtrip(self, tmp_path):
+        """Test loaded matrix has the same settings, states and epoch step."""
+        import numpy as np
+        from idata.idata import InfoData
+
+        matrix = _matrix("persistMatrix", _states('complex'), True, sAgg='max', l2p=2)
+        matrix.setRingAxe('e')
+        matrix.moveByAxe('e', 0, 2)
+        matrix.save(str(tmp_path / "matrix"))
+
+        loaded = InfoData.load(str(tmp_path / "matrix"), name="persistMatrixLoaded")
+
+        assert type(loaded) is type(matrix)
+        assert (loaded.sAgg, loaded.l2p) == ('max', 2)
+        assert np.array_equal(_logical(loaded), _logical(matrix))
+
+        loaded.epochStep('s', 's', {}); matrix.epochStep('s', 's', {})
+        assert np.allclose(_logical(loaded), _logical(matrix))